@@ -0,0 +1,276 @@
+"""Headless batch precomputation of interview prep packs.
+
+Enumerates resumes in the S3_BUCKET_NAME bucket (or a local directory), extracts
+their text in a process pool, runs the resume parser and question/coding/brief
+generators with bounded concurrency and writes one versioned prep-pack JSON per
+resume. The Streamlit app picks these packs up by PDF hash, so opening a
+precomputed resume needs no LLM calls.
+
+Usage:
+    python batch_prep.py --source s3 --prefix resumes/
+    python batch_prep.py --source local --path ./resumes --llm-workers 4
+
+Re-running the command resumes where the last run stopped: resumes whose source
+fingerprint (S3 ETag, or size and mtime for local files) is unchanged and that
+already have a prep pack are skipped.
+"""
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import domain_qa
+
+
+def discover_s3_resumes(bucket_name, prefix=""):
+    """List PDF resumes in an S3 bucket, newest first, as batch work items"""
+    catalog = domain_qa.get_resume_catalog(bucket_name)
+    catalog.sync(prefix, force=True)
+    return [
+        {
+            "id": f"s3://{bucket_name}/{entry['key']}",
+            "name": os.path.basename(entry['key']),
+            "fingerprint": entry['etag'],
+            "source": {"type": "s3", "bucket": bucket_name, "key": entry['key']}
+        }
+        for entry in catalog.query(prefix)
+    ]
+
+
+def discover_local_resumes(path):
+    """List PDF resumes under a local directory, newest first, as batch work items"""
+    items = []
+    for root, _, files in os.walk(path):
+        for filename in files:
+            if not filename.lower().endswith('.pdf'):
+                continue
+            file_path = os.path.join(root, filename)
+            stat = os.stat(file_path)
+            items.append({
+                "id": os.path.abspath(file_path),
+                "name": filename,
+                "fingerprint": f"{stat.st_size}-{stat.st_mtime_ns}",
+                "source": {"type": "local", "path": os.path.abspath(file_path)},
+                "mtime": stat.st_mtime
+            })
+    items.sort(key=lambda item: item["mtime"], reverse=True)
+    return items
+
+
+def read_resume_bytes(item):
+    """Fetch the raw PDF bytes for a work item"""
+    source = item["source"]
+    if source["type"] == "local":
+        with open(source["path"], "rb") as f:
+            return f.read()
+    response = domain_qa.s3_client_pool.get_object(Bucket=source["bucket"], Key=source["key"])
+    return response['Body'].read()
+
+
+def download_item(item, force=False):
+    """Fetch a work item's PDF and hash it; also returns its extraction when a text sidecar exists (and not force)"""
+    pdf_bytes = read_resume_bytes(item)
+    resume_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    return pdf_bytes, resume_hash, None if force else domain_qa.load_extraction_sidecar(resume_hash)
+
+
+def extract_pdf_bytes(pdf_bytes):
+    """Process-pool entry point: extract text from raw PDF bytes (resumes are already spread across processes)"""
+    return domain_qa.extract_pdf_text(io.BytesIO(pdf_bytes), parallel=False)
+
+
+def build_prep_pack(item, resume_hash, extraction, pack_dir, text_from_sidecar=False, force=False):
+    """Parse a resume, generate its questions, coding problems and brief, and write the prep pack.
+
+    With force, the parse sidecar and cached LLM responses are ignored (and overwritten).
+    """
+    if not text_from_sidecar:
+        domain_qa.save_extracted_text_sidecar(resume_hash, extraction)
+    with domain_qa.refreshing_llm_cache(force):
+        result = domain_qa.run_resume_pipeline_on_text(resume_hash, extraction["text"], extraction=extraction, use_sidecar=not force)
+        if not domain_qa.pipeline_result_succeeded(result):
+            error = (result.get("parsed_details") or {}).get("error") or result.get("resume_text") or "No text extracted"
+            raise RuntimeError(error)
+        failed = [entry[0] for entry in result["questions"] + result["coding_problems"] if domain_qa.is_generation_error(entry)]
+        if failed:
+            raise RuntimeError(failed[0])  # don't write a pack that replays the error
+        brief = domain_qa.InterviewerPrepGenerator().generate_quick_brief(result["parsed_details"])
+    domain_qa.save_prep_pack(result, source=item["source"], brief=brief, pack_dir=pack_dir)
+    return result["compaction"]
+
+
+class BatchManifest:
+    """Per-source progress record that makes batch runs resumable"""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+
+    def is_done(self, item, pack_dir):
+        entry = self.entries.get(item["id"])
+        return (
+            entry is not None
+            and entry["status"] == "done"
+            and entry["fingerprint"] == item["fingerprint"]
+            and os.path.exists(domain_qa.prep_pack_path(entry["resume_hash"], pack_dir))
+        )
+
+    def record(self, item, status, resume_hash=None, error=None):
+        self.entries[item["id"]] = {
+            "fingerprint": item["fingerprint"],
+            "resume_hash": resume_hash,
+            "status": status,
+            "error": error,
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def run_batch(items, pack_dir, download_workers, extract_workers, llm_workers, force=False):
+    """Run download -> extraction -> LLM stages for all items and return a summary dict"""
+    manifest = BatchManifest(os.path.join(pack_dir, f"v{domain_qa.PREP_PACK_VERSION}", "batch_manifest.json"))
+    pending_items = [item for item in items if force or not manifest.is_done(item, pack_dir)]
+    skipped = len(items) - len(pending_items)
+    total = len(pending_items)
+    print(f"Found {len(items)} resumes, {skipped} already prepared, {total} to process")
+
+    counts = {"done": 0, "reused": 0, "failed": 0}
+    resume_tokens = {"before": 0, "after": 0}
+    usage_before = domain_qa.llm_usage.snapshot()
+    started = time.time()
+    # Keep a bounded number of resumes between download and pack so PDFs don't pile up in memory.
+    # Extraction processes are spawned, not forked: by now this process has S3, SQLite and pool threads.
+    max_in_flight = max(download_workers, extract_workers, llm_workers) * 2
+
+    def report(item, status, detail=""):
+        finished = sum(counts.values())
+        print(f"[{finished}/{total}] {status:<6} {item['name']} {detail}".rstrip())
+
+    with ThreadPoolExecutor(max_workers=download_workers) as download_pool, \
+            ProcessPoolExecutor(max_workers=extract_workers, mp_context=multiprocessing.get_context("spawn")) as extract_pool, \
+            ThreadPoolExecutor(max_workers=llm_workers) as llm_pool:
+        queue = iter(pending_items)
+        in_flight = {}
+
+        def start_next():
+            item = next(queue, None)
+            if item is not None:
+                in_flight[download_pool.submit(download_item, item, force)] = ("download", item, None, time.time())
+            return item is not None
+
+        while len(in_flight) < max_in_flight and start_next():
+            pass
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, item, resume_hash, item_started = in_flight.pop(future)
+                try:
+                    if stage == "download":
+                        pdf_bytes, resume_hash, sidecar = future.result()
+                        if not force and os.path.exists(domain_qa.prep_pack_path(resume_hash, pack_dir)):
+                            # Same PDF already prepared under another key or by an earlier run
+                            counts["reused"] += 1
+                            manifest.record(item, "done", resume_hash)
+                            report(item, "reused")
+                        elif sidecar is not None:
+                            # Another node already extracted this PDF
+                            in_flight[llm_pool.submit(build_prep_pack, item, resume_hash, sidecar, pack_dir, True, force)] = ("llm", item, resume_hash, item_started)
+                            continue
+                        else:
+                            in_flight[extract_pool.submit(extract_pdf_bytes, pdf_bytes)] = ("extract", item, resume_hash, item_started)
+                            continue
+                    elif stage == "extract":
+                        extraction = future.result()
+                        in_flight[llm_pool.submit(build_prep_pack, item, resume_hash, extraction, pack_dir, False, force)] = ("llm", item, resume_hash, item_started)
+                        continue
+                    else:
+                        compaction = future.result()
+                        resume_tokens["before"] += compaction["tokens_before"]
+                        resume_tokens["after"] += compaction["tokens_after"]
+                        counts["done"] += 1
+                        manifest.record(item, "done", resume_hash)
+                        report(item, "ok", f"({time.time() - item_started:.1f}s, resume {compaction['tokens_before']} -> {compaction['tokens_after']} tokens)")
+                except Exception as e:
+                    counts["failed"] += 1
+                    manifest.record(item, "failed", resume_hash, str(e))
+                    report(item, "FAILED", f"[{stage}] {str(e)}")
+                start_next()
+
+    elapsed = time.time() - started
+    usage_after = domain_qa.llm_usage.snapshot()
+    minutes = elapsed / 60 if elapsed > 0 else 0
+    tokens = usage_after["total_tokens"] - usage_before["total_tokens"]
+    processed = counts["done"] + counts["reused"]
+    return {
+        "found": len(items),
+        "skipped": skipped,
+        "prepared": counts["done"],
+        "reused": counts["reused"],
+        "failed": counts["failed"],
+        "elapsed_seconds": round(elapsed, 2),
+        "llm_requests": usage_after["requests"] - usage_before["requests"],
+        "tokens": tokens,
+        "resumes_per_min": round(processed / minutes, 2) if minutes else 0.0,
+        "tokens_per_min": round(tokens / minutes, 1) if minutes else 0.0,
+        "resume_tokens_before_compaction": resume_tokens["before"],
+        "resume_tokens_after_compaction": resume_tokens["after"],
+        "llm_cache": domain_qa.llm_cache.stats() if domain_qa.llm_cache is not None else None,
+        "rate_limiter": domain_qa.openai_limiter.stats(),
+        "s3": domain_qa.s3_call_stats.snapshot()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute interview prep packs for a batch of resumes")
+    parser.add_argument("--source", choices=["s3", "local"], default="s3", help="Where to read resumes from")
+    parser.add_argument("--bucket", default=os.getenv('S3_BUCKET_NAME', 'resumefolderbucket'), help="S3 bucket (default: S3_BUCKET_NAME)")
+    parser.add_argument("--prefix", default="", help="Only process S3 keys under this prefix")
+    parser.add_argument("--path", help="Local directory of PDF resumes (with --source local)")
+    parser.add_argument("--output", default=domain_qa.PREP_PACK_DIR, help="Prep pack directory (default: PREP_PACK_DIR)")
+    parser.add_argument("--limit", type=int, help="Only process the newest N resumes")
+    parser.add_argument("--download-workers", type=int, default=8, help="Concurrent resume downloads")
+    parser.add_argument("--extract-workers", type=int, default=os.cpu_count() or 2, help="Processes used for PDF text extraction")
+    parser.add_argument("--llm-workers", type=int, default=2, help="Resumes sent through the LLM stage at once")
+    parser.add_argument("--force", action="store_true", help="Regenerate packs even if they already exist, ignoring parse sidecars and cached LLM responses")
+    args = parser.parse_args(argv)
+
+    if args.source == "local":
+        if not args.path:
+            parser.error("--path is required with --source local")
+        items = discover_local_resumes(args.path)
+    else:
+        items = discover_s3_resumes(args.bucket, args.prefix)
+    if args.limit:
+        items = items[:args.limit]
+
+    summary = run_batch(
+        items,
+        args.output,
+        download_workers=args.download_workers,
+        extract_workers=args.extract_workers,
+        llm_workers=args.llm_workers,
+        force=args.force
+    )
+
+    print("\nBatch summary:")
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Fold pending interview feedback events into the Parquet snapshot.
+
+With FEEDBACK_STORAGE_MODE=append every saved assessment is a small object under
+feedback/events/dt=YYYY-MM-DD/. The Streamlit app compacts them in the background
+every FEEDBACK_COMPACTION_INTERVAL_SECONDS; this command does the same once, e.g.
+from cron when the app runs with compaction disabled.
+
+Usage:
+    python compact_feedback.py
+    python compact_feedback.py --bucket my-feedback-bucket --no-xlsx
+"""
+import argparse
+import json
+import os
+import sys
+
+import domain_qa
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact interview feedback events into the Parquet snapshot")
+    parser.add_argument("--bucket", default=os.getenv('S3_BUCKET_FEEDBACK'), help="Feedback bucket (default: S3_BUCKET_FEEDBACK)")
+    parser.add_argument("--no-xlsx", action="store_true", help="Skip refreshing the interview_feedback.xlsx export")
+    args = parser.parse_args(argv)
+
+    if not args.bucket:
+        parser.error("--bucket is required when S3_BUCKET_FEEDBACK is not set")
+    result = domain_qa.compact_feedback_events(
+        bucket_name=args.bucket,
+        export_xlsx=False if args.no_xlsx else None
+    )
+    print(json.dumps({**result, "s3": domain_qa.s3_call_stats.snapshot()}, indent=2))
+    return 1 if result["conflict"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
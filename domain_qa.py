@@ -1,5 +1,7 @@
 import streamlit as st
+import PyPDF2
 from PyPDF2 import PdfReader
+import pdf_extraction
 import os
 import io
 from openai import OpenAI
@@ -7,12 +9,35 @@ import requests
 import openai
 import json
 import time
+import hashlib
+import random
+import sqlite3
+import threading
+import queue
+import contextlib
+import contextvars
+import gzip
+import inspect
+import mmap
+import shutil
+import uuid
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import NoCredentialsError, ClientError
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from collections import OrderedDict, deque
+import re
+import numpy as np
 import pandas as pd
 
+try:
+    import tiktoken
+except ImportError:  # optional: exact token counts for budgets and rate limiting
+    tiktoken = None
+
 # Always load .env from the current directory
 load_dotenv('.env', override=True)
 
@@ -22,7 +47,12 @@ if not OPENAI_API_KEY:
     st.stop()
 
 from openai import OpenAI
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+
+@st.cache_resource
+def get_openai_client():
+    """OpenAI client shared by all sessions, created on first use so the storage-only CLIs need no API key"""
+    # max_retries=0 everywhere: create_chat_completion_with_retries does all retrying, under the shared rate limiter
+    return OpenAI(api_key=OPENAI_API_KEY, max_retries=0)
 
 # Fetch environment variables
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
@@ -42,6 +72,7 @@ print(f"S3_BUCKET_NAME: {S3_BUCKET_NAME}")
 # Set keys for libraries
 import openai
 openai.api_key = os.getenv("OPENAI_API_KEY")
+openai.max_retries = 0
 
 # Interview status configurations
 INTERVIEW_STATUSES = [
@@ -55,84 +86,620 @@ INTERVIEW_STATUSES = [
     {"name": "On Hold", "color": "#fdcb6e", "icon": "⏸️"}
 ]
 
-def generate_questions_and_coding(interview_round, experience, skills):
-    questions = []
-    coding = []
+# Local directory for on-disk caches (LLM responses, etc.)
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "100"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+class LLMResponseCache:
+    """Persistent SQLite cache of chat completion text with LRU and TTL eviction.
+
+    Entries are keyed on a SHA-256 of (model, messages, max_tokens, temperature).
+    Expired entries are dropped on read and on write; when the stored content
+    exceeds max_bytes the least recently used entries are evicted first.
+    """
+
+    def __init__(self, path, max_bytes, ttl_seconds):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, content TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, last_accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_accessed ON responses (last_accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model, messages, max_tokens, temperature, response_format=None):
+        request = {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+        if response_format is not None:
+            request["response_format"] = response_format
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, model, content):
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, size, created_at, last_accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, content, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        expired = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        self.evictions += max(expired.rowcount, 0)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_accessed ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries, total_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total_bytes
+        }
+
+@st.cache_resource
+def get_llm_cache():
+    """Process-wide LLM response cache shared by all sessions (None when disabled)"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    try:
+        return LLMResponseCache(
+            os.path.join(CACHE_DIR, "llm_responses.sqlite3"),
+            max_bytes=int(LLM_CACHE_MAX_MB * 1024 * 1024),
+            ttl_seconds=LLM_CACHE_TTL_SECONDS
+        )
+    except Exception as e:
+        print(f"LLM response cache disabled: {str(e)}")
+        return None
+
+llm_cache = get_llm_cache()
+
+# Set for the duration of a refresh/--force run: LLM calls skip cached responses and overwrite them.
+# A context variable, so pools that start tasks with contextvars.copy_context() carry it along.
+llm_cache_refresh = contextvars.ContextVar("llm_cache_refresh", default=False)
+
+@contextlib.contextmanager
+def refreshing_llm_cache(enabled=True):
+    """Within this block (when enabled) LLM responses are regenerated instead of read from llm_cache"""
+    token = llm_cache_refresh.set(llm_cache_refresh.get() or enabled)
+    try:
+        yield
+    finally:
+        llm_cache_refresh.reset(token)
+
+def submit_in_context(executor, fn, *args):
+    """executor.submit that runs fn in a copy of the caller's context (keeps llm_cache_refresh)"""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+class LLMUsageMeter:
+    """Thread-safe running totals of OpenAI requests and token usage for this process"""
+
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, usage):
+        with self._lock:
+            self.requests += 1
+            if usage is not None:
+                self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+                self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.prompt_tokens + self.completion_tokens
+            }
+
+@st.cache_resource
+def get_llm_usage_meter():
+    """Process-wide token usage meter shared by all sessions"""
+    return LLMUsageMeter()
+
+llm_usage = get_llm_usage_meter()
+
+# Shared OpenAI budgets (per process); defaults match a typical gpt-4o tier and can be tuned per deployment
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "30000"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+OPENAI_BACKOFF_BASE_SECONDS = float(os.getenv("OPENAI_BACKOFF_BASE_SECONDS", "1"))
+OPENAI_BACKOFF_MAX_SECONDS = float(os.getenv("OPENAI_BACKOFF_MAX_SECONDS", "30"))
+
+class TokenBucket:
+    """Continuously refilling budget of `per_minute` units"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount):
+        self.available -= min(amount, self.capacity)
+
+    def refund(self, amount):
+        self.available = min(self.capacity, self.available + amount)
+
+class OpenAIRateLimiter:
+    """Process-wide requests/min and tokens/min limiter shared by every OpenAI call.
+
+    Callers block in acquire() until both buckets can cover the request; a 429
+    from the API pauses all callers for the backoff delay so retries don't
+    stampede. Queue depth and wait times are tracked for stats().
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._cond = threading.Condition()
+        self._paused_until = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.retries = 0
+        self.rate_limited = 0
+
+    def acquire(self, estimated_tokens):
+        started = time.monotonic()
+        with self._cond:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = max(
+                        self._paused_until - now,
+                        self.requests.wait_time(1, now),
+                        self.tokens.wait_time(estimated_tokens, now)
+                    )
+                    if delay <= 0:
+                        self.requests.consume(1)
+                        self.tokens.consume(estimated_tokens)
+                        break
+                    self._cond.wait(timeout=delay)
+            finally:
+                self.queue_depth -= 1
+            waited = time.monotonic() - started
+            self.acquired += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def settle(self, estimated_tokens, actual_tokens):
+        """Return over-estimated tokens to the budget once the real usage is known"""
+        if actual_tokens is None or actual_tokens >= estimated_tokens:
+            return
+        with self._cond:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+            self._cond.notify_all()
+
+    def pause(self, seconds, rate_limited=False):
+        with self._cond:
+            self.retries += 1
+            if rate_limited:
+                self.rate_limited += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "acquired": self.acquired,
+                "avg_wait_seconds": self.total_wait_seconds / self.acquired if self.acquired else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited
+            }
+
+@st.cache_resource
+def get_openai_rate_limiter():
+    """Rate limiter shared by all sessions and threads of this server process"""
+    return OpenAIRateLimiter(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
+
+openai_limiter = get_openai_rate_limiter()
+
+@st.cache_resource
+def get_token_encoder():
+    """gpt-4o tokenizer from tiktoken, or None when tiktoken (optional) is unavailable"""
+    if tiktoken is None:
+        print("tiktoken is not installed; RESUME_TOKEN_BUDGET, PDF_TOKEN_BUDGET and the TPM limit are enforced on "
+              "4-characters-per-token estimates (pip install tiktoken for exact counts)")
+        return None
+    try:
+        return tiktoken.encoding_for_model("gpt-4o")
+    except Exception as e:
+        print(f"tiktoken encoder unavailable, falling back to character estimates: {str(e)}")
+        return None
+
+token_encoder = get_token_encoder()
+
+def count_tokens(text):
+    """Number of gpt-4o tokens in text (approximated as 4 characters per token without tiktoken)"""
+    if not text:
+        return 0
+    if token_encoder is None:
+        return (len(text) + 3) // 4
+    return len(token_encoder.encode(text, disallowed_special=()))
+
+def estimate_request_tokens(messages, max_tokens):
+    """Upper bound of the tokens a chat request consumes: prompt tokens plus max_tokens"""
+    prompt_tokens = sum(count_tokens(message.get("content") or "") + 4 for message in messages)
+    return prompt_tokens + max_tokens
+
+def _retry_delay(attempt, error):
+    """Server-suggested Retry-After if present, otherwise jittered exponential backoff"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        if retry_after is not None:
+            return min(float(retry_after), OPENAI_BACKOFF_MAX_SECONDS)
+    except ValueError:
+        pass
+    ceiling = min(OPENAI_BACKOFF_MAX_SECONDS, OPENAI_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+def create_chat_completion_with_retries(client, request, estimated_tokens):
+    """Call client.chat.completions.create under the shared limiter, retrying transient failures"""
+    for attempt in range(OPENAI_MAX_RETRIES + 1):
+        openai_limiter.acquire(estimated_tokens)
+        try:
+            return client.chat.completions.create(**request)
+        except (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError) as e:
+            if attempt == OPENAI_MAX_RETRIES:
+                raise
+            delay = _retry_delay(attempt, e)
+            print(f"OpenAI request failed ({type(e).__name__}), retrying in {delay:.1f}s (attempt {attempt + 1}/{OPENAI_MAX_RETRIES})")
+            openai_limiter.pause(delay, rate_limited=isinstance(e, openai.RateLimitError))
+            time.sleep(delay)
 
+def cached_chat_completion(client, model, messages, max_tokens, temperature=None, response_format=None, parse=None):
+    """Return the stripped completion text for a chat request, served from llm_cache when possible.
+
+    With parse, the text is passed through it and its result returned instead; a
+    response parse rejects (raises on) is not cached, and a cached one it rejects
+    is dropped and requested again.
+    """
+    parse = parse or (lambda content: content)
+    key = LLMResponseCache.make_key(model, messages, max_tokens, temperature, response_format)
+    if llm_cache is not None and not llm_cache_refresh.get():
+        cached = llm_cache.get(key)
+        if cached is not None:
+            try:
+                return parse(cached)
+            except Exception as e:
+                print(f"Dropping cached LLM response that no longer parses: {str(e)}")
+                llm_cache.delete(key)
+
+    request = {"model": model, "messages": messages, "max_tokens": max_tokens}
+    if temperature is not None:
+        request["temperature"] = temperature
+    if response_format is not None:
+        request["response_format"] = response_format
+    estimated_tokens = estimate_request_tokens(messages, max_tokens)
+    response = create_chat_completion_with_retries(client, request, estimated_tokens)
+    usage = getattr(response, "usage", None)
+    llm_usage.record(usage)
+    openai_limiter.settle(estimated_tokens, getattr(usage, "total_tokens", None))
+    content = response.choices[0].message.content.strip()
+    parsed = parse(content)  # raises before an invalid response reaches the cache
+
+    if llm_cache is not None and content:
+        llm_cache.put(key, model, content)
+    return parsed
+
+def stream_chat_completion(client, model, messages, max_tokens, temperature=None):
+    """Yield completion text chunks as they arrive; the assembled text is cached like cached_chat_completion"""
+    key = LLMResponseCache.make_key(model, messages, max_tokens, temperature)
+    if llm_cache is not None and not llm_cache_refresh.get():
+        cached = llm_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    request = {
+        "model": model,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "stream": True,
+        "stream_options": {"include_usage": True}
+    }
+    if temperature is not None:
+        request["temperature"] = temperature
+    chunks = []
+    usage = None
+    estimated_tokens = estimate_request_tokens(messages, max_tokens)
+    for event in create_chat_completion_with_retries(client, request, estimated_tokens):
+        if getattr(event, "usage", None) is not None:
+            usage = event.usage
+        if not event.choices:
+            continue
+        delta = event.choices[0].delta.content
+        if delta:
+            chunks.append(delta)
+            yield delta
+
+    llm_usage.record(usage)
+    openai_limiter.settle(estimated_tokens, getattr(usage, "total_tokens", None))
+    content = "".join(chunks).strip()
+    if llm_cache is not None and content:
+        llm_cache.put(key, model, content)
+
+# Stream brief/coding generation into the tabs token by token instead of waiting behind a spinner
+LLM_STREAMING = os.getenv("LLM_STREAMING", "1") == "1"
+
+# Maximum number of OpenAI calls generate_questions_and_coding keeps in flight at once
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "6"))
+
+# How generate_questions_and_coding talks to the LLM:
+#   multi_call        - question, model answer and coding problem as three calls per skill
+#   structured_skill  - one JSON-mode call per skill returning all three parts
+#   structured_batch  - one JSON-mode call covering every skill
+# Structured responses that don't match the expected schema fall back to multi_call.
+QA_GENERATION_MODE = os.getenv("QA_GENERATION_MODE", "multi_call")
+
+CODING_PROBLEM_FORMAT = """
+    **Problem Statement:** [Clear description of the coding problem]
+    
+    **Input:** [Sample input format and examples]
+    
+    **Output:** [Expected output format and examples]
+    
+    **Python Solution:**
+    ```python
+    [Complete working Python code solution]
+    ```
+    
+    **Explanation:** [Brief explanation of the approach and algorithm]
+    
+    **Time Complexity:** [Big O notation]
+    """
+
+STRUCTURED_SKILL_FIELDS = ("question", "model_answer", "coding_problem")
+
+def _validate_skill_payload(payload):
+    """Return (question, model_answer, coding_problem) or raise ValueError if the object doesn't match the schema"""
+    if not isinstance(payload, dict):
+        raise ValueError("expected a JSON object per skill")
+    values = []
+    for field in STRUCTURED_SKILL_FIELDS:
+        value = payload.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"missing or empty field '{field}'")
+        values.append(value.strip())
+    return tuple(values)
+
+def _structured_skill_prompt(experience, skills):
+    skill_list = "\n".join(f"- {skill}" for skill in skills)
+    return (
+        f"For a candidate with {experience} years experience, generate interview material for each of these skills, in this order:\n"
+        f"{skill_list}\n\n"
+        "For each skill provide:\n"
+        "- question: one interview question about the skill\n"
+        "- model_answer: the model answer or solution a strong candidate would give\n"
+        "- coding_problem: a coding problem related to the skill with a complete solution, formatted EXACTLY as:\n"
+        f"{CODING_PROBLEM_FORMAT}\n"
+        f"Make sure the problems are appropriate for {experience} years of experience.\n\n"
+        "Respond strictly in valid JSON like this:\n"
+        "{\"skills\": [{\"skill\": \"...\", \"question\": \"...\", \"model_answer\": \"...\", \"coding_problem\": \"...\"}]}"
+    )
+
+def _parse_skill_bundles(content, skill_count):
+    """[((question, model_answer), coding_problem), ...] from a structured response, or ValueError"""
+    payload = json.loads(content)
+    items = payload.get("skills") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or len(items) != skill_count:
+        raise ValueError(f"expected {skill_count} skill objects")
+    bundles = []
+    for item in items:
+        question_text, model_answer, coding_problem = _validate_skill_payload(item)
+        bundles.append(((question_text, model_answer), coding_problem))
+    return bundles
+
+def _generate_skills_structured(client, experience, skills):
+    """Generate question, answer and coding problem for several skills in one JSON-mode call"""
+    return cached_chat_completion(
+        client,
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "You are a technical interviewer creating questions and coding problems with complete solutions."},
+            {"role": "user", "content": _structured_skill_prompt(experience, skills)}
+        ],
+        max_tokens=900 * len(skills),
+        response_format={"type": "json_object"},
+        parse=lambda content: _parse_skill_bundles(content, len(skills))
+    )
+
+def _generate_skill_bundle(client, experience, skill):
+    """One structured call for a skill, falling back to the separate calls if the response violates the schema"""
+    try:
+        return _generate_skills_structured(client, experience, [skill])[0]
+    except (ValueError, AttributeError, TypeError) as e:
+        print(f"Structured generation for {skill} returned invalid JSON ({str(e)}); falling back to separate calls")
+        return _generate_skill_question(client, experience, skill), _generate_skill_coding(client, experience, skill)
+
+def _generate_skill_question(client, experience, skill):
+    """Generate one interview question for a skill, then its model answer"""
+    # Generate a general assessment question
+    q = f"Generate an interview question (with answer) for a candidate with {experience} years experience in {skill}."
+    
+    # First, get the question
+    question_text = cached_chat_completion(
+        client,
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "You are a technical interviewer."},
+            {"role": "user", "content": q}
+        ],
+        max_tokens=100
+    )
+
+    # Now, get the model answer/solution
+    answer_prompt = f"Given the following interview question, provide a model answer or solution that a strong candidate would give.\nQuestion: {question_text}"
+    model_answer = cached_chat_completion(
+        client,
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "You are a technical interviewer."},
+            {"role": "user", "content": answer_prompt}
+        ],
+        max_tokens=250
+    )
+    return question_text, model_answer
+
+def _generate_skill_coding(client, experience, skill):
+    """Generate one coding problem with a complete solution for a skill"""
+    # Generate a detailed coding problem with complete solution
+    coding_prompt = f"""
+    Generate a coding problem for a candidate with {experience} years experience in {skill}.
+    
+    Provide the response in this EXACT format:
+    {CODING_PROBLEM_FORMAT}
+    Make sure the problem is appropriate for {experience} years of experience and related to {skill}.
+    """
+    
+    return cached_chat_completion(
+        client,
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "You are a technical interviewer creating coding problems with complete solutions."},
+            {"role": "user", "content": coding_prompt}
+        ],
+        max_tokens=500
+    )
+
+def generate_questions_and_coding(interview_round, experience, skills, max_concurrency=None, mode=None):
+    """Generate Q&A and coding problems for up to 3 skills concurrently.
+
+    In multi_call mode each skill's question -> answer chain and its coding
+    problem run as separate tasks; the structured modes (see QA_GENERATION_MODE)
+    fetch all three parts per skill, or for all skills, as one JSON response.
+    Tasks share a thread pool bounded by max_concurrency (defaults to
+    LLM_MAX_CONCURRENCY). Results keep the skill order, and a failure for one
+    skill is returned as an error entry for that skill only: (error message, None),
+    see is_generation_error.
+    """
     if not skills:
         skills = ["problem solving"]
 
     # Limit to 3 Q&A and 3 coding problems for performance
     limited_skills = skills[:3] if len(skills) > 0 else ["problem solving"]
     
-    client = OpenAI()
-    
-    for i, skill in enumerate(limited_skills, 1):
-        # Generate a general assessment question
-        q = f"Generate an interview question (with answer) for a candidate with {experience} years experience in {skill}."
-        
-        # First, get the question
-        q_response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a technical interviewer."},
-                {"role": "user", "content": q}
-            ],
-            max_tokens=100
-        )
-        question_text = q_response.choices[0].message.content.strip()
+    client = get_openai_client()
+    workers = max(1, max_concurrency or LLM_MAX_CONCURRENCY)
+    mode = mode or QA_GENERATION_MODE
 
-        # Now, get the model answer/solution
-        answer_prompt = f"Given the following interview question, provide a model answer or solution that a strong candidate would give.\nQuestion: {question_text}"
-        a_response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a technical interviewer."},
-                {"role": "user", "content": answer_prompt}
-            ],
-            max_tokens=250
-        )
-        model_answer = a_response.choices[0].message.content.strip()
-        questions.append((question_text, model_answer))
+    if mode == "structured_batch":
+        try:
+            bundles = _generate_skills_structured(client, experience, limited_skills)
+            return [question for question, _ in bundles], [(f"Coding Problem {i}", problem) for i, (_, problem) in enumerate(bundles, 1)]
+        except (ValueError, AttributeError, TypeError) as e:
+            print(f"Structured batch generation returned invalid JSON ({str(e)}); falling back to separate calls")
+            mode = "multi_call"
+        except Exception as e:
+            print(f"Structured batch generation failed ({str(e)}); falling back to per-skill generation")
+            mode = "structured_skill"
 
-        # Generate a detailed coding problem with complete solution
-        coding_prompt = f"""
-        Generate a coding problem for a candidate with {experience} years experience in {skill}.
-        
-        Provide the response in this EXACT format:
-        
-        **Problem Statement:** [Clear description of the coding problem]
-        
-        **Input:** [Sample input format and examples]
-        
-        **Output:** [Expected output format and examples]
-        
-        **Python Solution:**
-        ```python
-        [Complete working Python code solution]
-        ```
-        
-        **Explanation:** [Brief explanation of the approach and algorithm]
-        
-        **Time Complexity:** [Big O notation]
-        
-        Make sure the problem is appropriate for {experience} years of experience and related to {skill}.
-        """
-        
-        c_response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a technical interviewer creating coding problems with complete solutions."},
-                {"role": "user", "content": coding_prompt}
-            ],
-            max_tokens=500
-        )
-        coding_solution = c_response.choices[0].message.content.strip()
-        coding.append((f"Coding Problem {i}", coding_solution))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if mode == "structured_skill":
+            bundle_futures = [submit_in_context(executor, _generate_skill_bundle, client, experience, skill) for skill in limited_skills]
+            results = [(lambda f=f: f.result()[0], lambda f=f: f.result()[1]) for f in bundle_futures]
+        else:
+            question_futures = [submit_in_context(executor, _generate_skill_question, client, experience, skill) for skill in limited_skills]
+            coding_futures = [submit_in_context(executor, _generate_skill_coding, client, experience, skill) for skill in limited_skills]
+            results = [(q_future.result, c_future.result) for q_future, c_future in zip(question_futures, coding_futures)]
+
+    questions = []
+    coding = []
+    for i, (skill, (question_result, coding_result)) in enumerate(zip(limited_skills, results), 1):
+        try:
+            questions.append(question_result())
+        except Exception as e:
+            print(f"Error generating question for {skill}: {str(e)}")
+            questions.append((f"Error generating question for {skill}: {str(e)}", None))
+        try:
+            coding.append((f"Coding Problem {i}", coding_result()))
+        except Exception as e:
+            print(f"Error generating coding problem for {skill}: {str(e)}")
+            coding.append((f"Error generating coding problem for {skill}: {str(e)}", None))
     
     # Only return the first 3 Q&A and 3 coding problems
     return questions[:3], coding[:3]
 
+def is_generation_error(entry):
+    """True for the (error message, None) entries generate_questions_and_coding returns for failed skills"""
+    return entry[1] is None
+
 def initialize_session_state():
     """Initialize session state variables for status tracking"""
     if 'candidate_statuses' not in st.session_state:
@@ -141,6 +708,57 @@ def initialize_session_state():
         st.session_state.status_history = {}
     if 'interview_assessments' not in st.session_state:
         st.session_state.interview_assessments = []
+    if 'status_index' not in st.session_state:
+        st.session_state.status_index = CandidatesByStatus()
+    if 'open_status_dialogs' not in st.session_state:
+        st.session_state.open_status_dialogs = {}  # candidate_id -> None, in the order they were opened
+
+class CandidatesByStatus:
+    """status -> candidate ids for this session, so dashboards never re-scan candidate_profiles.
+
+    Candidates without a recorded status count as "Screening". Between reruns
+    profiles are only appended, so catching up with newly saved ones looks at
+    the tail of the list; a rerun re-executes the module and starts a new,
+    empty profile list (ids restart at 1), which rebuilds the index from
+    scratch. Status changes go through update_candidate_status, which moves
+    the id.
+    """
+
+    def __init__(self):
+        self.members = {}  # status -> {candidate_id: None}, in the order candidates arrived
+        self.status_of = {}
+        self.synced = 0
+        self.profiles = None  # the candidate_profiles list the index was built from
+
+    def sync(self, statuses):
+        with candidate_profiles_lock:
+            if self.profiles is not candidate_profiles or len(candidate_profiles) < self.synced:
+                self.members, self.status_of, self.synced = {}, {}, 0
+                self.profiles = candidate_profiles
+            new_profiles = candidate_profiles[self.synced:]
+            self.synced = len(candidate_profiles)
+        for candidate in new_profiles:
+            self.move(candidate['id'], statuses.get(candidate['id'], "Screening"))
+
+    def move(self, candidate_id, status):
+        old_status = self.status_of.get(candidate_id)
+        if old_status is not None:
+            self.members[old_status].pop(candidate_id, None)
+        self.members.setdefault(status, {})[candidate_id] = None
+        self.status_of[candidate_id] = status
+
+    def count(self, status):
+        return len(self.members.get(status, ()))
+
+    def candidate_ids(self, status):
+        return list(self.members.get(status, ()))
+
+def get_status_index():
+    """This session's CandidatesByStatus index, caught up with profiles saved since the last rerun"""
+    initialize_session_state()
+    index = st.session_state.status_index
+    index.sync(st.session_state.candidate_statuses)
+    return index
 
 def update_candidate_status(candidate_id, new_status, notes=""):
     """Update candidate status and maintain history"""
@@ -148,6 +766,7 @@ def update_candidate_status(candidate_id, new_status, notes=""):
     
     # Update current status
     st.session_state.candidate_statuses[candidate_id] = new_status
+    get_status_index().move(candidate_id, new_status)
     
     # Update history
     if candidate_id not in st.session_state.status_history:
@@ -162,12 +781,12 @@ def update_candidate_status(candidate_id, new_status, notes=""):
 
 def get_candidates_by_status(status):
     """Get all candidates with a specific status"""
-    candidates = []
-    for candidate in candidate_profiles:
-        candidate_status = st.session_state.candidate_statuses.get(candidate['id'], "Screening")
-        if candidate_status == status:
-            candidates.append(candidate)
-    return candidates
+    candidates = (candidate_profiles_by_id.get(candidate_id) for candidate_id in get_status_index().candidate_ids(status))
+    return [candidate for candidate in candidates if candidate is not None]
+
+def count_candidates_by_status(status):
+    """Number of candidates with a specific status, without building their list"""
+    return get_status_index().count(status)
 
 def check_candidate_status_in_s3_csv(candidate_name):
     """Check if candidate exists in S3 CSV feedback file and return their status"""
@@ -176,36 +795,17 @@ def check_candidate_status_in_s3_csv(candidate_name):
         if not bucket_name:
             return "Need to go with L1", "S3_BUCKET_FEEDBACK environment variable not set"
         
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
-        )
-        
-        feedback_key = "feedback/interview_feedback.xlsx"
-        
-        # Try to download the CSV file from S3
+        # Look the candidate up in the status index (revalidated against the feedback file's ETag)
         try:
-            response = s3_client.get_object(Bucket=bucket_name, Key=feedback_key)
-            df = pd.read_excel(io.BytesIO(response['Body'].read()))
-            
-            # Check if candidate name exists in the CSV
-            candidate_rows = df[df['candidate_name'].str.strip().str.lower() == candidate_name.strip().lower()]
-            
-            if not candidate_rows.empty:
-                # Get the most recent entry (last row) for this candidate
-                latest_entry = candidate_rows.iloc[-1]
-                candidate_status = latest_entry.get('candidate_status', 'Unknown')
-                return candidate_status, f"Found in feedback records"
-            else:
-                return "Need to go with L1", "Candidate not found in feedback records"
-                
+            entry, has_records = candidate_status_index.lookup(candidate_name, s3_client_pool, bucket_name)
         except ClientError as e:
-            if e.response['Error']['Code'] == 'NoSuchKey':
-                return "Need to go with L1", "Feedback file does not exist yet"
-            else:
-                return "Need to go with L1", f"Error accessing feedback file: {str(e)}"
+            return "Need to go with L1", f"Error accessing feedback file: {str(e)}"
+        
+        if entry is not None:
+            return entry["status"], f"Found in feedback records"
+        if not has_records:
+            return "Need to go with L1", "Feedback file does not exist yet"
+        return "Need to go with L1", "Candidate not found in feedback records"
                 
     except Exception as e:
         return "Need to go with L1", f"Error checking candidate status: {str(e)}"
@@ -215,8 +815,7 @@ def render_round_dashboard(round_name, status_filter, next_round=None):
     st.subheader(f"🎯 {round_name} Candidates")
     
     # Filter candidates for this round
-    candidates = [c for c in candidate_profiles 
-                 if st.session_state.candidate_statuses.get(c['id'], 'Screening') == status_filter]
+    candidates = get_candidates_by_status(status_filter)
     
     if not candidates:
         st.info(f"No candidates in {round_name} stage.")
@@ -276,14 +875,15 @@ def render_status_tracking_dashboard():
     
     if not candidate_profiles:
         st.info("📝 No candidates available. Upload resumes first to track interview progress.")
+        render_feedback_analytics()
         return
     
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
     total_candidates = len(candidate_profiles)
-    offered_count = len([c for c in candidate_profiles if st.session_state.candidate_statuses.get(c['id'], 'Screening') == 'Offered'])
-    rejected_count = len([c for c in candidate_profiles if st.session_state.candidate_statuses.get(c['id'], 'Screening') == 'Rejected'])
+    offered_count = count_candidates_by_status('Offered')
+    rejected_count = count_candidates_by_status('Rejected')
     in_progress = total_candidates - offered_count - rejected_count
     
     with col1:
@@ -362,56 +962,59 @@ def render_status_tracking_dashboard():
                     
                     # Quick action buttons for status change
                     if st.button(f"Move", key=f"move_{candidate['id']}_{status_name}", help=f"Change status for {candidate['candidate_name']}"):
-                        st.session_state[f"show_status_dialog_{candidate['id']}"] = True
+                        st.session_state.open_status_dialogs[candidate['id']] = None
     
     st.divider()
     
     # Status change dialogs
-    for candidate in candidate_profiles:
-        if st.session_state.get(f"show_status_dialog_{candidate['id']}", False):
-            with st.expander(f"🔄 Change Status: {candidate['candidate_name']}", expanded=True):
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    current_status = st.session_state.candidate_statuses.get(candidate['id'], "Screening")
-                    st.info(f"Current Status: **{current_status}**")
-                    
-                    new_status = st.selectbox(
-                        "Select New Status:",
-                        [s["name"] for s in INTERVIEW_STATUSES],
-                        index=[s["name"] for s in INTERVIEW_STATUSES].index(current_status),
-                        key=f"status_select_{candidate['id']}"
-                    )
-                    
-                    notes = st.text_area(
-                        "Notes (optional):",
-                        placeholder="Add any notes about this status change...",
-                        key=f"status_notes_{candidate['id']}"
-                    )
-                
-                with col2:
-                    st.markdown("### 📋 Candidate Info")
-                    st.markdown(f"**Domain:** {candidate['domain']}")
-                    st.markdown(f"**Experience:** {candidate['experience_years']} years")
-                    st.markdown(f"**Skills:** {', '.join(candidate['skills'][:3])}")
-                
-                # Action buttons
-                col3, col4, col5 = st.columns(3)
-                with col3:
-                    if st.button("✅ Update Status", key=f"update_{candidate['id']}", type="primary"):
-                        update_candidate_status(candidate['id'], new_status, notes)
-                        st.session_state[f"show_status_dialog_{candidate['id']}"] = False
-                        st.success(f"Status updated to: {new_status}")
-                        st.rerun()
+    for candidate_id in list(st.session_state.open_status_dialogs):
+        candidate = candidate_profiles_by_id.get(candidate_id)
+        if candidate is None:
+            st.session_state.open_status_dialogs.pop(candidate_id, None)
+            continue
+        with st.expander(f"🔄 Change Status: {candidate['candidate_name']}", expanded=True):
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                current_status = st.session_state.candidate_statuses.get(candidate['id'], "Screening")
+                st.info(f"Current Status: **{current_status}**")
                 
-                with col4:
-                    if st.button("❌ Cancel", key=f"cancel_{candidate['id']}"):
-                        st.session_state[f"show_status_dialog_{candidate['id']}"] = False
-                        st.rerun()
+                new_status = st.selectbox(
+                    "Select New Status:",
+                    [s["name"] for s in INTERVIEW_STATUSES],
+                    index=[s["name"] for s in INTERVIEW_STATUSES].index(current_status),
+                    key=f"status_select_{candidate['id']}"
+                )
                 
-                with col5:
-                    if st.button("📜 View History", key=f"history_{candidate['id']}"):
-                        st.session_state[f"show_history_{candidate['id']}"] = True
+                notes = st.text_area(
+                    "Notes (optional):",
+                    placeholder="Add any notes about this status change...",
+                    key=f"status_notes_{candidate['id']}"
+                )
+            
+            with col2:
+                st.markdown("### 📋 Candidate Info")
+                st.markdown(f"**Domain:** {candidate['domain']}")
+                st.markdown(f"**Experience:** {candidate['experience_years']} years")
+                st.markdown(f"**Skills:** {', '.join(candidate['skills'][:3])}")
+            
+            # Action buttons
+            col3, col4, col5 = st.columns(3)
+            with col3:
+                if st.button("✅ Update Status", key=f"update_{candidate['id']}", type="primary"):
+                    update_candidate_status(candidate['id'], new_status, notes)
+                    st.session_state.open_status_dialogs.pop(candidate['id'], None)
+                    st.success(f"Status updated to: {new_status}")
+                    st.rerun()
+            
+            with col4:
+                if st.button("❌ Cancel", key=f"cancel_{candidate['id']}"):
+                    st.session_state.open_status_dialogs.pop(candidate['id'], None)
+                    st.rerun()
+            
+            with col5:
+                if st.button("📜 View History", key=f"history_{candidate['id']}"):
+                    st.session_state[f"show_history_{candidate['id']}"] = True
     
     # Status history section
     st.subheader("📈 Status History & Audit Trail")
@@ -421,7 +1024,8 @@ def render_status_tracking_dashboard():
     with col1:
         selected_candidate = st.selectbox(
             "Select Candidate:",
-            ["All Candidates"] + [c['candidate_name'] for c in candidate_profiles],
+            ["All Candidates"] + list(candidate_profiles_by_id),
+            format_func=lambda option: option if option == "All Candidates" else candidate_profiles_by_id[option]['candidate_name'],
             key="history_candidate_filter"
         )
     
@@ -430,10 +1034,10 @@ def render_status_tracking_dashboard():
     
     # Display history
     if selected_candidate == "All Candidates":
-        # Show all candidates' history
-        for candidate in candidate_profiles:
-            candidate_id = candidate['id']
-            if candidate_id in st.session_state.status_history:
+        # Show all candidates' history (only those with recorded changes)
+        for candidate_id in list(st.session_state.status_history):
+            candidate = candidate_profiles_by_id.get(candidate_id)
+            if candidate is not None:
                 with st.expander(f"📋 {candidate['candidate_name']} - Status History"):
                     history = st.session_state.status_history[candidate_id]
                     
@@ -459,7 +1063,7 @@ def render_status_tracking_dashboard():
                         st.info("No status changes recorded yet.")
     else:
         # Show specific candidate history
-        candidate = next((c for c in candidate_profiles if c['candidate_name'] == selected_candidate), None)
+        candidate = candidate_profiles_by_id.get(selected_candidate)
         if candidate:
             candidate_id = candidate['id']
             current_status = st.session_state.candidate_statuses.get(candidate_id, "Screening")
@@ -496,7 +1100,7 @@ def render_status_tracking_dashboard():
     # Status distribution chart
     status_counts = {}
     for status_info in INTERVIEW_STATUSES:
-        count = len(get_candidates_by_status(status_info["name"]))
+        count = count_candidates_by_status(status_info["name"])
         if count > 0:
             status_counts[f"{status_info['icon']} {status_info['name']}"] = count
     
@@ -519,6 +1123,67 @@ def render_status_tracking_dashboard():
                 st.metric("Rejection Rate", f"{rejection_rate:.1f}%")
                 st.metric("Conversion Rate (L1→Offer)", f"{success_rate:.1f}%")
 
+    render_feedback_analytics()
+
+def render_feedback_analytics():
+    """Render funnel, pass-rate and rating charts over the full feedback history"""
+    bucket_name = os.getenv('S3_BUCKET_FEEDBACK')
+    if not bucket_name:
+        return
+    st.markdown("#### 📚 Feedback History")
+    try:
+        summary = feedback_analytics_store.summary(s3_client_pool, bucket_name)
+    except Exception as e:
+        st.warning(f"Feedback history unavailable: {str(e)}")
+        return
+    if not summary["assessments"]:
+        st.info("No interview feedback recorded yet.")
+        return
+
+    funnel = summary["funnel"]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Assessments", summary["assessments"])
+    with col2:
+        st.metric("Candidates", summary["candidates"])
+    with col3:
+        l1_interviewed = funnel.loc["L1", "interviewed"]
+        st.metric("Conversion (L1→L3 pass)", f"{funnel.loc['L3', 'passed'] / l1_interviewed * 100:.1f}%" if l1_interviewed else "—")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("##### 🔻 Round Funnel")
+        st.bar_chart(funnel)
+    with col2:
+        st.markdown(f"##### ✅ Pass Rate per Round (decision ≥ {FEEDBACK_PASS_SCORE:g})")
+        st.dataframe(
+            summary["pass_rates"].style.format({"pass_rate": "{:.1%}", "avg_decision": "{:.2f}", "assessments": "{:.0f}"}, na_rep="—"),
+            use_container_width=True
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("##### ⭐ Rating Distributions")
+        st.bar_chart(summary["ratings"])
+    with col2:
+        st.markdown("##### 🏷️ Latest Status per Candidate")
+        st.bar_chart(summary["latest_status"])
+
+def render_streamed_text(chunks, placeholder, render=None, refresh_seconds=0.1):
+    """Progressively render streamed LLM text into a placeholder and return the assembled text"""
+    if render is None:
+        render = placeholder.markdown
+    text = ""
+    last_render = 0.0
+    for chunk in chunks:
+        text += chunk
+        if time.time() - last_render >= refresh_seconds:
+            render(text + " ▌")
+            last_render = time.time()
+    text = text.strip()
+    render(text)
+    return text
+
 def display_qa_section(title, content, icon="📝"):
     """Display Q&A content in interviewer-friendly format with robust parsing"""
     st.subheader(f"{icon} {title}")
@@ -711,8 +1376,8 @@ def display_coding_problems(problems_content, selected_language):
 
 # Simplified Question Generator for Interviewer Quick Prep
 class InterviewerPrepGenerator:
-    def generate_quick_brief(self, candidate_data):
-        """Generate a concise interviewer brief"""
+    def generate_quick_brief(self, candidate_data, stream=False):
+        """Generate a concise interviewer brief (an iterator of text chunks when stream=True)"""
         prompt = (
             f"Generate a concise interviewer preparation brief for:\n\n"
             f"CANDIDATE: {candidate_data.get('Full Name', 'Unknown')}\n"
@@ -733,6 +1398,8 @@ class InterviewerPrepGenerator:
             
             "Keep it concise and actionable for interviewer quick prep."
         )
+        if stream:
+            return self._stream_openai(prompt, max_tokens=800)
         return self._call_openai(prompt, max_tokens=800)
     
     def generate_quick_assessment_qa(self, domain, skills, experience):
@@ -757,8 +1424,8 @@ class InterviewerPrepGenerator:
         )
         return self._call_openai(prompt, max_tokens=1400)
     
-    def generate_coding_problems(self, domain, skills, experience, programming_language):
-        """Generate coding problems with solutions in specified language"""
+    def generate_coding_problems(self, domain, skills, experience, programming_language, stream=False):
+        """Generate coding problems with solutions in specified language (an iterator of text chunks when stream=True)"""
         
         # Determine difficulty based on experience
         if experience <= 2:
@@ -799,17 +1466,19 @@ class InterviewerPrepGenerator:
         
             f"Use the exact format above for all 3 problems."
         )
+        if stream:
+            return self._stream_openai(prompt, max_tokens=2000)
         return self._call_openai(prompt, max_tokens=2000)
     
     def _call_openai(self, prompt, max_tokens=1000):
         try:
-            response = openai.chat.completions.create(
+            result = cached_chat_completion(
+                openai,
                 model="gpt-4o",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
                 temperature=0.3
             )
-            result = response.choices[0].message.content.strip()
             print(f"OpenAI Response (first 200 chars): {result[:200]}...")
             return result
         except Exception as e:
@@ -817,6 +1486,20 @@ class InterviewerPrepGenerator:
             print(error_msg)
             return error_msg
 
+    def _stream_openai(self, prompt, max_tokens=1000):
+        try:
+            yield from stream_chat_completion(
+                openai,
+                model="gpt-4o",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=0.3
+            )
+        except Exception as e:
+            error_msg = f"Error generating content: {str(e)}"
+            print(error_msg)
+            yield error_msg
+
     def judge_llm_self_evaluation(self, llm_outputs_dict):
         """
         Use LLM to rate the overall quality of its own generated responses for a candidate (Q&A, coding, brief, etc).
@@ -840,13 +1523,13 @@ class InterviewerPrepGenerator:
             f"\nLLM-GENERATED RESPONSES:\n{outputs_text}\n"
         )
         try:
-            response = openai.chat.completions.create(
+            content = cached_chat_completion(
+                openai,
                 model="gpt-4o",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=200,
                 temperature=0.1
             )
-            content = response.choices[0].message.content.strip()
             json_start = content.find("{")
             json_end = content.rfind("}")
             if json_start == -1 or json_end == -1:
@@ -857,37 +1540,223 @@ class InterviewerPrepGenerator:
             return {"error": str(e)}
             return error_msg
 
-def extract_text_from_pdf(file):
+# Compared against the pages actually read, so it only takes effect at or below PDF_PAGE_BUDGET
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "10"))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Engines differ in the text they produce, so switching (or auto = fastest installed of
+# pypdfium2, pypdf2, pdfminer) is opt-in after running extraction_benchmark.py
+PDF_BACKEND = pdf_extraction.resolve_backend(os.getenv("PDF_BACKEND", "pypdf2"))
+
+# Oversized resumes (portfolios, publication lists) are read front to back only until one of these runs out (0 = no limit)
+PDF_PAGE_BUDGET = int(os.getenv("PDF_PAGE_BUDGET", "15"))
+PDF_CHAR_BUDGET = int(os.getenv("PDF_CHAR_BUDGET", "60000"))
+PDF_TOKEN_BUDGET = int(os.getenv("PDF_TOKEN_BUDGET", "0"))
+
+# Lines this close to the top or bottom of a page count as a possible running header/footer
+PAGE_EDGE_LINES = 3
+
+def _normalize_line(line):
+    return re.sub(r"\s+", " ", line).strip()
+
+def _repeated_edge_lines(pages):
+    """Lines found at the top or bottom of two or more pages (running headers and footers), lowercased"""
+    pages_by_line = {}
+    for page_number, page in enumerate(pages):
+        lines = [line for line in (_normalize_line(raw).lower() for raw in page.splitlines()) if line]
+        for line in lines[:PAGE_EDGE_LINES] + lines[-PAGE_EDGE_LINES:]:
+            pages_by_line.setdefault(line, set()).add(page_number)
+    return sorted(line for line, page_numbers in pages_by_line.items() if len(page_numbers) >= 2)
+
+# A bare number as a page's first or last line is its page number; elsewhere ("Years of Experience" / "7") it is content
+BARE_PAGE_NUMBER_PATTERN = re.compile(r"^\d{1,3}$")
+
+def _strip_edge_page_numbers(page):
+    """A page's text without a bare page number as its first or last non-empty line"""
+    lines = page.splitlines()
+    nonblank = [i for i, line in enumerate(lines) if line.strip()]
+    edges = {i for i in nonblank[:1] + nonblank[-1:] if BARE_PAGE_NUMBER_PATTERN.match(lines[i].strip())}
+    return "\n".join(line for i, line in enumerate(lines) if i not in edges) if edges else page
+
+def extract_pdf_text(file, parallel=True):
+    """Extract a PDF's text within the page/char/token budgets, each page once with the PDF_BACKEND engine.
+
+    Returns {"text", "page_count", "pages_read", "skipped_pages", "truncated",
+    "stopped_by", "repeated_lines"}; on failure "text" holds the error message.
+    Bare page numbers are removed from page edges; repeated_lines are the page
+    headers/footers compact_resume_text removes.
+    """
     try:
-        reader = PdfReader(file)
-        text = "\n".join(page.extract_text() for page in reader.pages if page.extract_text())
-        return text.strip() if text else None
+        extraction = pdf_extraction.extract_pdf_pages(
+            file,
+            parallel_min_pages=PDF_PARALLEL_MIN_PAGES if parallel else None,
+            workers=PDF_EXTRACT_WORKERS,
+            backend=PDF_BACKEND,
+            max_pages=PDF_PAGE_BUDGET,
+            max_chars=PDF_CHAR_BUDGET,
+            max_tokens=PDF_TOKEN_BUDGET,
+            count_tokens=count_tokens
+        )
+        slowest = max(extraction["page_seconds"], default=0.0)
+        pages_read = len(extraction["page_seconds"])
+        print(f"Extracted {pages_read}/{extraction['page_count']} pages with {PDF_BACKEND} in {extraction['seconds']:.2f}s "
+              f"on {extraction['workers']} worker(s), slowest page {slowest:.2f}s"
+              + (f", {len(extraction['skipped_pages'])} image-only skipped" if extraction["skipped_pages"] else "")
+              + (f", stopped by {extraction['stopped_by']} budget" if extraction["truncated"] else ""))
+        return {
+            "text": pdf_extraction.join_page_texts([_strip_edge_page_numbers(page) for page in extraction["pages"]]),
+            "page_count": extraction["page_count"],
+            "pages_read": pages_read,
+            "skipped_pages": extraction["skipped_pages"],
+            "truncated": extraction["truncated"],
+            "stopped_by": extraction["stopped_by"],
+            "repeated_lines": _repeated_edge_lines(extraction["pages"])
+        }
     except Exception as e:
-        return f"Error extracting text: {str(e)}"
+        return {"text": f"Error extracting text: {str(e)}", "page_count": None, "pages_read": 0,
+                "skipped_pages": [], "truncated": False, "stopped_by": None, "repeated_lines": []}
+
+def extract_text_from_pdf(file, parallel=True):
+    """Extract a PDF's text within the extraction budgets"""
+    return extract_pdf_text(file, parallel)["text"]
+
+def extraction_summary(extraction):
+    """An extraction result without its text and header/footer lines, as kept in pipeline results"""
+    return {key: value for key, value in extraction.items() if key not in ("text", "repeated_lines")} if extraction else None
+
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
+
+# Section headings whose content rarely matters for the parsed fields
+LOW_INFORMATION_SECTIONS = {
+    "references", "hobbies", "interests", "hobbies and interests", "declaration",
+    "personal details", "personal information", "languages known", "extracurricular activities"
+}
+# Known headings; any other heading-like line also ends a dropped section
+RESUME_SECTIONS = LOW_INFORMATION_SECTIONS | {
+    "summary", "profile", "objective", "career objective", "professional summary", "experience",
+    "work experience", "professional experience", "employment history", "skills", "technical skills",
+    "projects", "education", "certifications", "achievements", "awards", "publications", "contact"
+}
+# A dropped section ends after this many lines even without a heading after it
+LOW_INFORMATION_SECTION_MAX_LINES = 8
+# "Page 2", "2 of 3" or "2/3"; bare numbers are only page numbers at a page edge (see _strip_edge_page_numbers)
+PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s*(of|/)\s*\d+)$", re.IGNORECASE)
+HEADING_CONNECTORS = {"and", "of", "&", "the", "/", "-"}
+# Words that make a short title-case line a heading ("Key Skills", "Work History", "Academic Qualifications")
+HEADING_WORDS = {
+    "skills", "skill", "experience", "history", "employment", "work", "education", "qualifications",
+    "academic", "academics", "projects", "summary", "profile", "objective", "certifications", "courses",
+    "training", "internships", "achievements", "awards", "publications", "expertise", "competencies",
+    "strengths", "responsibilities", "career", "contact", "technologies", "tools"
+}
+
+def _section_heading(line):
+    heading = line.strip().rstrip(":").strip().lower()
+    return heading if heading in RESUME_SECTIONS else None
+
+def _looks_like_heading(line):
+    """Short upper-case or colon-terminated line, or title-case line with a heading word (Key Skills, WORK HISTORY, Languages:)"""
+    stripped = line.strip().rstrip(":").strip()
+    words = stripped.split()
+    if not words or len(words) > 4 or len(stripped) > 40 or stripped[-1] in ".,;" or re.search(r"\d", stripped):
+        return False
+    if line.strip().endswith(":") or stripped.isupper():
+        return True
+    title_case = all(word[0].isupper() or not word[0].isalpha() or word.lower() in HEADING_CONNECTORS for word in words)
+    return title_case and any(word.lower() in HEADING_WORDS for word in words)
+
+def compact_resume_text(resume_text, token_budget=None, repeated_lines=None):
+    """Shrink extracted resume text before it is sent to the parser.
+
+    Normalizes whitespace, drops page numbers, keeps only the first copy of
+    page headers/footers (repeated_lines from extract_pdf_text), removes
+    low-information sections such as references and hobbies, and truncates to
+    token_budget tokens (RESUME_TOKEN_BUDGET by default), keeping the start of
+    the resume. A dropped section ends at the next heading-like line or after
+    LOW_INFORMATION_SECTION_MAX_LINES lines. Returns (text, stats) where stats
+    holds the before/after token counts.
+    """
+    token_budget = token_budget or RESUME_TOKEN_BUDGET
+    tokens_before = count_tokens(resume_text)
+
+    repeated = set(repeated_lines or ())
+    seen_repeated = set()
+    kept_lines = []
+    skipped_lines = None  # lines dropped so far from the current low-information section
+    for raw_line in resume_text.splitlines():
+        line = _normalize_line(raw_line)
+        if not line or PAGE_NUMBER_PATTERN.match(line):
+            continue
+        heading = _section_heading(line)
+        if heading in LOW_INFORMATION_SECTIONS:
+            skipped_lines = 0
+            continue
+        if skipped_lines is not None:
+            if heading is not None or _looks_like_heading(line) or skipped_lines >= LOW_INFORMATION_SECTION_MAX_LINES:
+                skipped_lines = None
+            else:
+                skipped_lines += 1
+                continue
+        key = line.lower()
+        if key in repeated:
+            if key in seen_repeated:
+                continue
+            seen_repeated.add(key)
+        kept_lines.append(line)
+
+    compacted = "\n".join(kept_lines)
+    truncated = False
+    if count_tokens(compacted) > token_budget:
+        truncated = True
+        if token_encoder is not None:
+            compacted = token_encoder.decode(token_encoder.encode(compacted, disallowed_special=())[:token_budget])
+        else:
+            print(f"Truncating resume to ~{token_budget} estimated tokens; install tiktoken for exact counts")
+            compacted = compacted[:token_budget * 4]
 
-def parse_resume_with_gpt(resume_text):
+    stats = {
+        "tokens_before": tokens_before,
+        "tokens_after": count_tokens(compacted),
+        "truncated": truncated,
+        "tokenizer": "tiktoken" if token_encoder is not None else "estimate"
+    }
+    return compacted, stats
+
+# Resume fields requested from the parser, in prompt order, with the completion tokens each typically needs
+RESUME_FIELD_SPECS = {
+    "Full Name": ("Full Name (string)", 20),
+    "Skills": ("Skills (list of strings)", 250),
+    "Years of Experience": ("Years of Experience (integer)", 10),
+    "Relevant Domain": ("Relevant Domain (string)", 20),
+    "GitHub Links": ("GitHub Links (list of URLs)", 80),
+    "LinkedIn Links": ("LinkedIn Links (list of URLs)", 80),
+    "Projects": ("Projects (list of short descriptions; if not present, empty list)", 500),
+    "Past Job Titles": ("Past Job Titles (list of strings; if not present, empty list)", 150)
+}
+RESUME_LIST_FIELDS = ["Skills", "GitHub Links", "LinkedIn Links", "Projects", "Past Job Titles"]
+
+def parse_resume_with_gpt(resume_text, fields=None):
+    """Ask GPT for the given resume fields (all of RESUME_FIELD_SPECS by default)"""
+    fields = fields or list(RESUME_FIELD_SPECS)
+    if len(fields) == len(RESUME_FIELD_SPECS):
+        max_tokens = 1500
+    else:
+        # Residual requests after the local pre-parser need far fewer completion tokens
+        max_tokens = sum(RESUME_FIELD_SPECS[field][1] for field in fields) + 100
     prompt = (
         "You are a meticulous resume parser AI. Extract ONLY and ALL of the following details in strict JSON format:\n"
-        "- Full Name (string)\n"
-        "- Skills (list of strings)\n"
-        "- Years of Experience (integer)\n"
-        "- Relevant Domain (string)\n"
-        "- GitHub Links (list of URLs)\n"
-        "- LinkedIn Links (list of URLs)\n"
-        "- Projects (list of short descriptions; if not present, empty list)\n"
-        "- Past Job Titles (list of strings; if not present, empty list)\n\n"
+        + "".join(f"- {RESUME_FIELD_SPECS[field][0]}\n" for field in fields) + "\n"
         "Return strictly valid JSON ONLY. No explanations.\n"
         f"Resume text:\n{resume_text}"
     )
 
     try:
-        response = openai.chat.completions.create(
+        response_text = cached_chat_completion(
+            openai,
             model="gpt-4o",
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=1500,
+            max_tokens=max_tokens,
             temperature=0.2
         )
-        response_text = response.choices[0].message.content.strip()
         json_start = response_text.find("{")
         json_end = response_text.rfind("}")
         if json_start == -1 or json_end == -1:
@@ -895,10 +1764,9 @@ def parse_resume_with_gpt(resume_text):
         json_text = response_text[json_start:json_end+1]
         parsed_data = json.loads(json_text)
 
-        required_keys = ["Full Name", "Skills", "Years of Experience", "Relevant Domain", "GitHub Links", "LinkedIn Links", "Projects", "Past Job Titles"]
-        for key in required_keys:
+        for key in fields:
             if key not in parsed_data:
-                if key in ["Skills", "GitHub Links", "LinkedIn Links", "Projects", "Past Job Titles"]:
+                if key in RESUME_LIST_FIELDS:
                     parsed_data[key] = []
                 else:
                     return {"error": f"Missing key in AI response: {key}"}
@@ -909,46 +1777,430 @@ def parse_resume_with_gpt(resume_text):
     except Exception as e:
         return {"error": str(e)}
 
-current_candidate_id = 1
-candidate_profiles = []
+# Run the local heuristic pre-parser and only ask GPT for the fields it can't determine
+RESUME_LOCAL_PREPARSE = os.getenv("RESUME_LOCAL_PREPARSE", "1") == "1"
 
-def save_candidate_profile(parsed_details, resume_filename):
-    global current_candidate_id
-    try:
-        # Save to in-memory list
-        candidate = {
-            'id': current_candidate_id,
-            'candidate_name': parsed_details.get('Full Name', ''),
-            'resume_filename': resume_filename,
-            'github_links': parsed_details.get('GitHub Links', []),
-            'linkedin_links': parsed_details.get('LinkedIn Links', []),
-            'domain': parsed_details.get('Relevant Domain', 'General'),
-            'experience_years': parsed_details.get('Years of Experience', 0),
-            'skills': parsed_details.get('Skills', []),
-            'projects': parsed_details.get('Projects', []),
-            'job_titles': parsed_details.get('Past Job Titles', []),
-            'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        candidate_profiles.append(candidate)
-        current_candidate_id += 1
-        return candidate['id']
-    except Exception as e:
-        st.error(f"Error saving candidate profile: {str(e)}")
+# Canonical skill name -> extra spellings matched case-insensitively
+SKILLS_DICTIONARY = {
+    "Python": [], "Java": [], "JavaScript": ["js"], "TypeScript": [], "C++": ["cpp"], "C#": ["csharp"],
+    "Golang": [], "Kotlin": [], "Scala": [], "Ruby": [], "PHP": [], "Perl": [],
+    "SQL": [], "MySQL": [], "PostgreSQL": ["postgres"], "MongoDB": [], "Redis": [], "Cassandra": [],
+    "DynamoDB": [], "Elasticsearch": [], "SQLite": [],
+    "HTML": [], "CSS": [], "React": ["react.js", "reactjs"], "Angular": ["angularjs"], "Vue.js": ["vue", "vuejs"],
+    "Node.js": ["nodejs"], "Express.js": ["expressjs"], "Next.js": ["nextjs"], "Redux": [], "GraphQL": [],
+    "Django": [], "Flask": [], "FastAPI": [], "Spring Boot": [], "Hibernate": [], ".NET": ["dotnet", "asp.net"],
+    "REST APIs": ["restful", "rest api", "rest apis"], "Microservices": [], "gRPC": [],
+    "AWS": ["amazon web services"], "Azure": [], "GCP": ["google cloud"], "Docker": [], "Kubernetes": ["k8s"],
+    "Terraform": [], "Ansible": [], "Jenkins": [], "GitHub Actions": [], "CI/CD": [], "Linux": [], "Git": [],
+    "Kafka": [], "RabbitMQ": [], "Apache Spark": ["pyspark"], "Hadoop": [], "Airflow": [], "dbt": [],
+    "Pandas": [], "NumPy": [], "scikit-learn": ["sklearn"], "TensorFlow": [], "PyTorch": [], "Keras": [],
+    "Machine Learning": ["ml"], "Deep Learning": [], "NLP": ["natural language processing"],
+    "Computer Vision": [], "LLMs": ["llm", "large language models"], "Data Analysis": [], "Power BI": [], "Tableau": [],
+    "Selenium": [], "Cypress": [], "JUnit": [], "pytest": [], "Jira": [], "Agile": ["scrum"],
+    "Android": [], "iOS": [], "React Native": [], "Figma": []
+}
+# Skill names that are also ordinary English words, only matched with this exact capitalization.
+# Names that are ambiguous even capitalized ("Go-to", "Spring 2020", "R&D", "rest of the team",
+# "express delivery") are left to GPT, which always gets asked for Skills as well.
+CASE_SENSITIVE_SKILLS = {
+    "Rust": "Rust", "Swift": "Swift", "Spark": "Apache Spark",
+    "Flutter": "Flutter", "Oracle": "Oracle", "Snowflake": "Snowflake"
+}
+
+def _skill_pattern(terms, flags=0):
+    alternation = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"(?<![\w+#.&/])(?:{alternation})(?![\w+#&]|\.\w)", flags)
+
+SKILL_ALIASES = {alias.lower(): skill for skill, aliases in SKILLS_DICTIONARY.items() for alias in [skill, *aliases]}
+SKILL_PATTERN = _skill_pattern(SKILL_ALIASES, re.IGNORECASE)
+CASE_SENSITIVE_SKILL_PATTERN = _skill_pattern(CASE_SENSITIVE_SKILLS)
+
+GITHUB_LINK_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9_.-]+(?:/[A-Za-z0-9_.-]+)?", re.IGNORECASE)
+LINKEDIN_LINK_PATTERN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[A-Za-z0-9_%-]+/?", re.IGNORECASE)
+
+MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+_DATE = r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?,?\s*|(?:0?[1-9]|1[0-2])[/.-])?(?:19|20)\d{2}"
+DATE_RANGE_PATTERN = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|till|until)\s*(?P<end>{_DATE}|present|current|now|date|today|ongoing)",
+    re.IGNORECASE
+)
+EXPLICIT_EXPERIENCE_PATTERN = re.compile(
+    r"(\d{1,2})\s*\+?\s*(?:years|yrs)\.?\s+(?:of\s+)?(?:total\s+|professional\s+|industry\s+|work\s+|it\s+)?experience",
+    re.IGNORECASE
+)
+# Date ranges under headings with these words are studies/credentials, not work experience
+NON_WORK_HEADING_WORDS = {
+    "education", "educational", "academic", "academics", "qualification", "qualifications", "degree", "degrees",
+    "certification", "certifications", "courses", "coursework", "training", "achievements", "awards", "publications"
+}
+NAME_PATTERN = re.compile(r"^[A-Z][A-Za-z'.-]+(?: [A-Z][A-Za-z'.-]+){1,3}$")
+
+def _dedupe(values):
+    return list(dict.fromkeys(values))
+
+def _parse_resume_date(token):
+    token = token.strip().lower()
+    if token in ("present", "current", "now", "date", "today", "ongoing"):
+        today = datetime.now()
+        return today.year * 12 + today.month
+    year = int(re.search(r"(?:19|20)\d{2}", token).group())
+    month_name = re.match(r"[a-z]{3}", token)
+    month_number = re.match(r"(\d{1,2})[/.-]", token)
+    if month_name:
+        month = MONTHS.get(month_name.group(), 1)
+    elif month_number:
+        month = int(month_number.group(1))
+    else:
+        month = 1
+    return year * 12 + month
+
+def _experience_years_from_dates(resume_text):
+    """Total years covered by work date ranges, merging overlapping periods"""
+    periods = []
+    section = None
+    for line in resume_text.splitlines():
+        heading = _section_heading(line)
+        if heading is None and _looks_like_heading(line):
+            heading = line.strip().rstrip(":").strip().lower()
+        if heading is not None:
+            section = heading
+            continue
+        if section is not None and NON_WORK_HEADING_WORDS & set(re.findall(r"[a-z]+", section)):
+            continue
+        for match in DATE_RANGE_PATTERN.finditer(line):
+            start = _parse_resume_date(match.group("start"))
+            end = _parse_resume_date(match.group("end"))
+            if end > start:
+                periods.append((start, end))
+    if not periods:
         return None
 
-def test_aws_credentials():
-    """Test AWS credentials and S3 connectivity"""
-    try:
-        # Try to create S3 client with explicit error handling
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
-        )
-        
+    total_months = 0
+    current_start, current_end = None, None
+    for start, end in sorted(periods):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total_months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    total_months += current_end - current_start
+    return total_months // 12
+
+def extract_resume_details_locally(resume_text):
+    """Deterministic pre-parser for fields that don't need an LLM.
+
+    Returns only the fields it could determine: GitHub/LinkedIn links (regex),
+    Skills (dictionary matching; only ever a supplement to GPT's list) and Years
+    of Experience (an explicit "N years of experience" statement, otherwise
+    merged work date ranges).
+    """
+    details = {
+        "GitHub Links": _dedupe(
+            link if link.lower().startswith("http") else f"https://{link}"
+            for link in GITHUB_LINK_PATTERN.findall(resume_text)
+        ),
+        "LinkedIn Links": _dedupe(
+            link if link.lower().startswith("http") else f"https://{link}"
+            for link in LINKEDIN_LINK_PATTERN.findall(resume_text)
+        )
+    }
+
+    matches = [(m.start(), SKILL_ALIASES[m.group().lower()]) for m in SKILL_PATTERN.finditer(resume_text)]
+    matches += [(m.start(), CASE_SENSITIVE_SKILLS[m.group()]) for m in CASE_SENSITIVE_SKILL_PATTERN.finditer(resume_text)]
+    skills = _dedupe(skill for _, skill in sorted(matches))
+    if skills:
+        details["Skills"] = skills
+
+    explicit_years = [int(years) for years in EXPLICIT_EXPERIENCE_PATTERN.findall(resume_text)]
+    years = max(explicit_years) if explicit_years else _experience_years_from_dates(resume_text)
+    if years is not None:
+        details["Years of Experience"] = years
+    return details
+
+def _guess_candidate_name(resume_text):
+    """First line near the top that looks like a person's name"""
+    for line in resume_text.splitlines()[:5]:
+        line = line.strip()
+        if NAME_PATTERN.match(line) and line.lower() not in ("curriculum vitae", "resume"):
+            return line.title() if line.isupper() else line
+    return ""
+
+def parse_resume(resume_text):
+    """Parse a resume with the local pre-parser first and GPT only for the residual fields.
+
+    Returns (parsed_details, parse_mode) where parse_mode is "llm" (pre-parser
+    disabled), "hybrid" or "local" (GPT unavailable; local fields plus defaults).
+    Skills are always requested from GPT; dictionary matches are appended to its list.
+    """
+    if not RESUME_LOCAL_PREPARSE:
+        return parse_resume_with_gpt(resume_text), "llm"
+
+    local_details = extract_resume_details_locally(resume_text)
+    residual_fields = [field for field in RESUME_FIELD_SPECS if field not in local_details or field == "Skills"]
+    llm_details = parse_resume_with_gpt(resume_text, fields=residual_fields)
+    if "error" not in llm_details:
+        parsed_details = {field: llm_details.get(field) for field in residual_fields}
+        llm_skills = parsed_details["Skills"] if isinstance(parsed_details["Skills"], list) else []
+        known_skills = {str(skill).lower() for skill in llm_skills}
+        local_skills = [skill for skill in local_details.pop("Skills", []) if skill.lower() not in known_skills]
+        parsed_details.update(local_details)
+        parsed_details["Skills"] = llm_skills + local_skills
+        # Keep the prompt's field order for display and prep packs
+        return {field: parsed_details[field] for field in RESUME_FIELD_SPECS}, "hybrid"
+
+    print(f"LLM resume parsing unavailable ({llm_details['error']}); using local pre-parser output only")
+    parsed_details = {
+        "Full Name": _guess_candidate_name(resume_text),
+        "Skills": [],
+        "Years of Experience": 0,
+        "Relevant Domain": "General",
+        "GitHub Links": [],
+        "LinkedIn Links": [],
+        "Projects": [],
+        "Past Job Titles": []
+    }
+    parsed_details.update(local_details)
+    return parsed_details, "local"
+
+# --- Extraction and parse sidecars ---
+# Extracted text and parsed details are stored as gzipped JSON in the resume bucket, keyed by the PDF's SHA-256
+# and a fingerprint of the code and settings that produced them, so any process can skip work another has done.
+RESUME_SIDECARS_ENABLED = os.getenv("RESUME_SIDECARS_ENABLED", "1") == "1"
+RESUME_SIDECAR_PREFIX = os.getenv("RESUME_SIDECAR_PREFIX", ".sidecars/")
+
+def _fingerprint(*parts):
+    return hashlib.sha256("\n".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:12]
+
+# Editing the extractor, parser, prompts, field specs or skill dictionary changes the version and
+# so orphans old sidecars instead of serving stale output
+EXTRACTION_VERSION = _fingerprint(
+    pdf_extraction.backend_version(PDF_BACKEND), inspect.getsource(pdf_extraction), inspect.getsource(extract_pdf_text),
+    inspect.getsource(_repeated_edge_lines), PAGE_EDGE_LINES,
+    inspect.getsource(_strip_edge_page_numbers), BARE_PAGE_NUMBER_PATTERN.pattern,
+    PDF_PAGE_BUDGET, PDF_CHAR_BUDGET, PDF_TOKEN_BUDGET, token_encoder is not None
+)
+PARSER_VERSION = _fingerprint(
+    *(inspect.getsource(func) for func in (
+        _section_heading, _looks_like_heading, compact_resume_text, parse_resume_with_gpt, _parse_resume_date,
+        _experience_years_from_dates, extract_resume_details_locally, _guess_candidate_name, parse_resume
+    )),
+    json.dumps(RESUME_FIELD_SPECS, sort_keys=True),
+    json.dumps(SKILLS_DICTIONARY, sort_keys=True),
+    json.dumps(CASE_SENSITIVE_SKILLS, sort_keys=True),
+    sorted(NON_WORK_HEADING_WORDS),
+    sorted(LOW_INFORMATION_SECTIONS),
+    sorted(RESUME_SECTIONS),
+    PAGE_NUMBER_PATTERN.pattern,
+    LOW_INFORMATION_SECTION_MAX_LINES,
+    sorted(HEADING_WORDS),
+    RESUME_TOKEN_BUDGET,
+    RESUME_LOCAL_PREPARSE
+)
+
+def resume_sidecar_key(resume_hash, kind):
+    """S3 key of a resume's "text" or "parse" sidecar for the current extractor/parser version"""
+    version = EXTRACTION_VERSION if kind == "text" else PARSER_VERSION
+    return f"{RESUME_SIDECAR_PREFIX}{resume_hash}/{kind}-{version}.json.gz"
+
+def load_resume_sidecar(resume_hash, kind):
+    """Decoded sidecar, or None on a miss (sidecar errors never fail the pipeline)"""
+    if not RESUME_SIDECARS_ENABLED:
+        return None
+    try:
+        response = s3_client_pool.get_object(
+            Bucket=os.getenv('S3_BUCKET_NAME', 'resumefolderbucket'),
+            Key=resume_sidecar_key(resume_hash, kind)
+        )
+        return json.loads(gzip.decompress(response['Body'].read()))
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchKey':
+            print(f"Could not read {kind} sidecar for {resume_hash[:12]}: {str(e)}")
+    except Exception as e:
+        print(f"Could not read {kind} sidecar for {resume_hash[:12]}: {str(e)}")
+    return None
+
+def save_resume_sidecar(resume_hash, kind, payload):
+    if not RESUME_SIDECARS_ENABLED:
+        return
+    try:
+        s3_client_pool.put_object(
+            Bucket=os.getenv('S3_BUCKET_NAME', 'resumefolderbucket'),
+            Key=resume_sidecar_key(resume_hash, kind),
+            Body=gzip.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8")),
+            ContentType="application/json",
+            ContentEncoding="gzip"
+        )
+    except Exception as e:
+        print(f"Could not write {kind} sidecar for {resume_hash[:12]}: {str(e)}")
+
+def load_extraction_sidecar(resume_hash):
+    """extract_pdf_text result stored for this PDF and extractor version, or None"""
+    sidecar = load_resume_sidecar(resume_hash, "text")
+    return {key: value for key, value in sidecar.items() if key != "resume_hash"} if sidecar else None
+
+def extract_resume_text(resume_hash, resume_file):
+    """extract_pdf_text result for a PDF from its sidecar, or extracted now (and written back when extraction worked)"""
+    sidecar = load_extraction_sidecar(resume_hash)
+    if sidecar is not None:
+        return sidecar
+    if hasattr(resume_file, "seek"):
+        resume_file.seek(0)
+    extraction = extract_pdf_text(resume_file)
+    save_extracted_text_sidecar(resume_hash, extraction)
+    return extraction
+
+def save_extracted_text_sidecar(resume_hash, extraction):
+    if extraction["text"] and not extraction["text"].startswith("Error"):
+        save_resume_sidecar(resume_hash, "text", {"resume_hash": resume_hash, **extraction})
+
+current_candidate_id = 1
+candidate_profiles = []
+candidate_profiles_by_id = {}
+candidate_profiles_lock = threading.Lock()  # ingestion pipeline workers save profiles concurrently
+
+def save_candidate_profile(parsed_details, resume_filename):
+    global current_candidate_id
+    try:
+        with candidate_profiles_lock:
+            # Save to in-memory list
+            candidate = {
+                'id': current_candidate_id,
+                'candidate_name': parsed_details.get('Full Name', ''),
+                'resume_filename': resume_filename,
+                'github_links': parsed_details.get('GitHub Links', []),
+                'linkedin_links': parsed_details.get('LinkedIn Links', []),
+                'domain': parsed_details.get('Relevant Domain', 'General'),
+                'experience_years': parsed_details.get('Years of Experience', 0),
+                'skills': parsed_details.get('Skills', []),
+                'projects': parsed_details.get('Projects', []),
+                'job_titles': parsed_details.get('Past Job Titles', []),
+                'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            candidate_profiles.append(candidate)
+            candidate_profiles_by_id[candidate['id']] = candidate
+            current_candidate_id += 1
+            return candidate['id']
+    except Exception as e:
+        st.error(f"Error saving candidate profile: {str(e)}")
+        return None
+
+# --- Shared S3 client ---
+# boto3 clients are thread-safe, so one pooled client serves every session and background thread instead of
+# re-resolving credentials and opening new TLS connections for each call.
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+S3_CONNECT_TIMEOUT_SECONDS = float(os.getenv("S3_CONNECT_TIMEOUT_SECONDS", "5"))
+S3_READ_TIMEOUT_SECONDS = float(os.getenv("S3_READ_TIMEOUT_SECONDS", "30"))
+S3_RETRY_MODE = os.getenv("S3_RETRY_MODE", "standard")
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+
+class S3CallStats:
+    """Per-operation latency and bytes transferred of calls made through the shared S3 client (including botocore retries)"""
+
+    def __init__(self, window=500):
+        self.window = window
+        self._operations = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation, seconds, error=False, bytes_sent=0, bytes_received=0):
+        with self._lock:
+            op = self._operations.setdefault(operation, {
+                "calls": 0, "errors": 0, "total": 0.0, "max": 0.0, "bytes_sent": 0, "bytes_received": 0,
+                "recent": deque(maxlen=self.window)
+            })
+            op["calls"] += 1
+            op["errors"] += int(error)
+            op["bytes_sent"] += bytes_sent
+            op["bytes_received"] += bytes_received
+            op["total"] += seconds
+            op["max"] = max(op["max"], seconds)
+            op["recent"].append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for operation, op in sorted(self._operations.items()):
+                recent = sorted(op["recent"])
+                result[operation] = {
+                    "calls": op["calls"],
+                    "errors": op["errors"],
+                    "avg_ms": round(op["total"] / op["calls"] * 1000, 1),
+                    "p50_ms": round(recent[len(recent) // 2] * 1000, 1),
+                    "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 1),
+                    "max_ms": round(op["max"] * 1000, 1),
+                    "bytes_sent": op["bytes_sent"],
+                    "bytes_received": op["bytes_received"]
+                }
+            return result
+
+@st.cache_resource
+def get_s3_call_stats():
+    """Process-wide S3 latency stats shared by all sessions"""
+    return S3CallStats()
+
+s3_call_stats = get_s3_call_stats()
+
+def _request_body_size(params):
+    headers = params.get('headers') or {}
+    if headers.get('Content-Length'):
+        return int(headers['Content-Length'])
+    body = params.get('body')
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    try:
+        position = body.tell()
+        body.seek(0, os.SEEK_END)
+        size = body.tell() - position
+        body.seek(position)
+        return size
+    except (AttributeError, OSError, ValueError, TypeError):
+        return 0
+
+def _start_s3_call(model, context, params=None, **kwargs):
+    context['s3_call'] = (model.name, time.perf_counter(), _request_body_size(params or {}))
+
+def _finish_s3_call(context, model=None, http_response=None, exception=None, **kwargs):
+    operation, started, bytes_sent = context.pop('s3_call', (None, None, 0))
+    if operation is not None:
+        failed = exception is not None or (http_response is not None and http_response.status_code >= 300)
+        bytes_received = 0
+        if http_response is not None:
+            # Streamed bodies (GetObject) aren't read yet, so count their Content-Length; HEAD responses
+            # advertise the object's length without a body, so count what was actually read for the rest
+            if model is not None and model.has_streaming_output:
+                bytes_received = int(http_response.headers.get('content-length') or 0)
+            else:
+                bytes_received = len(http_response.content or b"")
+        s3_call_stats.record(operation, time.perf_counter() - started, error=failed, bytes_sent=bytes_sent, bytes_received=bytes_received)
+
+@st.cache_resource
+def get_s3_client():
+    """Pooled S3 client shared by all sessions, with keep-alive, timeouts and botocore retries"""
+    client = boto3.session.Session().client(
+        's3',
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+        region_name=os.getenv('AWS_REGION', 'us-east-1'),
+        config=BotoConfig(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            connect_timeout=S3_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=S3_READ_TIMEOUT_SECONDS,
+            tcp_keepalive=True,
+            retries={'mode': S3_RETRY_MODE, 'max_attempts': S3_MAX_ATTEMPTS}
+        )
+    )
+    client.meta.events.register('before-call.s3', _start_s3_call)
+    client.meta.events.register('after-call.s3', _finish_s3_call)
+    client.meta.events.register('after-call-error.s3', _finish_s3_call)
+    return client
+
+s3_client_pool = get_s3_client()
+
+def test_aws_credentials():
+    """Test AWS credentials and S3 connectivity"""
+    try:
         # Test connectivity by listing buckets
-        response = s3_client.list_buckets()
+        response = s3_client_pool.list_buckets()
         return True, "AWS credentials are working correctly"
         
     except NoCredentialsError:
@@ -964,37 +2216,160 @@ def test_aws_credentials():
     except Exception as e:
         return False, f"Unexpected error: {str(e)}"
 
-def list_s3_resumes():
-    """List all PDF files in the S3 bucket with improved error handling"""
+@st.cache_resource
+def get_aws_credentials_check():
+    """Result of test_aws_credentials, computed once per process"""
+    return test_aws_credentials()
+
+# --- Resume catalog ---
+RESUME_CATALOG_TTL_SECONDS = int(os.getenv("RESUME_CATALOG_TTL_SECONDS", "300"))
+RESUME_CATALOG_VERSION = 1
+
+class ResumeCatalog:
+    """Local manifest of a bucket's PDF resumes (key, ETag, LastModified, size), kept in sync by paginated listings"""
+
+    def __init__(self, bucket_name, manifest_path, ttl_seconds):
+        self.bucket_name = bucket_name
+        self.manifest_path = manifest_path
+        self.ttl_seconds = ttl_seconds
+        self.entries = {}
+        self.synced = {}      # prefix -> time of its last full listing
+        self.last_sync = None
+        self._ordered = None  # entries sorted newest first, rebuilt only when the manifest changes
+        self._lock = threading.Lock()
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == RESUME_CATALOG_VERSION and data.get("bucket") == bucket_name:
+                self.entries = data["entries"]
+                self.synced = data["synced"]
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": RESUME_CATALOG_VERSION,
+                "bucket": self.bucket_name,
+                "synced": self.synced,
+                "entries": self.entries
+            }, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_fresh(self, prefix=""):
+        """True if this prefix (or one containing it) was listed within the TTL"""
+        now = time.time()
+        return any(prefix.startswith(synced_prefix) and now - synced_at < self.ttl_seconds
+                   for synced_prefix, synced_at in self.synced.items())
+
+    def sync(self, prefix="", force=False):
+        """List the prefix page by page and fold additions, ETag changes and deletions into the manifest"""
+        with self._lock:
+            if not force and self.is_fresh(prefix):
+                return None
+            started = time.time()
+            listed = {}
+            paginator = s3_client_pool.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    if obj['Key'].lower().endswith('.pdf'):
+                        listed[obj['Key']] = {
+                            "etag": obj['ETag'].strip('"'),
+                            "last_modified": obj['LastModified'].isoformat(),
+                            "size": obj['Size']
+                        }
+
+            previous = {key: entry for key, entry in self.entries.items() if key.startswith(prefix)}
+            added = [key for key in listed if key not in previous]
+            changed = [key for key in listed if key in previous and previous[key] != listed[key]]
+            removed = [key for key in previous if key not in listed]
+            for key in removed:
+                del self.entries[key]
+            self.entries.update(listed)
+            if added or changed or removed:
+                self._ordered = None
+            # A listing of this prefix supersedes earlier listings of narrower prefixes
+            self.synced = {p: t for p, t in self.synced.items() if not p.startswith(prefix)}
+            self.synced[prefix] = time.time()
+            self._save()
+            self.last_sync = {
+                "prefix": prefix,
+                "listed": len(listed),
+                "added": len(added),
+                "changed": len(changed),
+                "removed": len(removed),
+                "seconds": round(time.time() - started, 3)
+            }
+            return self.last_sync
+
+    def add(self, key, etag, last_modified, size):
+        """Record an object this process just wrote, without waiting for the next listing"""
+        with self._lock:
+            self.entries[key] = {"etag": etag, "last_modified": last_modified.isoformat(), "size": size}
+            self._ordered = None
+            self._save()
+
+    def get(self, key):
+        """Manifest entry for a key, or None"""
+        with self._lock:
+            entry = self.entries.get(key)
+            return {"key": key, **entry} if entry else None
+
+    def query(self, prefix="", name_contains="", modified_after=None, modified_before=None):
+        """Entries matching the filters, newest first; dates are inclusive datetime.date bounds"""
+        with self._lock:
+            if self._ordered is None:
+                self._ordered = sorted(
+                    ({"key": key, **entry} for key, entry in self.entries.items()),
+                    key=lambda entry: entry["last_modified"],
+                    reverse=True
+                )
+            ordered = self._ordered
+        needle = name_contains.strip().lower()
+        after = modified_after.isoformat() if modified_after else None
+        before = modified_before.isoformat() if modified_before else None
+        return [
+            entry for entry in ordered
+            if entry["key"].startswith(prefix)
+            and (not needle or needle in os.path.basename(entry["key"]).lower())
+            and (after is None or entry["last_modified"][:10] >= after)
+            and (before is None or entry["last_modified"][:10] <= before)
+        ]
+
+@st.cache_resource
+def get_resume_catalog(bucket_name):
+    """Resume catalog per bucket, shared by all sessions"""
+    return ResumeCatalog(
+        bucket_name,
+        os.path.join(CACHE_DIR, "resume_catalog", f"{bucket_name}.json"),
+        RESUME_CATALOG_TTL_SECONDS
+    )
+
+def list_s3_resumes(prefix="", name_contains="", modified_after=None, modified_before=None, refresh=False):
+    """List PDF files in the S3 bucket (newest first) from the resume catalog, with improved error handling"""
     try:
         bucket_name = os.getenv('S3_BUCKET_NAME', 'resumefolderbucket')
         
-        # Test credentials first
-        is_valid, message = test_aws_credentials()
+        # Credentials are probed once per process; a failed probe is retried on the next listing
+        is_valid, message = get_aws_credentials_check()
         if not is_valid:
+            get_aws_credentials_check.clear()
             st.error(f"AWS Credentials Error: {message}")
             return []
         
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
-        )
-        
-        response = s3_client.list_objects_v2(Bucket=bucket_name)
-        if 'Contents' not in response:
-            st.warning(f"No files found in S3 bucket '{bucket_name}'.")
+        catalog = get_resume_catalog(bucket_name)
+        catalog.sync(prefix, force=refresh)
+        entries = catalog.query(prefix, name_contains, modified_after, modified_before)
+        if not entries:
+            if catalog.query(prefix):
+                st.warning("No resumes match the current filters.")
+            else:
+                st.warning(f"No files found in S3 bucket '{bucket_name}'.")
             return []
             
-        # Filter for PDF files and sort by last modified date (newest first)
-        resumes = [obj['Key'] for obj in sorted(
-            response['Contents'], 
-            key=lambda x: x['LastModified'], 
-            reverse=True
-        ) if obj['Key'].lower().endswith('.pdf')]
-        
-        return resumes
+        return [entry['key'] for entry in entries]
         
     except ClientError as e:
         error_code = e.response['Error']['Code']
@@ -1009,37 +2384,500 @@ def list_s3_resumes():
         st.error(f"Error listing resumes from S3: {str(e)}")
         return []
 
+# --- Feedback storage ---
+# "append" writes every assessment as its own small event object and a background job folds the events
+# into a Parquet snapshot; "xlsx" keeps the original read-modify-write of the shared workbook.
+FEEDBACK_STORAGE_MODE = os.getenv("FEEDBACK_STORAGE_MODE", "append")
+FEEDBACK_XLSX_KEY = "feedback/interview_feedback.xlsx"
+FEEDBACK_EVENTS_PREFIX = "feedback/events/"
+FEEDBACK_SNAPSHOT_KEY = "feedback/snapshot/interview_feedback.parquet"
+FEEDBACK_XLSX_EXPORT = os.getenv("FEEDBACK_XLSX_EXPORT", "1") == "1"
+FEEDBACK_COMPACTION_INTERVAL_SECONDS = int(os.getenv("FEEDBACK_COMPACTION_INTERVAL_SECONDS", "300"))
+FEEDBACK_RATING_COLUMNS = [
+    'technical_rating', 'communication_rating', 'problem_solving_rating', 'culture_fit_rating', 'coding_rating'
+]
+FEEDBACK_COLUMNS = [
+    'candidate_id', 'candidate_name', 'candidate_status', 'timestamp', *FEEDBACK_RATING_COLUMNS,
+    'strengths', 'concerns', 'coding_feedback', 'decision', 'notes'
+]
+
+def flatten_feedback_row(assessment_data):
+    """Flatten an assessment into one feedback row, safely handling None values"""
+    ratings = assessment_data.get('ratings', {})
+    return {
+        'candidate_id': assessment_data.get('candidate_id', ''),
+        'candidate_name': assessment_data.get('candidate_name', ''),
+        'candidate_status': assessment_data.get('candidate_status', ''),
+        'timestamp': assessment_data.get('timestamp', ''),
+        'technical_rating': ratings.get('technical', ''),
+        'communication_rating': ratings.get('communication', ''),
+        'problem_solving_rating': ratings.get('problem_solving', ''),
+        'culture_fit_rating': ratings.get('culture_fit', ''),
+        'coding_rating': ratings.get('coding', ''),
+        'strengths': (assessment_data.get('strengths') or '').replace('\n', ' ').replace('\r', ' '),
+        'concerns': (assessment_data.get('concerns') or '').replace('\n', ' ').replace('\r', ' '),
+        'coding_feedback': (assessment_data.get('coding_feedback') or '').replace('\n', ' ').replace('\r', ' '),
+        'decision': assessment_data.get('decision', ''),
+        'notes': (assessment_data.get('notes') or '').replace('\n', ' ').replace('\r', ' ')
+    }
+
+def normalize_feedback_frame(df):
+    """Give a feedback frame the snapshot schema: known columns, numeric ratings, text elsewhere"""
+    df = df.copy()
+    if 'event_id' not in df.columns:
+        df['event_id'] = [f"legacy-{i:08d}" for i in range(len(df))]
+    for column in FEEDBACK_COLUMNS:
+        if column not in df.columns:
+            df[column] = ''
+    for column in FEEDBACK_RATING_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+    for column in FEEDBACK_COLUMNS + ['event_id']:
+        if column not in FEEDBACK_RATING_COLUMNS:
+            df[column] = df[column].fillna('').astype(str)
+    return df[FEEDBACK_COLUMNS + ['event_id']].reset_index(drop=True)
+
+def append_feedback_event(s3_client, bucket_name, row):
+    """Write one feedback row as its own object under a date-partitioned prefix; returns the key"""
+    now = datetime.now(timezone.utc)
+    # Timestamp first so keys list in write order; the random suffix keeps concurrent saves apart
+    event_id = f"{now:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:12]}"
+    event_key = f"{FEEDBACK_EVENTS_PREFIX}dt={now:%Y-%m-%d}/{event_id}.json"
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=event_key,
+        Body=json.dumps({**row, 'event_id': event_id}, default=str).encode("utf-8"),
+        ContentType="application/json"
+    )
+    return event_key
+
+def list_feedback_events(s3_client, bucket_name):
+    """Keys of feedback events not yet folded into the snapshot, oldest first"""
+    keys = []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=FEEDBACK_EVENTS_PREFIX):
+        keys.extend(obj['Key'] for obj in page.get('Contents', []) if obj['Key'].endswith('.json'))
+    return sorted(keys, key=lambda key: key.rsplit('/', 1)[-1])
+
+def load_feedback_events(s3_client, bucket_name, event_keys):
+    """Download feedback event objects in parallel into a frame (events deleted meanwhile are skipped)"""
+    def fetch(key):
+        try:
+            response = s3_client.get_object(Bucket=bucket_name, Key=key)
+            return json.loads(response['Body'].read())
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                # Compacted and deleted between listing and download; the new snapshot has it
+                return None
+            raise
+
+    if not event_keys:
+        return normalize_feedback_frame(pd.DataFrame(columns=FEEDBACK_COLUMNS + ['event_id']))
+    with ThreadPoolExecutor(max_workers=min(16, len(event_keys))) as executor:
+        events = [event for event in executor.map(fetch, event_keys) if event is not None]
+    return normalize_feedback_frame(pd.DataFrame(events, columns=FEEDBACK_COLUMNS + ['event_id']))
+
+def load_feedback_snapshot(s3_client, bucket_name):
+    """Load the Parquet snapshot and its ETag, seeding from the legacy workbook if there is none yet"""
+    try:
+        response = s3_client.get_object(Bucket=bucket_name, Key=FEEDBACK_SNAPSHOT_KEY)
+        return normalize_feedback_frame(pd.read_parquet(io.BytesIO(response['Body'].read()))), response['ETag']
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchKey':
+            raise
+    try:
+        response = s3_client.get_object(Bucket=bucket_name, Key=FEEDBACK_XLSX_KEY)
+        df = pd.read_excel(io.BytesIO(response['Body'].read()))
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchKey':
+            raise
+        df = pd.DataFrame(columns=FEEDBACK_COLUMNS)
+    return normalize_feedback_frame(df), None
+
+def merge_feedback_frames(snapshot_df, events_df):
+    """Snapshot rows followed by newer events, without rows that are in both"""
+    merged = pd.concat([snapshot_df, events_df], ignore_index=True)
+    return merged.drop_duplicates(subset='event_id', keep='first').reset_index(drop=True)
+
+def load_feedback_dataframe(s3_client=None, bucket_name=None):
+    """All feedback rows in save order, from whichever storage mode is active"""
+    s3_client = s3_client or s3_client_pool
+    bucket_name = bucket_name or os.getenv('S3_BUCKET_FEEDBACK')
+    if FEEDBACK_STORAGE_MODE == "xlsx":
+        response = s3_client.get_object(Bucket=bucket_name, Key=FEEDBACK_XLSX_KEY)
+        return pd.read_excel(io.BytesIO(response['Body'].read()))
+    # List before reading the snapshot so events compacted in between are found in the snapshot
+    event_keys = list_feedback_events(s3_client, bucket_name)
+    snapshot_df, _ = load_feedback_snapshot(s3_client, bucket_name)
+    return merge_feedback_frames(snapshot_df, load_feedback_events(s3_client, bucket_name, event_keys))
+
+def compact_feedback_events(s3_client=None, bucket_name=None, export_xlsx=None):
+    """Fold pending feedback events into the Parquet snapshot, optionally refresh the xlsx export, then delete the events"""
+    s3_client = s3_client or s3_client_pool
+    bucket_name = bucket_name or os.getenv('S3_BUCKET_FEEDBACK')
+    if not bucket_name:
+        raise ValueError("S3_BUCKET_FEEDBACK environment variable is not set.")
+    export_xlsx = FEEDBACK_XLSX_EXPORT if export_xlsx is None else export_xlsx
+
+    event_keys = list_feedback_events(s3_client, bucket_name)
+    if not event_keys:
+        return {"events": 0, "rows": None, "conflict": False}
+    snapshot_df, snapshot_etag = load_feedback_snapshot(s3_client, bucket_name)
+    merged = merge_feedback_frames(snapshot_df, load_feedback_events(s3_client, bucket_name, event_keys))
+
+    parquet_buffer = io.BytesIO()
+    merged.to_parquet(parquet_buffer, index=False)
+    # Only replace the snapshot we read; if another compactor got there first, leave the events for the next run
+    condition = {'IfMatch': snapshot_etag} if snapshot_etag else {'IfNoneMatch': '*'}
+    try:
+        response = s3_client.put_object(Bucket=bucket_name, Key=FEEDBACK_SNAPSHOT_KEY, Body=parquet_buffer.getvalue(), **condition)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('PreconditionFailed', 'ConditionalRequestConflict'):
+            return {"events": 0, "rows": None, "conflict": True}
+        raise
+    # Readers pick up the new snapshot's status index without parsing the Parquet file
+    save_status_index_sidecar(s3_client, bucket_name, FEEDBACK_SNAPSHOT_KEY, response['ETag'], build_status_entries(merged))
+
+    if export_xlsx:
+        excel_buffer = io.BytesIO()
+        merged[FEEDBACK_COLUMNS].to_excel(excel_buffer, index=False, engine='openpyxl')
+        s3_client.put_object(Bucket=bucket_name, Key=FEEDBACK_XLSX_KEY, Body=excel_buffer.getvalue())
+
+    for start in range(0, len(event_keys), 1000):
+        s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={'Objects': [{'Key': key} for key in event_keys[start:start + 1000]], 'Quiet': True}
+        )
+    return {"events": len(event_keys), "rows": len(merged), "conflict": False}
+
+class FeedbackCompactor:
+    """Background thread that periodically compacts feedback events"""
+
+    def __init__(self, interval_seconds):
+        self.interval_seconds = interval_seconds
+        self.last_result = None
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="feedback-compactor", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval_seconds)
+            try:
+                self.last_result = compact_feedback_events()
+                self.last_error = None
+                if self.last_result["events"]:
+                    print(f"Compacted {self.last_result['events']} feedback events into {self.last_result['rows']} rows")
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Feedback compaction failed: {str(e)}")
+
+@st.cache_resource
+def get_feedback_compactor():
+    """One compaction thread per server process"""
+    return FeedbackCompactor(FEEDBACK_COMPACTION_INTERVAL_SECONDS)
+
+# --- Candidate status index ---
+# Normalized candidate name -> latest status, built once per version of the feedback source and shared as a
+# small sidecar object, so opening a resume doesn't download and scan every feedback row.
+STATUS_INDEX_KEY = "feedback/index/candidate_status.json"
+STATUS_INDEX_VERSION = 1
+STATUS_INDEX_REFRESH_SECONDS = float(os.getenv("STATUS_INDEX_REFRESH_SECONDS", "30"))
+
+def normalize_candidate_name(name):
+    """Key used to match candidates across feedback rows"""
+    return str(name).strip().lower()
+
+def build_status_entries(df):
+    """Latest status and timestamp per normalized name; later rows win, as in the feedback file"""
+    entries = {}
+    if df.empty or 'candidate_name' not in df.columns:
+        return entries
+    statuses = df['candidate_status'] if 'candidate_status' in df.columns else [None] * len(df)
+    timestamps = df['timestamp'] if 'timestamp' in df.columns else [None] * len(df)
+    for name, status, timestamp in zip(df['candidate_name'], statuses, timestamps):
+        if pd.isna(name) or not str(name).strip():
+            continue
+        entries[normalize_candidate_name(name)] = {
+            "status": 'Unknown' if pd.isna(status) else str(status),
+            "timestamp": '' if pd.isna(timestamp) else str(timestamp)
+        }
+    return entries
+
+def save_status_index_sidecar(s3_client, bucket_name, source_key, source_etag, entries):
+    """Persist the index built from one version of the feedback source"""
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=STATUS_INDEX_KEY,
+        Body=json.dumps({
+            "version": STATUS_INDEX_VERSION,
+            "source_key": source_key,
+            "source_etag": source_etag,
+            "entries": entries
+        }).encode("utf-8"),
+        ContentType="application/json"
+    )
+
+def head_feedback_source(s3_client, bucket_name):
+    """(key, ETag) of the object holding compacted feedback, or None if there is no feedback yet"""
+    # Append mode reads the snapshot; before the first compaction the legacy workbook stands in for it
+    source_keys = [FEEDBACK_XLSX_KEY] if FEEDBACK_STORAGE_MODE == "xlsx" else [FEEDBACK_SNAPSHOT_KEY, FEEDBACK_XLSX_KEY]
+    for source_key in source_keys:
+        try:
+            return source_key, s3_client.head_object(Bucket=bucket_name, Key=source_key)['ETag']
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('404', 'NoSuchKey', 'NotFound'):
+                raise
+    return None
+
+class CandidateStatusIndex:
+    """In-memory status index, revalidated against the feedback source's ETag at most every refresh_seconds"""
+
+    def __init__(self, refresh_seconds):
+        self.refresh_seconds = refresh_seconds
+        self.entries = {}
+        self.source = None          # (key, ETag) the base entries were built from
+        self.applied_events = set() # pending event keys already folded into the entries
+        self.last_refresh = 0.0
+        self.lookups = 0
+        self.rebuilds = 0
+        self.sidecar_loads = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, candidate_name, s3_client, bucket_name):
+        """Return (entry or None, whether any feedback records exist)"""
+        with self._lock:
+            if time.time() - self.last_refresh >= self.refresh_seconds:
+                self._refresh(s3_client, bucket_name)
+            self.lookups += 1
+            return self.entries.get(normalize_candidate_name(candidate_name)), self.source is not None or bool(self.entries)
+
+    def note_saved(self, row, event_key=None):
+        """Apply a feedback row this process just saved, so it is visible before the next refresh"""
+        with self._lock:
+            self.entries.update(build_status_entries(pd.DataFrame([row])))
+            if event_key:
+                self.applied_events.add(event_key)
+
+    def invalidate(self):
+        with self._lock:
+            self.last_refresh = 0.0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "candidates": len(self.entries),
+                "lookups": self.lookups,
+                "rebuilds": self.rebuilds,
+                "sidecar_loads": self.sidecar_loads,
+                "source_etag": self.source[1] if self.source else None
+            }
+
+    def _load_base(self, s3_client, bucket_name, source):
+        if source is None:
+            return {}
+        source_key, source_etag = source
+        try:
+            sidecar = json.loads(s3_client.get_object(Bucket=bucket_name, Key=STATUS_INDEX_KEY)['Body'].read())
+            if (sidecar.get("version"), sidecar.get("source_key"), sidecar.get("source_etag")) == (STATUS_INDEX_VERSION, source_key, source_etag):
+                self.sidecar_loads += 1
+                return sidecar["entries"]
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'NoSuchKey':
+                raise
+
+        # Sidecar missing or stale: rebuild from the source, reading only the columns the index needs
+        columns = ['candidate_name', 'candidate_status', 'timestamp']
+        body = io.BytesIO(s3_client.get_object(Bucket=bucket_name, Key=source_key, IfMatch=source_etag)['Body'].read())
+        if source_key.endswith('.parquet'):
+            df = pd.read_parquet(body, columns=columns)
+        else:
+            df = pd.read_excel(body, usecols=lambda column: column in columns)
+        entries = build_status_entries(df)
+        self.rebuilds += 1
+        save_status_index_sidecar(s3_client, bucket_name, source_key, source_etag, entries)
+        return entries
+
+    def _refresh(self, s3_client, bucket_name):
+        # List events before checking the source so events compacted in between are covered by the new source
+        event_keys = list_feedback_events(s3_client, bucket_name) if FEEDBACK_STORAGE_MODE != "xlsx" else []
+        source = head_feedback_source(s3_client, bucket_name)
+        if source != self.source:
+            self.entries = self._load_base(s3_client, bucket_name, source)
+            self.source = source
+            self.applied_events = set()
+
+        new_event_keys = [key for key in event_keys if key not in self.applied_events]
+        if new_event_keys:
+            # Events are in save order, so applying them on top keeps the latest status per candidate
+            self.entries.update(build_status_entries(load_feedback_events(s3_client, bucket_name, new_event_keys)))
+            self.applied_events.update(new_event_keys)
+        self.last_refresh = time.time()
+
+@st.cache_resource
+def get_candidate_status_index():
+    """Status index shared by all sessions"""
+    return CandidateStatusIndex(STATUS_INDEX_REFRESH_SECONDS)
+
+candidate_status_index = get_candidate_status_index()
+
+# --- Feedback analytics ---
+# The dashboard reads a local Parquet copy of the feedback source, materialized once per source ETag, and only
+# the columns below; aggregates are vectorized and recomputed only when new feedback arrives.
+FEEDBACK_ANALYTICS_COLUMNS = ['candidate_name', 'candidate_status', 'decision', 'timestamp', *FEEDBACK_RATING_COLUMNS]
+FEEDBACK_ANALYTICS_REFRESH_SECONDS = float(os.getenv("FEEDBACK_ANALYTICS_REFRESH_SECONDS", "60"))
+FEEDBACK_PASS_SCORE = float(os.getenv("FEEDBACK_PASS_SCORE", "4"))
+INTERVIEW_ROUNDS = ["L1", "L2", "L3"]
+# Older assessments stored the decision as a label rather than a 1-5 score
+DECISION_SCORES = {"strong hire": 5, "hire": 4, "maybe": 3, "no hire": 2, "strong no hire": 1}
+
+def _map_distinct(series, transform):
+    """Apply a transform to each distinct value once and broadcast it back to the rows"""
+    categorical = series.fillna('').astype(str).astype('category')
+    return pd.Series(np.asarray(transform(categorical.cat.categories))[categorical.cat.codes], index=series.index)
+
+def prepare_feedback_analytics(df):
+    """Add candidate key, interview round and numeric decision columns to a column-pruned feedback frame"""
+    df = df.copy()
+    df['candidate_key'] = _map_distinct(df['candidate_name'], lambda names: names.str.strip().str.lower()).astype('category')
+    df['round'] = _map_distinct(df['candidate_status'], lambda statuses: statuses.str.extract(r'(L[123])', expand=False)).astype('category')
+    labels = _map_distinct(df['decision'], lambda decisions: decisions.str.strip().str.lower().map(DECISION_SCORES))
+    df['decision_score'] = pd.to_numeric(df['decision'], errors='coerce').fillna(pd.to_numeric(labels, errors='coerce'))
+    for column in FEEDBACK_RATING_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+    return df
+
+def feedback_funnel(df):
+    """Distinct candidates interviewed and passed in each round"""
+    scored = df[df['round'].notna()]
+    passed = scored[scored['decision_score'] >= FEEDBACK_PASS_SCORE]
+    return pd.DataFrame({
+        'interviewed': scored.groupby('round', observed=True)['candidate_key'].nunique(),
+        'passed': passed.groupby('round', observed=True)['candidate_key'].nunique()
+    }).reindex(INTERVIEW_ROUNDS).fillna(0).astype(int)
+
+def feedback_round_pass_rates(df):
+    """Assessments, pass rate and mean decision score per round"""
+    scored = df[df['round'].notna() & df['decision_score'].notna()]
+    by_round = scored.groupby('round', observed=True)['decision_score']
+    return pd.DataFrame({
+        'assessments': by_round.size(),
+        'pass_rate': (scored['decision_score'] >= FEEDBACK_PASS_SCORE).groupby(scored['round'], observed=True).mean(),
+        'avg_decision': by_round.mean()
+    }).reindex(INTERVIEW_ROUNDS)
+
+def feedback_rating_distributions(df):
+    """Number of assessments giving each 1-5 score, per rating dimension"""
+    ratings = df[FEEDBACK_RATING_COLUMNS].round()
+    distributions = pd.DataFrame({
+        column.replace('_rating', ''): ratings[column].value_counts() for column in FEEDBACK_RATING_COLUMNS
+    })
+    return distributions.reindex([1, 2, 3, 4, 5]).fillna(0).astype(int)
+
+def feedback_latest_status_counts(df):
+    """Candidates per latest recorded status"""
+    latest = df.drop_duplicates(subset='candidate_key', keep='last')
+    return latest['candidate_status'].value_counts()
+
+class FeedbackAnalyticsStore:
+    """Column-pruned feedback history for the dashboard, materialized as local Parquet per source ETag"""
+
+    def __init__(self, directory, refresh_seconds):
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self.source = None
+        self.base = None            # prepared frame for the current source
+        self.applied_events = []
+        self.last_refresh = 0.0
+        self._summary = None
+        self._lock = threading.Lock()
+
+    def _materialize(self, s3_client, bucket_name, source):
+        source_key, source_etag = source
+        path = os.path.join(self.directory, hashlib.sha256(f"{bucket_name}/{source_key}@{source_etag}".encode("utf-8")).hexdigest() + ".parquet")
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            body = s3_client.get_object(Bucket=bucket_name, Key=source_key, IfMatch=source_etag)['Body']
+            if source_key.endswith('.parquet'):
+                with open(tmp_path, "wb") as f:
+                    shutil.copyfileobj(body, f, 1024 * 1024)
+            else:
+                # Parse the workbook once per version; later loads read the Parquet copy
+                df = pd.read_excel(io.BytesIO(body.read()), usecols=lambda column: column in FEEDBACK_ANALYTICS_COLUMNS)
+                normalize_feedback_frame(df)[FEEDBACK_ANALYTICS_COLUMNS].to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            # Older versions of the source are no longer needed
+            for filename in os.listdir(self.directory):
+                if filename.endswith(".parquet") and os.path.join(self.directory, filename) != path:
+                    try:
+                        os.remove(os.path.join(self.directory, filename))
+                    except OSError:
+                        pass
+        return pd.read_parquet(path, columns=FEEDBACK_ANALYTICS_COLUMNS)
+
+    def _refresh(self, s3_client, bucket_name):
+        event_keys = list_feedback_events(s3_client, bucket_name) if FEEDBACK_STORAGE_MODE != "xlsx" else []
+        source = head_feedback_source(s3_client, bucket_name)
+        if source != self.source:
+            base = self._materialize(s3_client, bucket_name, source) if source else pd.DataFrame(columns=FEEDBACK_ANALYTICS_COLUMNS)
+            self.base = prepare_feedback_analytics(base)
+            self.source = source
+            self.applied_events = []
+            self._summary = None
+        if event_keys != self.applied_events:
+            self.applied_events = event_keys
+            self._summary = None
+        self.last_refresh = time.time()
+
+    def summary(self, s3_client, bucket_name):
+        """Dashboard aggregates over all feedback, recomputed only when the source or pending events change"""
+        with self._lock:
+            if time.time() - self.last_refresh >= self.refresh_seconds:
+                self._refresh(s3_client, bucket_name)
+            if self._summary is None:
+                df = self.base
+                if self.applied_events:
+                    events = load_feedback_events(s3_client, bucket_name, self.applied_events)
+                    df = pd.concat([df, prepare_feedback_analytics(events[FEEDBACK_ANALYTICS_COLUMNS])], ignore_index=True)
+                self._summary = {
+                    "assessments": len(df),
+                    "candidates": int(df['candidate_key'].nunique()),
+                    "funnel": feedback_funnel(df),
+                    "pass_rates": feedback_round_pass_rates(df),
+                    "ratings": feedback_rating_distributions(df),
+                    "latest_status": feedback_latest_status_counts(df)
+                }
+            return self._summary
+
+    def invalidate(self):
+        with self._lock:
+            self.last_refresh = 0.0
+
+@st.cache_resource
+def get_feedback_analytics_store():
+    """Feedback analytics store shared by all sessions"""
+    return FeedbackAnalyticsStore(os.path.join(CACHE_DIR, "feedback_analytics"), FEEDBACK_ANALYTICS_REFRESH_SECONDS)
+
+feedback_analytics_store = get_feedback_analytics_store()
+
 def save_feedback_to_s3(assessment_data):
     import botocore
     try:
-        s3 = boto3.client('s3',
-                         aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                         aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                         region_name=os.getenv('AWS_DEFAULT_REGION'))
+        s3 = s3_client_pool
         
         bucket_name = os.getenv('S3_BUCKET_FEEDBACK')
         if not bucket_name:
             return False, "S3_BUCKET_FEEDBACK environment variable is not set."
-        feedback_key = "feedback/interview_feedback.xlsx"
+        feedback_key = FEEDBACK_XLSX_KEY
         
-        # Flatten the ratings dictionary for Excel and safely handle None values
-        ratings = assessment_data.get('ratings', {})
-        new_row = {
-            'candidate_id': assessment_data.get('candidate_id', ''),
-            'candidate_name': assessment_data.get('candidate_name', ''),
-            'candidate_status': assessment_data.get('candidate_status', ''),
-            'timestamp': assessment_data.get('timestamp', ''),
-            'technical_rating': ratings.get('technical', ''),
-            'communication_rating': ratings.get('communication', ''),
-            'problem_solving_rating': ratings.get('problem_solving', ''),
-            'culture_fit_rating': ratings.get('culture_fit', ''),
-            'coding_rating': ratings.get('coding', ''),
-            'strengths': (assessment_data.get('strengths') or '').replace('\n', ' ').replace('\r', ' '),
-            'concerns': (assessment_data.get('concerns') or '').replace('\n', ' ').replace('\r', ' '),
-            'coding_feedback': (assessment_data.get('coding_feedback') or '').replace('\n', ' ').replace('\r', ' '),
-            'decision': assessment_data.get('decision', ''),
-            'notes': (assessment_data.get('notes') or '').replace('\n', ' ').replace('\r', ' ')
-        }
+        new_row = flatten_feedback_row(assessment_data)
+
+        if FEEDBACK_STORAGE_MODE != "xlsx":
+            # One small PUT regardless of history size; concurrent saves can't overwrite each other
+            event_key = append_feedback_event(s3, bucket_name, new_row)
+            candidate_status_index.note_saved(new_row, event_key)
+            feedback_analytics_store.invalidate()
+            return True, "Feedback saved successfully to the S3 feedback log"
         
         from io import BytesIO
         
@@ -1070,362 +2908,1392 @@ def save_feedback_to_s3(assessment_data):
             Key=feedback_key,
             Body=excel_bytes
         )
+        candidate_status_index.note_saved(new_row)
+        feedback_analytics_store.invalidate()
         return True, "Feedback saved successfully to the shared Excel file in S3"
     except Exception as e:
         return False, f"Error saving to S3: {str(e)}"
 
-def download_resume_from_s3(key):
-    """Download a file from S3 and return a file-like object"""
-    try:
-        bucket_name = os.getenv('S3_BUCKET_NAME', 'resumefolderbucket')
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
+# --- Resume disk cache ---
+RESUME_DISK_CACHE_MAX_MB = float(os.getenv("RESUME_DISK_CACHE_MAX_MB", "500"))
+
+class CachedResumeFile(mmap.mmap):
+    """Read-only memory map of a cached resume; accepted by PdfReader like an uploaded file"""
+
+class ResumeDiskCache:
+    """On-disk copies of S3 resumes keyed by bucket, key and ETag, evicted least recently used first by total bytes"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # Recency survives restarts through file mtimes, which hits refresh
+        files = []
+        for filename in os.listdir(directory):
+            if filename.endswith(".pdf"):
+                stat = os.stat(os.path.join(directory, filename))
+                files.append((stat.st_mtime, filename, stat.st_size))
+        self._files = OrderedDict((filename, size) for _, filename, size in sorted(files))
+        self.total_bytes = sum(self._files.values())
+
+    @staticmethod
+    def _filename(bucket_name, key, etag):
+        return hashlib.sha256(f"{bucket_name}/{key}@{etag}".encode("utf-8")).hexdigest() + ".pdf"
+
+    def _open(self, filename):
+        path = os.path.join(self.directory, filename)
+        if self._files[filename] == 0:
+            return io.BytesIO()  # empty files can't be memory-mapped
+        with open(path, "rb") as f:
+            return CachedResumeFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def open(self, bucket_name, key, etag):
+        """Memory-map the cached copy of this object version, or return None on a miss"""
+        filename = self._filename(bucket_name, key, etag)
+        with self._lock:
+            if filename not in self._files:
+                return None
+            try:
+                cached = self._open(filename)
+                os.utime(os.path.join(self.directory, filename))
+            except OSError:
+                self.total_bytes -= self._files.pop(filename)
+                return None
+            self._files.move_to_end(filename)
+            self.hits += 1
+            self.bytes_saved += self._files[filename]
+            return cached
+
+    def put(self, bucket_name, key, etag, body):
+        """Stream an S3 body into the cache and return the memory-mapped copy"""
+        filename = self._filename(bucket_name, key, etag)
+        path = os.path.join(self.directory, filename)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            shutil.copyfileobj(body, f, 1024 * 1024)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.misses += 1
+            self.bytes_downloaded += size
+            self.total_bytes += size - self._files.get(filename, 0)
+            self._files[filename] = size
+            self._files.move_to_end(filename)
+            cached = self._open(filename)
+            self._evict()
+            return cached
+
+    def _evict(self):
+        # Never evict the newest file, even if it alone exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._files) > 1:
+            filename, size = self._files.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "bytes_downloaded": self.bytes_downloaded,
+                "evictions": self.evictions,
+                "entries": len(self._files),
+                "bytes": self.total_bytes
+            }
+
+@st.cache_resource
+def get_resume_disk_cache():
+    """Resume disk cache shared by all sessions"""
+    return ResumeDiskCache(os.path.join(CACHE_DIR, "resumes"), int(RESUME_DISK_CACHE_MAX_MB * 1024 * 1024))
+
+resume_disk_cache = get_resume_disk_cache()
+
+def open_resume_from_s3(key, etag=None):
+    """Open a resume from the S3_BUCKET_NAME bucket as a memory map, downloading only if this ETag isn't cached (raises on S3 errors)"""
+    bucket_name = os.getenv('S3_BUCKET_NAME', 'resumefolderbucket')
+    if etag:
+        cached = resume_disk_cache.open(bucket_name, key, etag)
+        if cached is not None:
+            return cached
+    response = s3_client_pool.get_object(Bucket=bucket_name, Key=key)
+    return resume_disk_cache.put(bucket_name, key, response['ETag'].strip('"'), response['Body'])
+
+# --- Uploaded resume persistence ---
+RESUME_UPLOAD_PERSIST = os.getenv("RESUME_UPLOAD_PERSIST", "1") == "1"
+RESUME_UPLOAD_PREFIX = os.getenv("RESUME_UPLOAD_PREFIX", "uploads/")
+RESUME_MULTIPART_THRESHOLD_MB = float(os.getenv("RESUME_MULTIPART_THRESHOLD_MB", "8"))
+RESUME_MULTIPART_CHUNK_MB = float(os.getenv("RESUME_MULTIPART_CHUNK_MB", "8"))
+
+class BytesView(io.RawIOBase):
+    """Seekable read-only stream over a bytes-like object (BytesIO buffer, mmap) that doesn't copy it.
+
+    Closing the view leaves the underlying file open.
+    """
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+def _file_buffer(file):
+    """The bytes behind an uploaded/downloaded resume without copying them where possible"""
+    if hasattr(file, "getbuffer"):
+        return file.getbuffer()
+    if isinstance(file, mmap.mmap):
+        return file
+    file.seek(0)
+    return file.read()
+
+def store_uploaded_resume(uploaded_file, resume_hash):
+    """Persist an uploaded PDF to the S3_BUCKET_NAME bucket under <prefix><sha256>/<filename>, skipping content already stored.
+
+    Large files go up as a multipart upload. The stored object is added to the
+    resume catalog and disk cache, so it is listed and opened like any other
+    S3 resume. Returns {"key", "etag", "deduplicated"}; raises on S3 errors.
+    """
+    bucket_name = os.getenv('S3_BUCKET_NAME', 'resumefolderbucket')
+    content_prefix = f"{RESUME_UPLOAD_PREFIX}{resume_hash}/"
+    # Same bytes under any filename count as already stored
+    existing = s3_client_pool.list_objects_v2(Bucket=bucket_name, Prefix=content_prefix, MaxKeys=1).get('Contents', [])
+    if existing:
+        return {"key": existing[0]['Key'], "etag": existing[0]['ETag'].strip('"'), "deduplicated": True}
+
+    key = content_prefix + (os.path.basename(getattr(uploaded_file, "name", "") or "") or "resume.pdf")
+    # Own views of the same bytes, so the upload doesn't move the read position under the
+    # extraction stage (and s3transfer may close what it was given)
+    data = _file_buffer(uploaded_file)
+    s3_client_pool.upload_fileobj(
+        BytesView(data),
+        bucket_name,
+        key,
+        ExtraArgs={'ContentType': 'application/pdf'},
+        Config=TransferConfig(
+            multipart_threshold=int(RESUME_MULTIPART_THRESHOLD_MB * 1024 * 1024),
+            multipart_chunksize=int(RESUME_MULTIPART_CHUNK_MB * 1024 * 1024)
         )
-        
-        response = s3_client.get_object(Bucket=bucket_name, Key=key)
-        return io.BytesIO(response['Body'].read())
-    except Exception as e:
-        st.error(f"Error downloading {key} from S3: {str(e)}")
-        return None
+    )
+    head = s3_client_pool.head_object(Bucket=bucket_name, Key=key)
+    etag = head['ETag'].strip('"')
+    get_resume_catalog(bucket_name).add(key, etag, head['LastModified'], head['ContentLength'])
+    resume_disk_cache.put(bucket_name, key, etag, BytesView(data)).close()
+    print(f"Stored uploaded resume as s3://{bucket_name}/{key}")
+    return {"key": key, "etag": etag, "deduplicated": False}
 
-# --- Streamlined Streamlit UI ---
-st.set_page_config(
-    page_title="🎯 Interviewer Quick Prep",
-    page_icon="👥",
-    layout="wide"
-)
+RESUME_PIPELINE_CACHE_SIZE = int(os.getenv("RESUME_PIPELINE_CACHE_SIZE", "128"))
 
-# Initialize session state
-initialize_session_state()
-
-# Custom CSS for clean interviewer design
-st.markdown("""
-<style>
-    .interviewer-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        text-align: center;
-        background: linear-gradient(90deg, #2E8B57 0%, #228B22 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 1rem;
-    }
-    .candidate-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-    }
-    .prep-section {
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        padding: 1rem;
-        margin: 1rem 0;
-        border-left: 4px solid #28a745;
-    }
-    .language-selector {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .error-box {
-        background-color: #f8d7da;
-        border: 1px solid #f5c6cb;
-        color: #721c24;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
+class ResumePipelineCache:
+    """In-process LRU store of processed resumes keyed by the SHA-256 of the PDF bytes"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, resume_hash):
+        with self._lock:
+            result = self._results.get(resume_hash)
+            if result is not None:
+                self._results.move_to_end(resume_hash)
+            return result
+
+    def put(self, resume_hash, result):
+        with self._lock:
+            self._results[resume_hash] = result
+            self._results.move_to_end(resume_hash)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def invalidate(self, resume_hash):
+        with self._lock:
+            self._results.pop(resume_hash, None)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+@st.cache_resource
+def get_resume_pipeline_cache():
+    """Resume pipeline cache shared by all reruns and sessions of this server process"""
+    return ResumePipelineCache(RESUME_PIPELINE_CACHE_SIZE)
+
+@st.cache_resource
+def get_stored_upload_cache():
+    """store_uploaded_resume results by PDF hash, so reruns don't ask S3 about the same upload again"""
+    return ResumePipelineCache(RESUME_PIPELINE_CACHE_SIZE)
+
+def compute_resume_hash(file):
+    """SHA-256 of an uploaded/downloaded resume's bytes"""
+    if isinstance(file, mmap.mmap):
+        return hashlib.sha256(file).hexdigest()
+    pdf_bytes = file.getvalue() if hasattr(file, "getvalue") else file.read()
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+def determine_interview_round(candidate_status):
+    """Map a feedback status to the interview round and the next-round hint shown to the interviewer"""
+    if candidate_status.startswith("L1"):
+        interview_round = "L1"
+    elif candidate_status.startswith("L2"):
+        interview_round = "L2"
+    elif candidate_status.startswith("L3"):
+        interview_round = "L3"
+    else:
+        interview_round = "L1"  # Default fallback
+
+    if interview_round == "L1":
+        next_round_message = "You have to take the L2 round for this candidate."
+    elif interview_round == "L2":
+        next_round_message = "You have to take the L3 round for this candidate."
+    elif interview_round == "L3":
+        next_round_message = "All rounds completed. You can proceed to feedback or offer."
+    else:
+        next_round_message = "Candidate status not recognized. Please go with the L1 round for this candidate."
+    return interview_round, next_round_message
+
+def parse_resume_stage(resume_hash, resume_text, use_sidecar=True, extraction=None):
+    """Compact and parse extracted resume text (the part of the pipeline that is safe to run ahead of time).
+
+    A parse sidecar for this PDF and parser version is used instead of the LLM
+    when one exists; fresh successful parses are written back as sidecars.
+    `extraction` is the extract_pdf_text result the text came from, if known.
+    """
+    if use_sidecar:
+        sidecar = load_resume_sidecar(resume_hash, "parse")
+        if sidecar is not None:
+            return parsed_result_from_sidecar(resume_hash, resume_text, sidecar, extraction)
+    result = {
+        "resume_hash": resume_hash,
+        "stage": "parsed",
+        "resume_text": resume_text,
+        "extraction": extraction_summary(extraction),
+        "parsed_details": None,
+        "candidate_status": None,
+        "status_message": None,
+        "interview_round": None,
+        "next_round_message": None,
+        "questions": [],
+        "coding_problems": [],
+        "compaction": None,
+        "parse_mode": None
     }
-    .success-box {
-        background-color: #d4edda;
-        border: 1px solid #c3e6cb;
-        color: #155724;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
+    if not resume_text or resume_text.startswith("Error"):
+        return result
+
+    compacted_text, compaction = compact_resume_text(resume_text, repeated_lines=(extraction or {}).get("repeated_lines"))
+    result["compaction"] = compaction
+    print(f"Resume {resume_hash[:12]} compacted: {compaction['tokens_before']} -> {compaction['tokens_after']} tokens")
+    parsed_details, result["parse_mode"] = parse_resume(compacted_text)
+    result["parsed_details"] = parsed_details
+    # Local-only parses (GPT unavailable) are not persisted so a later run can still use the LLM
+    if pipeline_result_succeeded(result) and result["parse_mode"] != "local":
+        save_resume_sidecar(resume_hash, "parse", {
+            "resume_hash": resume_hash,
+            "parsed_details": parsed_details,
+            "parse_mode": result["parse_mode"],
+            "compaction": compaction
+        })
+    return result
+
+def parsed_result_from_sidecar(resume_hash, resume_text, sidecar, extraction=None):
+    """Parsed-stage pipeline result rebuilt from a parse sidecar"""
+    return {
+        "resume_hash": resume_hash,
+        "stage": "parsed",
+        "resume_text": resume_text,
+        "extraction": extraction_summary(extraction),
+        "parsed_details": sidecar["parsed_details"],
+        "candidate_status": None,
+        "status_message": None,
+        "interview_round": None,
+        "next_round_message": None,
+        "questions": [],
+        "coding_problems": [],
+        "compaction": sidecar["compaction"],
+        "parse_mode": sidecar["parse_mode"]
     }
-    .status-info {
-        background-color: #e3f2fd;
-        border: 1px solid #90caf9;
-        color: #0d47a1;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        font-weight: bold;
+
+def lookup_candidate_round(candidate_name):
+    """Feedback status, interview round and next-round hint for a candidate"""
+    candidate_status, status_message = check_candidate_status_in_s3_csv(candidate_name)
+    interview_round, next_round_message = determine_interview_round(candidate_status)
+    return {
+        "candidate_status": candidate_status,
+        "status_message": status_message,
+        "interview_round": interview_round,
+        "next_round_message": next_round_message
     }
-</style>
-""", unsafe_allow_html=True)
-
-# Main header
-st.markdown('<h1 class="interviewer-header"> Interview Edge</h1>', unsafe_allow_html=True)
-
-st.markdown("#### <span style='color:#4F8BF9;font-weight:bold;'>How would you like to provide the resume?</span>", unsafe_allow_html=True)
-col1, col2 = st.columns(2)
-with col1:
-    if st.button("upload from local files", use_container_width=True):
-        st.session_state.resume_input_method = "upload"
-with col2:
-    if st.button("☁️ Select from NexTurn datastore", use_container_width=True):
-        st.session_state.resume_input_method = "s3"
-
-# Set a default if not set
-if "resume_input_method" not in st.session_state:
-    st.session_state.resume_input_method = None
-
-selection_method = st.session_state.resume_input_method
-
-uploaded_file = None
-
-if selection_method == "upload":
-    # File upload option
-    uploaded_file = st.file_uploader(
-        "Upload candidate resume (PDF)",
-        type=['pdf'],
-        help="Upload a PDF resume to generate interview questions"
+
+def complete_resume_pipeline(parsed_result):
+    """Add the candidate's feedback status and generated questions/coding problems to a parsed result"""
+    result = dict(parsed_result, stage="complete")
+    if not pipeline_result_succeeded(result):
+        return result
+
+    # Check candidate status in S3 CSV file
+    parsed_details = result["parsed_details"]
+    candidate_name = parsed_details.get('Full Name', '')
+    if candidate_name:
+        result.update(lookup_candidate_round(candidate_name))
+        experience = parsed_details.get('Years of Experience', 0)
+        skills = parsed_details.get('Skills', [])
+        result["questions"], result["coding_problems"] = generate_questions_and_coding(result["interview_round"], experience, skills)
+    return result
+
+def run_resume_pipeline_on_text(resume_hash, resume_text, extraction=None, use_sidecar=True):
+    """Parse extracted resume text, look up the candidate's status and generate questions/coding"""
+    return complete_resume_pipeline(parse_resume_stage(resume_hash, resume_text, use_sidecar=use_sidecar, extraction=extraction))
+
+def pipeline_result_succeeded(result):
+    """True when a pipeline result has usable parsed details (only these are cached/persisted)"""
+    parsed_details = result.get("parsed_details")
+    return isinstance(parsed_details, dict) and "error" not in parsed_details
+
+PREP_PACK_VERSION = 1
+PREP_PACK_DIR = os.getenv("PREP_PACK_DIR", "prep_packs")
+
+def prep_pack_path(resume_hash, pack_dir=None):
+    """Location of the prep pack for a PDF hash; the schema version is part of the path"""
+    return os.path.join(pack_dir or PREP_PACK_DIR, f"v{PREP_PACK_VERSION}", f"{resume_hash}.json")
+
+def save_prep_pack(result, source=None, brief=None, pack_dir=None):
+    """Write a pipeline result as a versioned prep-pack JSON artifact and return its path"""
+    pack = dict(result)
+    pack.update({
+        "version": PREP_PACK_VERSION,
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "source": source or {},
+        "brief": brief
+    })
+    path = prep_pack_path(result["resume_hash"], pack_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pack, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+def load_prep_pack(resume_hash, pack_dir=None):
+    """Load the prep pack for a PDF hash, or None when it is missing, unreadable or from another version.
+
+    The candidate's feedback status is looked up again because it may have
+    changed since the pack was generated. If their interview round has moved
+    on, only the parse and brief are kept: the pack comes back at the "parsed"
+    stage so open_resume generates questions for the current round.
+    """
+    try:
+        with open(prep_pack_path(resume_hash, pack_dir), encoding="utf-8") as f:
+            pack = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable prep pack for {resume_hash}: {str(e)}")
+        return None
+    if pack.get("version") != PREP_PACK_VERSION:
+        return None
+
+    pack["stage"] = "complete"
+
+    pack["questions"] = [tuple(item) for item in pack.get("questions", [])]
+    pack["coding_problems"] = [tuple(item) for item in pack.get("coding_problems", [])]
+    candidate_name = (pack.get("parsed_details") or {}).get('Full Name', '')
+    if candidate_name:
+        current = lookup_candidate_round(candidate_name)
+        if current["interview_round"] != pack.get("interview_round"):
+            for stale in ("questions", "coding_problems", *current):
+                pack.pop(stale, None)
+            pack["stage"] = "parsed"
+            return pack
+        pack.update(current)
+    return pack
+
+RESUME_OPEN_WORKERS = int(os.getenv("RESUME_OPEN_WORKERS", "4"))
+
+class StageGraph:
+    """Runs named stages on a thread pool as soon as the stages they depend on have finished"""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add(self, name, func, depends_on=()):
+        """Register a stage; func receives a dict of the results of all finished stages"""
+        self.stages[name] = (func, tuple(depends_on))
+
+    @staticmethod
+    def _timed(func, results):
+        started = time.perf_counter()
+        value = func(results)
+        return value, started, time.perf_counter()
+
+    def run(self):
+        """Run every stage and return (results, timings); the first stage error is re-raised once running stages finish"""
+        results, timings = {}, {}
+        pending = dict(self.stages)
+        running = {}
+        error = None
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="resume-open") as executor:
+            while True:
+                if error is None:
+                    for name, (func, depends_on) in list(pending.items()):
+                        if all(dependency in results for dependency in depends_on):
+                            del pending[name]
+                            running[submit_in_context(executor, self._timed, func, dict(results))] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name], stage_started, stage_finished = future.result()
+                    except Exception as e:
+                        error = error or e
+                        continue
+                    timings[name] = {
+                        "start": round(stage_started - started, 3),
+                        "seconds": round(stage_finished - stage_started, 3)
+                    }
+        timings["total"] = round(time.perf_counter() - started, 3)
+        if error is not None:
+            raise error
+        if pending:
+            raise ValueError(f"Stages with unmet dependencies: {', '.join(sorted(pending))}")
+        return results, timings
+
+def format_stage_timings(timings):
+    """One-line summary of StageGraph timings, slowest stage first"""
+    stages = sorted(((name, t) for name, t in timings.items() if name != "total"), key=lambda item: -item[1]["seconds"])
+    return f"{timings['total']:.2f}s total (" + ", ".join(f"{name} {t['seconds']:.2f}s" for name, t in stages) + ")"
+
+def open_resume(uploaded_file=None, s3_key=None, refresh=False, with_brief=True):
+    """Open an uploaded or S3 resume and prepare its interview materials as a dependency graph.
+
+        download; status_index; store [download]; cached [download];
+        extract, parse_sidecar [cached]; parse [extract, parse_sidecar];
+        status [parse, status_index]; questions [status]; brief [parse]
+
+    The feedback status index refreshes while the PDF downloads and is parsed,
+    uploads are persisted to S3 alongside the parsing, the text and parse
+    sidecars are fetched together, and the brief is generated alongside the
+    questions. Returns a dict with the opened file, the pipeline result, the
+    stored upload (or None), per-stage timings and an error message (None on
+    success). Successful results go into the shared ResumePipelineCache.
+    """
+    cache = get_resume_pipeline_cache()
+    stored_uploads = get_stored_upload_cache()
+    catalog = get_resume_catalog(os.getenv('S3_BUCKET_NAME', 'resumefolderbucket')) if s3_key else None
+    feedback_bucket = os.getenv('S3_BUCKET_FEEDBACK')
+
+    def download(results):
+        if uploaded_file is not None:
+            resume_file = uploaded_file
+        else:
+            entry = catalog.get(s3_key)
+            resume_file = open_resume_from_s3(s3_key, entry["etag"] if entry else None)
+            resume_file.name = os.path.basename(s3_key)
+        return resume_file, compute_resume_hash(resume_file)
+
+    def warm_status_index(results):
+        if feedback_bucket:
+            try:
+                candidate_status_index.lookup("", s3_client_pool, feedback_bucket)
+            except Exception as e:
+                print(f"Status index refresh failed: {str(e)}")  # the status stage reports the error
+
+    def store_upload(results):
+        if uploaded_file is None or not RESUME_UPLOAD_PERSIST:
+            return None
+        resume_hash = results["download"][1]
+        stored = stored_uploads.get(resume_hash)
+        if stored is not None:
+            return stored
+        try:
+            stored = store_uploaded_resume(*results["download"])
+        except Exception as e:
+            # Interview prep doesn't depend on the stored copy; the next rerun tries again
+            print(f"Storing uploaded resume failed: {str(e)}")
+            return None
+        stored_uploads.put(resume_hash, stored)
+        return stored
+
+    def load_cached(results):
+        _, resume_hash = results["download"]
+        if refresh:
+            cache.invalidate(resume_hash)
+            return None  # regenerate everything, prep pack included
+        cached = cache.get(resume_hash)
+        if cached is not None and cached.get("stage") == "complete":
+            return cached
+        # Precomputed prep packs (see batch_prep.py) let the UI skip the LLM entirely
+        pack = load_prep_pack(resume_hash)
+        if pack is not None:
+            cache.put(resume_hash, pack)
+            return pack
+        if cached is None and s3_key and RESUME_PREFETCH_COUNT > 0:
+            # Picked while its prefetch is still parsing: wait for that rather than paying for a second parse
+            if get_resume_prefetcher().wait_for(resume_hash, key=s3_key, timeout=RESUME_PREFETCH_WAIT_SECONDS):
+                cached = cache.get(resume_hash)
+        return cached  # parsed by the background prefetcher, or None
+
+    def extract(results):
+        if results["cached"] is not None:
+            return None
+        resume_file, resume_hash = results["download"]
+        return extract_resume_text(resume_hash, resume_file)
+
+    def parse_sidecar(results):
+        # On refresh parse afresh; parse_resume_stage then overwrites the sidecar
+        if results["cached"] is not None or refresh:
+            return None
+        return load_resume_sidecar(results["download"][1], "parse")
+
+    def parse(results):
+        if results["cached"] is not None:
+            return results["cached"]
+        resume_hash = results["download"][1]
+        extraction = results["extract"]
+        if results["parse_sidecar"] is not None:
+            return parsed_result_from_sidecar(resume_hash, extraction["text"], results["parse_sidecar"], extraction)
+        return parse_resume_stage(resume_hash, extraction["text"], use_sidecar=False, extraction=extraction)
+
+    def status(results):
+        parsed_result = results["parse"]
+        if parsed_result.get("stage") == "complete" or not pipeline_result_succeeded(parsed_result):
+            return None
+        candidate_name = parsed_result["parsed_details"].get('Full Name', '')
+        return lookup_candidate_round(candidate_name) if candidate_name else None
+
+    def questions(results):
+        parsed_result = results["parse"]
+        if parsed_result.get("stage") == "complete":
+            return parsed_result
+        result = dict(parsed_result, stage="complete")
+        if results["status"] is not None:
+            parsed_details = result["parsed_details"]
+            result.update(results["status"])
+            result["questions"], result["coding_problems"] = generate_questions_and_coding(
+                result["interview_round"],
+                parsed_details.get('Years of Experience', 0),
+                parsed_details.get('Skills', [])
+            )
+        return result
+
+    def brief(results):
+        parsed_result = results["parse"]
+        if parsed_result.get("brief") or not with_brief or not pipeline_result_succeeded(parsed_result):
+            return parsed_result.get("brief")
+        if not parsed_result["parsed_details"].get('Full Name'):
+            return None
+        generated = InterviewerPrepGenerator().generate_quick_brief(parsed_result["parsed_details"])
+        return None if generated.startswith("Error") else generated
+
+    graph = StageGraph(max_workers=RESUME_OPEN_WORKERS)
+    graph.add("download", download)
+    graph.add("status_index", warm_status_index)
+    graph.add("store", store_upload, ["download"])
+    graph.add("cached", load_cached, ["download"])
+    graph.add("extract", extract, ["cached"])
+    graph.add("parse_sidecar", parse_sidecar, ["cached"])
+    graph.add("parse", parse, ["extract", "parse_sidecar"])
+    graph.add("status", status, ["parse", "status_index"])
+    graph.add("questions", questions, ["status"])
+    graph.add("brief", brief, ["parse"])
+    try:
+        with refreshing_llm_cache(refresh):
+            results, timings = graph.run()
+    except Exception as e:
+        return {"file": None, "result": None, "stored": None, "timings": None, "error": str(e)}
+
+    result = results["questions"]
+    if results["brief"] and not result.get("brief"):
+        result = dict(result, brief=results["brief"])
+    if pipeline_result_succeeded(result):
+        cache.put(result["resume_hash"], result)
+        generation_failed = any(is_generation_error(entry) for entry in result.get("questions", []) + result.get("coding_problems", []))
+        if refresh and not generation_failed and os.path.exists(prep_pack_path(result["resume_hash"])):
+            # Don't let the old pack come back after a restart
+            source = {"type": "s3", "key": s3_key} if s3_key else {"type": "upload", "name": getattr(uploaded_file, "name", None)}
+            save_prep_pack(result, source=source, brief=result.get("brief"))
+    print(f"Opened resume {result['resume_hash'][:12]} in {format_stage_timings(timings)}")
+    return {"file": results["download"][0], "result": result, "stored": results["store"], "timings": timings, "error": None}
+
+RESUME_PREFETCH_COUNT = int(os.getenv("RESUME_PREFETCH_COUNT", "3"))
+RESUME_PREFETCH_CONCURRENCY = int(os.getenv("RESUME_PREFETCH_CONCURRENCY", "2"))
+RESUME_PREFETCH_WAIT_SECONDS = float(os.getenv("RESUME_PREFETCH_WAIT_SECONDS", "60"))
+
+class ResumePrefetcher:
+    """Downloads, extracts and parses likely-next S3 resumes in the background.
+
+    Parsed results go into the shared ResumePipelineCache, so open_resume
+    only has to add the status lookup and question generation once the
+    interviewer picks one. Work is tracked per owner (browser session) and can
+    be cancelled when that session's selection changes; open_resume waits for
+    a prefetch that is still running instead of parsing the resume again.
+    """
+
+    # Most recent S3 key -> PDF hash pairs remembered to skip already parsed resumes
+    MAX_REMEMBERED_HASHES = 1024
+
+    def __init__(self, pipeline_cache, catalog, max_workers):
+        self.pipeline_cache = pipeline_cache
+        self.catalog = catalog
+        self.completed = 0
+        self.cancelled = 0
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="resume-prefetch")
+        self._lock = threading.RLock()  # done callbacks can run while it is held (future.cancel())
+        self._hashes = OrderedDict()
+        self._tasks = {}  # owner -> {key: None} of the prefetches it asked for; finished tasks remove themselves
+        self._in_flight = {}  # key -> (future, cancel_event, owners waiting on it), across all owners
+
+    def prefetch(self, owner, keys):
+        """Queue keys that are not already parsed; one already being prefetched gains this owner"""
+        with self._lock:
+            for key in keys:
+                if key in self._in_flight:
+                    self._in_flight[key][2].add(owner)
+                    self._tasks.setdefault(owner, {})[key] = None
+                    continue
+                resume_hash = self._hashes.get(key)
+                if resume_hash is not None and self.pipeline_cache.get(resume_hash) is not None:
+                    continue
+                cancel_event = threading.Event()
+                future = self._executor.submit(self._prefetch_one, key, cancel_event)
+                self._tasks.setdefault(owner, {})[key] = None
+                self._in_flight[key] = (future, cancel_event, {owner})
+                future.add_done_callback(lambda future, key=key: self._forget(key, future))
+
+    def _forget(self, key, future):
+        with self._lock:
+            task = self._in_flight.get(key)
+            if task is None or task[0] is not future:
+                return
+            del self._in_flight[key]
+            for owner in task[2]:
+                self._drop_owner_key(owner, key)
+
+    def _drop_owner_key(self, owner, key):
+        tasks = self._tasks.get(owner, {})
+        tasks.pop(key, None)
+        if not tasks:
+            self._tasks.pop(owner, None)
+
+    def wait_for(self, resume_hash, key=None, timeout=None):
+        """Wait for a running prefetch of this resume (by S3 key or PDF hash); True if there was one"""
+        with self._lock:
+            task = self._in_flight.get(key)
+            if task is None:
+                task = next((t for k, t in self._in_flight.items() if self._hashes.get(k) == resume_hash), None)
+        if task is None:
+            return False
+        try:
+            task[0].result(timeout=timeout)
+        except Exception as e:
+            print(f"Not waiting for resume prefetch any longer: {type(e).__name__} {str(e)}")
+        return True
+
+    def cancel(self, owner, keep=None):
+        """Withdraw this owner from its prefetches except `keep`; ones no other owner wants are stopped"""
+        with self._lock:
+            for key in list(self._tasks.get(owner, {})):
+                if key == keep:
+                    continue
+                self._drop_owner_key(owner, key)
+                task = self._in_flight.get(key)
+                if task is None:
+                    continue
+                future, cancel_event, owners = task
+                owners.discard(owner)
+                if owners:
+                    continue  # another session still wants this resume
+                cancel_event.set()
+                if future.cancel() or not future.done():
+                    self.cancelled += 1
+
+    def _prefetch_one(self, key, cancel_event):
+        # Downloads land in the resume disk cache, where the interviewer's pick is served from
+        entry = self.catalog.get(key)
+        resume_file = open_resume_from_s3(key, entry["etag"] if entry else None)
+        try:
+            resume_hash = compute_resume_hash(resume_file)
+            with self._lock:
+                self._hashes[key] = resume_hash
+                self._hashes.move_to_end(key)
+                while len(self._hashes) > self.MAX_REMEMBERED_HASHES:
+                    self._hashes.popitem(last=False)
+            if cancel_event.is_set() or self.pipeline_cache.get(resume_hash) is not None:
+                return
+
+            extraction = extract_resume_text(resume_hash, resume_file)
+        finally:
+            resume_file.close()
+        if cancel_event.is_set():
+            return
+        result = parse_resume_stage(resume_hash, extraction["text"], extraction=extraction)
+        if pipeline_result_succeeded(result) and self.pipeline_cache.get(resume_hash) is None:
+            self.pipeline_cache.put(resume_hash, result)
+        with self._lock:
+            self.completed += 1
+
+@st.cache_resource
+def get_resume_prefetcher():
+    """Prefetcher shared by all sessions; its thread pool caps concurrent prefetch work"""
+    return ResumePrefetcher(
+        get_resume_pipeline_cache(),
+        get_resume_catalog(os.getenv('S3_BUCKET_NAME', 'resumefolderbucket')),
+        max_workers=RESUME_PREFETCH_CONCURRENCY
     )
 
-elif selection_method == "s3":
-    # S3 selection option
-    resumes = list_s3_resumes()
-    if resumes:
-        selected_resume = st.selectbox(
-            "Choose a resume from S3 bucket",
-            ["Select a resume..."] + resumes,
-            index=0,
-            format_func=lambda x: os.path.basename(x) if x != "Select a resume..." else x,
-            help="Select a resume to generate interview questions and coding problems"
-        )
-        if selected_resume and selected_resume != "Select a resume...":
-            with st.spinner(f"Downloading {selected_resume}..."):
-                uploaded_file = download_resume_from_s3(selected_resume)
-                if uploaded_file:
-                    uploaded_file.name = os.path.basename(selected_resume)
-    else:
-        st.warning("No resumes found in S3 bucket or unable to connect to S3.")
-        st.info("💡 Try using the 'Upload PDF File' option instead.")
-
-# Process the resume if available
-if uploaded_file:
-    # Simple progress
-    with st.spinner("🔍 Analyzing resume and preparing interview materials..."):
-        resume_text = extract_text_from_pdf(uploaded_file)
-    
-    if resume_text and not resume_text.startswith("Error"):
-        with st.spinner("🎯 Generating questions with answers..."):
-            parsed_details = parse_resume_with_gpt(resume_text)
-
-        if isinstance(parsed_details, dict) and "error" not in parsed_details:
-            # Check candidate status in S3 CSV file
-            candidate_name = parsed_details.get('Full Name', '')
-            if candidate_name:
-                candidate_status, status_message = check_candidate_status_in_s3_csv(candidate_name)
-                # Suggest next round based on candidate_status
-                next_round_message = ""
-                # Determine the interview round
-                if candidate_status.startswith("L1"):
-                    interview_round = "L1"
-                elif candidate_status.startswith("L2"):
-                    interview_round = "L2"
-                elif candidate_status.startswith("L3"):
-                    interview_round = "L3"
+# --- Streaming ingestion ---
+class StreamingPipeline:
+    """Source -> stage -> stage ... with its own worker threads per stage and bounded queues in between.
+
+    A full queue blocks whoever feeds it, so a slow stage (typically the LLM)
+    throttles everything upstream instead of letting downloaded PDFs pile up in
+    memory. A stage's func maps one item to its output; returning None drops
+    the item, and exceptions are counted as failures and drop it too.
+    """
+
+    _DONE = object()
+
+    def __init__(self, source):
+        self.source = source
+        self.stages = []
+        self.started = None
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def add(self, name, func, workers=1, queue_size=None):
+        """Append a stage fed by a queue of queue_size items (default: twice its workers)"""
+        queue_size = queue_size or workers * 2
+        self.stages.append((name, func, workers, queue_size))
+        self._metrics[name] = {
+            "workers": workers, "queue_size": queue_size, "processed": 0, "dropped": 0, "failed": 0,
+            "first_error": None, "busy_seconds": 0.0, "blocked_seconds": 0.0,
+            "max_queue": 0, "queue_samples": 0, "queue_total": 0
+        }
+        return self
+
+    def _put(self, target, item, stage=None, queue_stage=None):
+        # Time spent waiting for room downstream is the backpressure this stage feels
+        started = time.perf_counter()
+        while not self._cancelled.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        with self._lock:
+            if stage is not None:
+                self._metrics[stage]["blocked_seconds"] += time.perf_counter() - started
+            if queue_stage is not None:
+                depth = target.qsize()
+                metrics = self._metrics[queue_stage]
+                metrics["max_queue"] = max(metrics["max_queue"], depth)
+                metrics["queue_samples"] += 1
+                metrics["queue_total"] += depth
+
+    def _get(self, source):
+        while not self._cancelled.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return self._DONE
+
+    def _finish(self, target, consumers):
+        # One sentinel per consumer, so none is left behind in the queue (or its occupancy) afterwards
+        for _ in range(consumers):
+            self._put(target, self._DONE)
+
+    def _feed(self, target, first_stage, consumers):
+        try:
+            for item in self.source:
+                if self._cancelled.is_set():
+                    break
+                self._put(target, item, queue_stage=first_stage)
+        except Exception as e:
+            print(f"Ingestion source failed: {str(e)}")
+            with self._lock:
+                self._metrics[first_stage]["first_error"] = f"source: {str(e)}"
+        self._finish(target, consumers)
+
+    def _work(self, name, func, inbox, outbox, next_stage, remaining, consumers):
+        while True:
+            item = self._get(inbox)
+            if item is self._DONE:
+                break
+            started = time.perf_counter()
+            try:
+                output, failed = func(item), None
+            except Exception as e:
+                output, failed = None, str(e)
+            with self._lock:
+                metrics = self._metrics[name]
+                metrics["busy_seconds"] += time.perf_counter() - started
+                if failed is not None:
+                    metrics["failed"] += 1
+                    metrics["first_error"] = metrics["first_error"] or failed
+                elif output is None:
+                    metrics["dropped"] += 1
                 else:
-                    interview_round = "L1"  # Default fallback
-
-                if interview_round == "L1":
-                    next_round_message = "You have to take the L2 round for this candidate."
-                elif interview_round == "L2":
-                    next_round_message = "You have to take the L3 round for this candidate."
-                elif interview_round == "L3":
-                    next_round_message = "All rounds completed. You can proceed to feedback or offer."
+                    metrics["processed"] += 1
+            if output is not None:
+                self._put(outbox, output, stage=name, queue_stage=next_stage)
+        with self._lock:
+            remaining[name] -= 1
+            last_worker = remaining[name] == 0
+        if last_worker:
+            self._finish(outbox, consumers)
+
+    def run(self):
+        """Start the source and all stage workers, and yield the last stage's outputs as they are ready"""
+        if not self.stages:
+            raise ValueError("StreamingPipeline needs at least one stage")
+        self.started = time.perf_counter()
+        queues = [queue.Queue(maxsize=queue_size) for _, _, _, queue_size in self.stages]
+        results = queue.Queue(maxsize=self.stages[-1][2] * 2)
+        remaining = {name: workers for name, _, workers, _ in self.stages}
+        threads = [threading.Thread(target=self._feed, args=(queues[0], self.stages[0][0], self.stages[0][2]), name="ingest-source", daemon=True)]
+        for index, (name, func, workers, _) in enumerate(self.stages):
+            outbox = queues[index + 1] if index + 1 < len(self.stages) else results
+            next_stage = self.stages[index + 1][0] if index + 1 < len(self.stages) else None
+            consumers = self.stages[index + 1][2] if index + 1 < len(self.stages) else 1
+            threads.extend(
+                threading.Thread(target=self._work, args=(name, func, queues[index], outbox, next_stage, remaining, consumers),
+                                 name=f"ingest-{name}-{worker}", daemon=True)
+                for worker in range(workers)
+            )
+        self._queues = dict(zip((name for name, *_ in self.stages), queues))
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = self._get(results)
+                if item is self._DONE:
+                    break
+                yield item
+        finally:
+            # Consumer stopped early (or finished): release any worker blocked on a full queue
+            self._cancelled.set()
+
+    def stats(self):
+        """Per-stage throughput, utilization, queue occupancy and backpressure so far; safe to call while running"""
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        stages = []
+        with self._lock:
+            for name, _, workers, queue_size in self.stages:
+                metrics = self._metrics[name]
+                current = self._queues[name].qsize() if self.started else 0
+                stages.append({
+                    "stage": name,
+                    "workers": workers,
+                    "processed": metrics["processed"],
+                    "dropped": metrics["dropped"],
+                    "failed": metrics["failed"],
+                    "first_error": metrics["first_error"],
+                    "items_per_sec": round(metrics["processed"] / elapsed, 2) if elapsed else 0.0,
+                    "utilization": round(metrics["busy_seconds"] / (workers * elapsed), 2) if elapsed else 0.0,
+                    "blocked_seconds": round(metrics["blocked_seconds"], 2),
+                    "queue": {
+                        "size": queue_size,
+                        "current": min(current, queue_size),
+                        "max": min(metrics["max_queue"], queue_size),
+                        "avg_occupancy": round(metrics["queue_total"] / metrics["queue_samples"] / queue_size, 2) if metrics["queue_samples"] else 0.0
+                    }
+                })
+        return {"elapsed_seconds": round(elapsed, 2), "stages": stages}
+
+def format_pipeline_stats(stats):
+    """One line per stage: throughput, queue fill and time blocked on the next stage"""
+    return "\n".join(
+        f"{stage['stage']:<9} {stage['processed']:>6} done {stage['failed']:>4} failed  {stage['items_per_sec']:>7.2f}/s  "
+        f"busy {stage['utilization']:>4.0%}  queue {stage['queue']['current']}/{stage['queue']['size']} (max {stage['queue']['max']}, "
+        f"avg {stage['queue']['avg_occupancy']:.0%})  blocked {stage['blocked_seconds']:.1f}s"
+        for stage in stats["stages"]
+    )
+
+INGEST_DOWNLOAD_WORKERS = int(os.getenv("INGEST_DOWNLOAD_WORKERS", "4"))
+INGEST_EXTRACT_WORKERS = int(os.getenv("INGEST_EXTRACT_WORKERS", "2"))
+INGEST_PARSE_WORKERS = int(os.getenv("INGEST_PARSE_WORKERS", "2"))
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+
+def iter_s3_resumes(bucket_name, prefix=""):
+    """Yield {"key", "etag"} for each PDF under the prefix, newest first, from the bucket's ResumeCatalog"""
+    catalog = get_resume_catalog(bucket_name)
+    catalog.sync(prefix)
+    for entry in catalog.query(prefix):
+        yield {"key": entry["key"], "etag": entry["etag"]}
+
+def build_ingestion_pipeline(source, download_workers=None, extract_workers=None, parse_workers=None, queue_size=None):
+    """S3 resume refs -> download -> extract -> parse -> save_candidate_profile, as a StreamingPipeline of candidate records"""
+    pipeline_cache = get_resume_pipeline_cache()
+
+    def download(ref):
+        resume_file = open_resume_from_s3(ref["key"], ref["etag"])
+        return {**ref, "file": resume_file, "resume_hash": compute_resume_hash(resume_file)}
+
+    def extract(item):
+        resume_file = item.pop("file")
+        try:
+            # Carried along rather than looked up again in parse, where the LRU may have evicted it
+            item["cached"] = pipeline_cache.get(item["resume_hash"])
+            if item["cached"] is None:
+                item["extraction"] = extract_resume_text(item["resume_hash"], resume_file)
+        finally:
+            resume_file.close()  # nothing downstream holds on to the PDF itself
+        return item
+
+    def parse(item):
+        result = item["cached"]
+        if result is None:
+            extraction = item["extraction"]
+            result = parse_resume_stage(item["resume_hash"], extraction["text"], extraction=extraction)
+            if not pipeline_result_succeeded(result):
+                raise RuntimeError((result.get("parsed_details") or {}).get("error") or result.get("resume_text") or "No text extracted")
+            pipeline_cache.put(item["resume_hash"], result)
+        return {"key": item["key"], "resume_hash": item["resume_hash"], "result": result}
+
+    def save(item):
+        result = item["result"]
+        candidate_id = save_candidate_profile(result["parsed_details"], os.path.basename(item["key"]))
+        if candidate_id is None:
+            raise RuntimeError("Could not save candidate profile")
+        return {
+            "candidate_id": candidate_id,
+            "key": item["key"],
+            "resume_hash": item["resume_hash"],
+            "candidate_name": result["parsed_details"].get('Full Name', ''),
+            "parse_mode": result.get("parse_mode"),
+            "extraction": result.get("extraction"),
+            "parsed_details": result["parsed_details"]
+        }
+
+    queue_size = queue_size or INGEST_QUEUE_SIZE
+    return (
+        StreamingPipeline(source)
+        .add("download", download, download_workers or INGEST_DOWNLOAD_WORKERS, queue_size)
+        .add("extract", extract, extract_workers or INGEST_EXTRACT_WORKERS, queue_size)
+        .add("parse", parse, parse_workers or INGEST_PARSE_WORKERS, queue_size)
+        .add("save", save, 1, queue_size)
+    )
+
+# --- Streamlined Streamlit UI ---
+def main():
+    """Render the Streamlit app (re-run top to bottom by Streamlit on every interaction)"""
+    st.set_page_config(
+        page_title="🎯 Interviewer Quick Prep",
+        page_icon="👥",
+        layout="wide"
+    )
+
+    # Initialize session state
+    initialize_session_state()
+
+    if FEEDBACK_STORAGE_MODE != "xlsx" and FEEDBACK_COMPACTION_INTERVAL_SECONDS > 0 and os.getenv('S3_BUCKET_FEEDBACK'):
+        get_feedback_compactor()
+
+    # Custom CSS for clean interviewer design
+    st.markdown("""
+    <style>
+        .interviewer-header {
+            font-size: 2.5rem;
+            font-weight: bold;
+            text-align: center;
+            background: linear-gradient(90deg, #2E8B57 0%, #228B22 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom: 1rem;
+        }
+        .candidate-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 1.5rem;
+            border-radius: 15px;
+            margin: 1rem 0;
+        }
+        .prep-section {
+            background-color: #f8f9fa;
+            border-radius: 10px;
+            padding: 1rem;
+            margin: 1rem 0;
+            border-left: 4px solid #28a745;
+        }
+        .language-selector {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 1rem;
+            border-radius: 10px;
+            margin: 1rem 0;
+        }
+        .error-box {
+            background-color: #f8d7da;
+            border: 1px solid #f5c6cb;
+            color: #721c24;
+            padding: 1rem;
+            border-radius: 8px;
+            margin: 1rem 0;
+        }
+        .success-box {
+            background-color: #d4edda;
+            border: 1px solid #c3e6cb;
+            color: #155724;
+            padding: 1rem;
+            border-radius: 8px;
+            margin: 1rem 0;
+        }
+        .status-info {
+            background-color: #e3f2fd;
+            border: 1px solid #90caf9;
+            color: #0d47a1;
+            padding: 1rem;
+            border-radius: 8px;
+            margin: 1rem 0;
+            font-weight: bold;
+        }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # Main header
+    st.markdown('<h1 class="interviewer-header"> Interview Edge</h1>', unsafe_allow_html=True)
+
+    st.markdown("#### <span style='color:#4F8BF9;font-weight:bold;'>How would you like to provide the resume?</span>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("upload from local files", use_container_width=True):
+            st.session_state.resume_input_method = "upload"
+    with col2:
+        if st.button("☁️ Select from NexTurn datastore", use_container_width=True):
+            st.session_state.resume_input_method = "s3"
+
+    # Set a default if not set
+    if "resume_input_method" not in st.session_state:
+        st.session_state.resume_input_method = None
+
+    selection_method = st.session_state.resume_input_method
+
+    uploaded_file = None
+    s3_resume_key = None
+
+    if selection_method == "upload":
+        # File upload option
+        uploaded_file = st.file_uploader(
+            "Upload candidate resume (PDF)",
+            type=['pdf'],
+            help="Upload a PDF resume to generate interview questions"
+        )
+
+    elif selection_method == "s3":
+        # S3 selection option
+        with st.expander("🔎 Filter resumes"):
+            filter_cols = st.columns(4)
+            name_filter = filter_cols[0].text_input("Name contains", key="resume_name_filter")
+            prefix_filter = filter_cols[1].text_input("Key prefix", key="resume_prefix_filter")
+            modified_after = filter_cols[2].date_input("Modified from", value=None, key="resume_modified_after")
+            modified_before = filter_cols[3].date_input("Modified until", value=None, key="resume_modified_before")
+            refresh_list = st.button("🔄 Refresh resume list", help="Re-list the bucket now instead of waiting for the catalog to expire")
+        resumes = list_s3_resumes(prefix_filter, name_filter, modified_after, modified_before, refresh=refresh_list)
+        if resumes:
+            selected_resume = st.selectbox(
+                "Choose a resume from S3 bucket",
+                ["Select a resume..."] + resumes,
+                index=0,
+                format_func=lambda x: os.path.basename(x) if x != "Select a resume..." else x,
+                help="Select a resume to generate interview questions and coding problems"
+            )
+            # Warm the top of the list while the interviewer is reading it; focus on the pick once made
+            if RESUME_PREFETCH_COUNT > 0:
+                prefetch_owner = st.session_state.setdefault("prefetch_owner", os.urandom(8).hex())
+                if selected_resume == "Select a resume...":
+                    get_resume_prefetcher().prefetch(prefetch_owner, resumes[:RESUME_PREFETCH_COUNT])
+                elif selected_resume != st.session_state.get("prefetch_selection"):
+                    get_resume_prefetcher().cancel(prefetch_owner, keep=selected_resume)
+                st.session_state.prefetch_selection = selected_resume
+            if selected_resume and selected_resume != "Select a resume...":
+                s3_resume_key = selected_resume
+                cache_stats = resume_disk_cache.stats()
+                st.caption(f"Resume cache: {cache_stats['hit_rate']:.0%} hit rate, {cache_stats['bytes_saved'] / 1048576:.1f} MB of downloads saved")
+        else:
+            st.warning("No resumes found in S3 bucket or unable to connect to S3.")
+            st.info("💡 Try using the 'Upload PDF File' option instead.")
+
+    # Process the resume if available
+    pipeline_result = None
+    if uploaded_file or s3_resume_key:
+        refresh_requested = st.button("🔄 Refresh interview materials", help="Discard the cached results for this resume and process it again")
+
+        # Simple progress
+        with st.spinner("🔍 Analyzing resume and preparing interview materials..."):
+            opened = open_resume(uploaded_file=uploaded_file, s3_key=s3_resume_key, refresh=refresh_requested)
+        if opened["error"] is not None:
+            st.error(f"Error opening {s3_resume_key or uploaded_file.name}: {opened['error']}")
+        else:
+            uploaded_file = opened["file"]
+            pipeline_result = opened["result"]
+            resume_hash = pipeline_result["resume_hash"]
+            st.caption(f"⏱️ Prepared in {format_stage_timings(opened['timings'])}")
+            extraction = pipeline_result.get("extraction")
+            if extraction and extraction["truncated"]:
+                st.caption(f"📄 Long resume: read the first {extraction['pages_read']} of {extraction['page_count']} pages "
+                           f"(stopped by the {extraction['stopped_by']} budget)")
+            if opened["stored"] is not None:
+                if opened["stored"]["deduplicated"]:
+                    st.caption(f"☁️ Already in the datastore as {opened['stored']['key']}")
                 else:
-                    next_round_message = "Candidate status not recognized. Please go with the L1 round for this candidate."
-                experience = parsed_details.get('Years of Experience', 0)
-                skills = parsed_details.get('Skills', [])
-                questions, coding_problems = generate_questions_and_coding(interview_round, experience, skills)
+                    st.caption(f"☁️ Saved to the datastore as {opened['stored']['key']}")
+
+    if pipeline_result is not None:
+        resume_text = pipeline_result["resume_text"]
+    
+        if resume_text and not resume_text.startswith("Error"):
+            parsed_details = pipeline_result["parsed_details"]
+
+            if isinstance(parsed_details, dict) and "error" not in parsed_details:
+                candidate_name = parsed_details.get('Full Name', '')
+                questions = pipeline_result["questions"]
+                coding_problems = pipeline_result["coding_problems"]
+                if candidate_name:
+                    candidate_status = pipeline_result["candidate_status"]
+                    status_message = pipeline_result["status_message"]
+                    next_round_message = pipeline_result["next_round_message"]
 
-                st.info(f"🔔 {next_round_message}")
+                    st.info(f"🔔 {next_round_message}")
                 
-                # Display candidate status information
-                if candidate_status == "Need to go with L1":
-                    st.markdown(f"""
-                    <div class="status-info">
-                        📋 <strong>Candidate Status:</strong> {candidate_status}<br>
-                        <small>ℹ️ {status_message}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="status-info">
-                        📊 <strong>Current Candidate Status:</strong> {candidate_status}<br>
-                        <small>✅ {status_message}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    # Display candidate status information
+                    if candidate_status == "Need to go with L1":
+                        st.markdown(f"""
+                        <div class="status-info">
+                            📋 <strong>Candidate Status:</strong> {candidate_status}<br>
+                            <small>ℹ️ {status_message}</small>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"""
+                        <div class="status-info">
+                            📊 <strong>Current Candidate Status:</strong> {candidate_status}<br>
+                            <small>✅ {status_message}</small>
+                        </div>
+                        """, unsafe_allow_html=True)
             
-            # Save candidate profile
-            candidate_id = save_candidate_profile(parsed_details, uploaded_file.name)
+                # Save candidate profile
+                candidate_id = save_candidate_profile(parsed_details, uploaded_file.name)
             
-            # Initialize candidate status if not exists
-            if candidate_id not in st.session_state.candidate_statuses:
-                st.session_state.candidate_statuses[candidate_id] = "Screening"
+                # Initialize candidate status if not exists
+                if candidate_id not in st.session_state.candidate_statuses:
+                    st.session_state.candidate_statuses[candidate_id] = "Screening"
             
-            # Generate interviewer preparation content
-            prep_generator = InterviewerPrepGenerator()
+                # Generate interviewer preparation content
+                prep_generator = InterviewerPrepGenerator()
             
-            st.success("✅ Interview preparation ready!")
+                st.success("✅ Interview preparation ready!")
             
-            # Candidate overview card
-            st.markdown(f"""
-            <div class="candidate-card">
-                <h2>👤 {parsed_details['Full Name']}</h2>
-                <div style="display: flex; justify-content: space-between; margin-top: 1rem;">
-                    <div><strong>Domain:</strong> {parsed_details['Relevant Domain']}</div>
-                    <div><strong>Experience:</strong> {parsed_details['Years of Experience']} years</div>
-                    <div><strong>Key Skills:</strong> {', '.join(parsed_details['Skills'][:3])}</div>
+                # Candidate overview card
+                st.markdown(f"""
+                <div class="candidate-card">
+                    <h2>👤 {parsed_details['Full Name']}</h2>
+                    <div style="display: flex; justify-content: space-between; margin-top: 1rem;">
+                        <div><strong>Domain:</strong> {parsed_details['Relevant Domain']}</div>
+                        <div><strong>Experience:</strong> {parsed_details['Years of Experience']} years</div>
+                        <div><strong>Key Skills:</strong> {', '.join(parsed_details['Skills'][:3])}</div>
+                    </div>
                 </div>
-            </div>
-            """, unsafe_allow_html=True)
+                """, unsafe_allow_html=True)
 
-            # Updated tabs - Added LLM Metrics tab
-            tabs = st.tabs([
-                "📋 Quick Brief", 
-                "⚡ 5-Min Assessment Q&A", 
-                "💻 Quick Coding Q&A",
-                "📝 Feedback",
-                "📊 LLM Metrics"
-            ])
-
-            # Quick Brief Tab
-            with tabs[0]:
-                # st.header("📋 Candidate Brief")
-                try:
-                    brief = prep_generator.generate_quick_brief(parsed_details)
-                    
-                    st.markdown(f"""
-                    <div class="prep-section">
-                        {brief.replace(chr(10), '<br>')}
-                    </div>
-                    """, unsafe_allow_html=True)
-                except Exception as e:
-                    st.error(f"Error generating brief: {str(e)}")
+                # Updated tabs - Added LLM Metrics tab
+                tabs = st.tabs([
+                    "📋 Quick Brief", 
+                    "⚡ 5-Min Assessment Q&A", 
+                    "💻 Quick Coding Q&A",
+                    "📝 Feedback",
+                    "📊 LLM Metrics"
+                ])
+
+                # Quick Brief Tab
+                with tabs[0]:
+                    # st.header("📋 Candidate Brief")
+                    try:
+                        brief_placeholder = st.empty()
+                        render_brief = lambda text: brief_placeholder.markdown(f"""
+                        <div class="prep-section">
+                            {text.replace(chr(10), '<br>')}
+                        </div>
+                        """, unsafe_allow_html=True)
+                        if pipeline_result.get("brief"):
+                            brief = pipeline_result["brief"]
+                            render_brief(brief)
+                        elif LLM_STREAMING:
+                            brief = render_streamed_text(
+                                prep_generator.generate_quick_brief(parsed_details, stream=True),
+                                brief_placeholder,
+                                render=render_brief
+                            )
+                        else:
+                            brief = prep_generator.generate_quick_brief(parsed_details)
+                            render_brief(brief)
+                    except Exception as e:
+                        st.error(f"Error generating brief: {str(e)}")
                 
-                # Quick reference info
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown("#### Skills to Validate")
-                    for skill in parsed_details['Skills'][:5]:
-                        st.markdown(f"• {skill}")
+                    # Quick reference info
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown("#### Skills to Validate")
+                        for skill in parsed_details['Skills'][:5]:
+                            st.markdown(f"• {skill}")
                     
-                    if parsed_details['GitHub Links']:
-                        st.markdown("#### GitHub Profile")
-                        for link in parsed_details['GitHub Links']:
-                            st.markdown(f"• [View Profile]({link})")
+                        if parsed_details['GitHub Links']:
+                            st.markdown("#### GitHub Profile")
+                            for link in parsed_details['GitHub Links']:
+                                st.markdown(f"• [View Profile]({link})")
                 
-                with col2:
-                    st.markdown("#### Background")
-                    st.markdown(f"• **Experience:** {parsed_details['Years of Experience']} years")
-                    st.markdown(f"• **Projects:** {len(parsed_details['Projects'])} listed")
-                    if parsed_details['Past Job Titles']:
-                        st.markdown("• **Past Roles:**")
-                        for role in parsed_details['Past Job Titles'][:3]:
-                            st.markdown(f"  - {role}")
-
-            # 5-Min Assessment Tab with Q&A
-            with tabs[1]:
-                # st.header("⚡ 5-Minute Quick Assessment")
-                st.info("💡 Start with these questions to quickly gauge the candidate. Please note that answers should be concise and direct.")
+                    with col2:
+                        st.markdown("#### Background")
+                        st.markdown(f"• **Experience:** {parsed_details['Years of Experience']} years")
+                        st.markdown(f"• **Projects:** {len(parsed_details['Projects'])} listed")
+                        if parsed_details['Past Job Titles']:
+                            st.markdown("• **Past Roles:**")
+                            for role in parsed_details['Past Job Titles'][:3]:
+                                st.markdown(f"  - {role}")
+
+                # 5-Min Assessment Tab with Q&A
+                with tabs[1]:
+                    # st.header("⚡ 5-Minute Quick Assessment")
+                    st.info("💡 Start with these questions to quickly gauge the candidate. Please note that answers should be concise and direct.")
                 
-                try:
-                    st.markdown("### ⚡ Quick Assessment Q&A")
-                    for idx, (q, a) in enumerate(questions, 1):
-                        st.markdown(
-                            f"""
-                            <div style="margin-bottom: 1.5em; padding: 1em; border-radius: 8px; background: #f8f9fa; box-shadow: 0 1px 2px rgba(0,0,0,0.03);">
-                                <div style="font-weight: bold; color: #222; margin-bottom: 0.4em;">Q{idx}: {q}</div>
-                                <div style="margin-left: 1em; color: #444;"><span style="color: #009688; font-weight: 500;">A:</span> {a}</div>
-                            </div>
-                            """,
-                            unsafe_allow_html=True
-                        )
-                except Exception as e:
-                    st.error(f"Error generating quick assessment: {str(e)}")
-                    st.info("Please try refreshing the page or check your OpenAI API key.")
-
-            # Quick Coding Q&A Tab
-            with tabs[2]:
-                st.markdown("### 💻 Quick Coding Problems")
-                for idx, (q, a) in enumerate(coding_problems, 1):
-                    with st.expander(f"Problem {idx}", expanded=True):
-                        st.markdown(f"**Question:** {q}")
+                    try:
+                        st.markdown("### ⚡ Quick Assessment Q&A")
+                        for idx, (q, a) in enumerate(questions, 1):
+                            if is_generation_error((q, a)):
+                                st.error(f"Q{idx}: {q}")
+                                continue
+                            st.markdown(
+                                f"""
+                                <div style="margin-bottom: 1.5em; padding: 1em; border-radius: 8px; background: #f8f9fa; box-shadow: 0 1px 2px rgba(0,0,0,0.03);">
+                                    <div style="font-weight: bold; color: #222; margin-bottom: 0.4em;">Q{idx}: {q}</div>
+                                    <div style="margin-left: 1em; color: #444;"><span style="color: #009688; font-weight: 500;">A:</span> {a}</div>
+                                </div>
+                                """,
+                                unsafe_allow_html=True
+                            )
+                    except Exception as e:
+                        st.error(f"Error generating quick assessment: {str(e)}")
+                        st.info("Please try refreshing the page or check your OpenAI API key.")
+
+                # Quick Coding Q&A Tab
+                with tabs[2]:
+                    st.markdown("### 💻 Quick Coding Problems")
+                    for idx, (q, a) in enumerate(coding_problems, 1):
+                        if is_generation_error((q, a)):
+                            st.error(f"Problem {idx}: {q}")
+                            continue
+                        with st.expander(f"Problem {idx}", expanded=True):
+                            st.markdown(f"**Question:** {q}")
                         
-                        # Parse and display the answer with code blocks
-                        import re
-                        code_blocks = re.findall(r"```(?:[a-zA-Z0-9]*)\n?(.*?)```", a, re.DOTALL)
-                        if code_blocks:
-                            # Display text before code
-                            pre_code = a.split("```")[0]
-                            if pre_code.strip():
-                                st.markdown(f"**Solution:** {pre_code.strip()}")
+                            # Parse and display the answer with code blocks
+                            import re
+                            code_blocks = re.findall(r"```(?:[a-zA-Z0-9]*)\n?(.*?)```", a, re.DOTALL)
+                            if code_blocks:
+                                # Display text before code
+                                pre_code = a.split("```")[0]
+                                if pre_code.strip():
+                                    st.markdown(f"**Solution:** {pre_code.strip()}")
                             
-                            # Display code blocks
-                            for code in code_blocks:
-                                st.code(code.strip(), language="python")
+                                # Display code blocks
+                                for code in code_blocks:
+                                    st.code(code.strip(), language="python")
                             
-                            # Display text after code
-                            post_code_parts = a.split("```")
-                            if len(post_code_parts) > 2 and post_code_parts[-1].strip():
-                                st.markdown(post_code_parts[-1].strip())
-                        else:
-                            st.markdown(f"**Solution:** {a}")
+                                # Display text after code
+                                post_code_parts = a.split("```")
+                                if len(post_code_parts) > 2 and post_code_parts[-1].strip():
+                                    st.markdown(post_code_parts[-1].strip())
+                            else:
+                                st.markdown(f"**Solution:** {a}")
 
                 
-                # Common programming languages
-                programming_languages = [
-                    "Python", "Java", "JavaScript", "C++"
-                ]
-
-                # Initialize language session state if not present
-                if 'selected_language' not in st.session_state:
-                    st.session_state.selected_language = programming_languages[0]
-                if 'prev_selected_language' not in st.session_state:
-                    st.session_state.prev_selected_language = programming_languages[0]
+                    # Common programming languages
+                    programming_languages = [
+                        "Python", "Java", "JavaScript", "C++"
+                    ]
+
+                    # Initialize language session state if not present
+                    if 'selected_language' not in st.session_state:
+                        st.session_state.selected_language = programming_languages[0]
+                    if 'prev_selected_language' not in st.session_state:
+                        st.session_state.prev_selected_language = programming_languages[0]
                 
-                st.markdown("<div style='display: flex; justify-content: flex-end; margin-bottom: 0.5em;'><span style='font-weight: 600; margin-right: 0.5em;'>Language:</span></div>", unsafe_allow_html=True)
-                selected_language = st.selectbox(
-                    "",
-                    programming_languages,
-                    index=programming_languages.index(st.session_state.get('selected_language', programming_languages[0])),
-                    key="language_selector"
-                )
+                    st.markdown("<div style='display: flex; justify-content: flex-end; margin-bottom: 0.5em;'><span style='font-weight: 600; margin-right: 0.5em;'>Language:</span></div>", unsafe_allow_html=True)
+                    selected_language = st.selectbox(
+                        "",
+                        programming_languages,
+                        index=programming_languages.index(st.session_state.get('selected_language', programming_languages[0])),
+                        key="language_selector"
+                    )
 
-                # --- Caching logic for coding problems by language ---
-                if 'coding_cache' not in st.session_state:
-                    st.session_state.coding_cache = {}
-                # Reset coding problems if language changed (but keep cache)
-                if selected_language != st.session_state.prev_selected_language:
-                    st.session_state.coding_problems = None
-                    st.session_state.selected_language = selected_language
-                    st.session_state.prev_selected_language = selected_language
-                # Generate coding problems button (only if not cached)
-                if st.button(f"🚀 Generate {selected_language} Coding Problems", type="primary"):
-                    if selected_language in st.session_state.coding_cache:
-                        st.session_state.coding_problems = st.session_state.coding_cache[selected_language]
+                    # --- Caching logic for coding problems by language ---
+                    if 'coding_cache' not in st.session_state:
+                        st.session_state.coding_cache = {}
+                    # Reset coding problems if language changed (but keep cache)
+                    if selected_language != st.session_state.prev_selected_language:
+                        st.session_state.coding_problems = None
                         st.session_state.selected_language = selected_language
                         st.session_state.prev_selected_language = selected_language
-                    else:
-                        with st.spinner(f"🔧 Generating {selected_language} coding problems..."):
+                    # Generate coding problems button (only if not cached)
+                    if st.button(f"🚀 Generate {selected_language} Coding Problems", type="primary"):
+                        if selected_language in st.session_state.coding_cache:
+                            st.session_state.coding_problems = st.session_state.coding_cache[selected_language]
+                            st.session_state.selected_language = selected_language
+                            st.session_state.prev_selected_language = selected_language
+                        else:
                             try:
-                                coding_problems = prep_generator.generate_coding_problems(
+                                coding_args = (
                                     parsed_details.get("Relevant Domain", "General"),
                                     parsed_details.get("Skills", []),
                                     parsed_details.get("Years of Experience", 0),
                                     selected_language
                                 )
+                                if LLM_STREAMING:
+                                    # Show the raw problems as they stream in, then hand over to the structured view below
+                                    stream_placeholder = st.empty()
+                                    coding_problems = render_streamed_text(
+                                        prep_generator.generate_coding_problems(*coding_args, stream=True),
+                                        stream_placeholder
+                                    )
+                                    stream_placeholder.empty()
+                                else:
+                                    with st.spinner(f"🔧 Generating {selected_language} coding problems..."):
+                                        coding_problems = prep_generator.generate_coding_problems(*coding_args)
+                                if coding_problems.startswith("Error generating content"):
+                                    raise RuntimeError(coding_problems)
                                 st.session_state.coding_problems = coding_problems
                                 st.session_state.selected_language = selected_language
                                 st.session_state.prev_selected_language = selected_language
@@ -1433,260 +4301,266 @@ if uploaded_file:
                             except Exception as e:
                                 st.error(f"Error generating coding problems: {str(e)}")
                                 st.info("Please try refreshing the page or check your OpenAI API key.")
-                # If problems are cached for current language, display them
-                if not st.session_state.get('coding_problems') and selected_language in st.session_state.coding_cache:
-                    st.session_state.coding_problems = st.session_state.coding_cache[selected_language]
-                # Display coding problems if they exist in session state and match current language
-                if st.session_state.get('coding_problems') and st.session_state.get('selected_language') == selected_language:
-                    st.success(f"✅ {selected_language} coding problems generated!")
-                    display_coding_problems(st.session_state.coding_problems, selected_language)
-                    with st.expander("💡 Interview Tips for Coding Assessment", expanded=False):
-                        st.markdown("""
-                        **🎯 What to Look For:**
-                        - **Problem Understanding**: Does candidate ask clarifying questions?
-                        - **Approach**: Can they explain their solution strategy before coding?
-                        - **Code Quality**: Clean, readable, and well-structured code
-                        - **Testing**: Do they consider edge cases and test scenarios?
-                        - **Communication**: Can they explain their thought process clearly?
+                    # If problems are cached for current language, display them
+                    if not st.session_state.get('coding_problems') and selected_language in st.session_state.coding_cache:
+                        st.session_state.coding_problems = st.session_state.coding_cache[selected_language]
+                    # Display coding problems if they exist in session state and match current language
+                    if st.session_state.get('coding_problems') and st.session_state.get('selected_language') == selected_language:
+                        st.success(f"✅ {selected_language} coding problems generated!")
+                        display_coding_problems(st.session_state.coding_problems, selected_language)
+                        with st.expander("💡 Interview Tips for Coding Assessment", expanded=False):
+                            st.markdown("""
+                            **🎯 What to Look For:**
+                            - **Problem Understanding**: Does candidate ask clarifying questions?
+                            - **Approach**: Can they explain their solution strategy before coding?
+                            - **Code Quality**: Clean, readable, and well-structured code
+                            - **Testing**: Do they consider edge cases and test scenarios?
+                            - **Communication**: Can they explain their thought process clearly?
                         
-                        **⏱️ Time Management:**
-                        - Give 15-30 minutes per problem depending on complexity
-                        - Allow candidate to choose their preferred problem if time is limited
-                        - Focus on problem-solving approach rather than perfect syntax
+                            **⏱️ Time Management:**
+                            - Give 15-30 minutes per problem depending on complexity
+                            - Allow candidate to choose their preferred problem if time is limited
+                            - Focus on problem-solving approach rather than perfect syntax
                         
-                        **🤔 Follow-up Questions:**
-                        - "How would you optimize this solution?"
-                        - "What would happen with very large inputs?"
-                        - "Can you think of alternative approaches?"
-                        """)
+                            **🤔 Follow-up Questions:**
+                            - "How would you optimize this solution?"
+                            - "What would happen with very large inputs?"
+                            - "Can you think of alternative approaches?"
+                            """)
 
-            # Feedback Tab
-            with tabs[3]:
-                # st.header("📝 Feedback")
+                # Feedback Tab
+                with tabs[3]:
+                    # st.header("📝 Feedback")
                 
-                with st.form("interview_notes"):
-                    st.markdown("###  Interview Assessment")
+                    with st.form("interview_notes"):
+                        st.markdown("###  Interview Assessment")
                     
-                    # Candidate Status Dropdown
-                    candidate_status = st.selectbox(
-                        "Candidate Status",
-                        ["L1 completed", "L2 completed", "L3 completed"],
-                        index=0,  # Default to L1
-                        help="Select the interview round/level for this candidate"
-                    )
+                        # Candidate Status Dropdown
+                        candidate_status = st.selectbox(
+                            "Candidate Status",
+                            ["L1 completed", "L2 completed", "L3 completed"],
+                            index=0,  # Default to L1
+                            help="Select the interview round/level for this candidate"
+                        )
                     
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        technical_rating = st.slider("Technical Skills (1-5)", 1, 5, 3)
-                        communication_rating = st.slider("Communication (1-5)", 1, 5, 3)
-                    with col2:
-                        problem_solving = st.slider("Problem Solving (1-5)", 1, 5, 3)
-                        culture_fit = st.slider("Culture Fit (1-5)", 1, 5, 3)
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            technical_rating = st.slider("Technical Skills (1-5)", 1, 5, 3)
+                            communication_rating = st.slider("Communication (1-5)", 1, 5, 3)
+                        with col2:
+                            problem_solving = st.slider("Problem Solving (1-5)", 1, 5, 3)
+                            culture_fit = st.slider("Culture Fit (1-5)", 1, 5, 3)
                     
-                    # Coding assessment rating
-                    coding_rating = st.slider("Coding Skills (1-5)", 1, 5, 3)
+                        # Coding assessment rating
+                        coding_rating = st.slider("Coding Skills (1-5)", 1, 5, 3)
                     
-                    # Key observations
-                    st.markdown("### 📝 Key Observations")
-                    strengths = st.text_area("Candidate Strengths:")
-                    concerns = st.text_area("Areas of Concern:")
-                    coding_feedback = st.text_area("Coding Assessment Feedback:")
+                        # Key observations
+                        st.markdown("### 📝 Key Observations")
+                        strengths = st.text_area("Candidate Strengths:")
+                        concerns = st.text_area("Areas of Concern:")
+                        coding_feedback = st.text_area("Coding Assessment Feedback:")
                     
-                    # Final Decision Score
-                    final_decision = st.slider(
-                        "Final Decision Score (1-5)",
-                        1, 5, 3,
-                        help="Rate your overall final decision for this candidate"
-                    )
+                        # Final Decision Score
+                        final_decision = st.slider(
+                            "Final Decision Score (1-5)",
+                            1, 5, 3,
+                            help="Rate your overall final decision for this candidate"
+                        )
                     
-                    # Additional Notes
-                    additional_notes = st.text_area("Additional Notes:")
+                        # Additional Notes
+                        additional_notes = st.text_area("Additional Notes:")
         
                     
-                    if st.form_submit_button("💾 Save Interview Assessment", type="primary"):
-                        try:
-                            assessment_data = {
-                                "candidate_id": candidate_id,
-                                "candidate_name": parsed_details.get('Full Name', 'Unknown'),
-                                "candidate_status": candidate_status,  # Add the candidate status here
-                                "ratings": {
-                                    "technical": technical_rating,
-                                    "communication": communication_rating,
-                                    "problem_solving": problem_solving,
-                                    "culture_fit": culture_fit,
-                                    "coding": coding_rating
-                                },
-                                "strengths": strengths,
-                                "concerns": concerns,
-                                "coding_feedback": coding_feedback,
-                                "decision": final_decision,
-                                "notes": additional_notes,
-                                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            }
-
-                            # LLM judge metrics for key feedback (use coding_feedback, strengths, or concerns)
-                            llm_metrics = None
+                        if st.form_submit_button("💾 Save Interview Assessment", type="primary"):
                             try:
-                                judge_text = coding_feedback if coding_feedback.strip() else (strengths + "\n" + concerns)
-                                if judge_text.strip():
-                                    if 'prep_generator' not in locals():
-                                        prep_generator = InterviewerPrepGenerator()
-                                    llm_metrics = prep_generator.judge_answer_llm(judge_text)
-                            except Exception as e:
-                                llm_metrics = {"error": str(e)}
-                            assessment_data["llm_metrics"] = llm_metrics
+                                assessment_data = {
+                                    "candidate_id": candidate_id,
+                                    "candidate_name": parsed_details.get('Full Name', 'Unknown'),
+                                    "candidate_status": candidate_status,  # Add the candidate status here
+                                    "ratings": {
+                                        "technical": technical_rating,
+                                        "communication": communication_rating,
+                                        "problem_solving": problem_solving,
+                                        "culture_fit": culture_fit,
+                                        "coding": coding_rating
+                                    },
+                                    "strengths": strengths,
+                                    "concerns": concerns,
+                                    "coding_feedback": coding_feedback,
+                                    "decision": final_decision,
+                                    "notes": additional_notes,
+                                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                                }
 
-                            # LLM self-evaluation metrics for all LLM-generated content
-                            llm_self_evaluation = None
-                            try:
-                                llm_outputs = {}
-                                # Aggregate LLM-generated outputs for this candidate/session
-                                if 'brief' in locals() and brief:
-                                    llm_outputs['Quick Brief'] = brief
-                                if 'questions' in locals() and questions:
-                                    llm_outputs['Q&A'] = '\n'.join([f"Q: {q}\nA: {a}" for q, a in questions])
-                                if 'coding_problems' in locals() and coding_problems:
-                                    llm_outputs['Coding'] = '\n'.join([f"{q}\n{a}" for q, a in coding_problems])
-                                # Add more LLM outputs as needed
-                                if llm_outputs:
-                                    if 'prep_generator' not in locals():
-                                        prep_generator = InterviewerPrepGenerator()
-                                    llm_self_evaluation = prep_generator.judge_llm_self_evaluation(llm_outputs)
-                            except Exception as e:
-                                llm_self_evaluation = {"error": str(e)}
-                            assessment_data["llm_self_evaluation"] = llm_self_evaluation
-
-                            # Save to S3
-                            success, message = save_feedback_to_s3(assessment_data)
-                            if success:
-                                st.success("✅ " + message)
-                                # Also keep local copy in session state
+                                # LLM judge metrics for key feedback (use coding_feedback, strengths, or concerns)
+                                llm_metrics = None
+                                try:
+                                    judge_text = coding_feedback if coding_feedback.strip() else (strengths + "\n" + concerns)
+                                    if judge_text.strip():
+                                        if 'prep_generator' not in locals():
+                                            prep_generator = InterviewerPrepGenerator()
+                                        llm_metrics = prep_generator.judge_answer_llm(judge_text)
+                                except Exception as e:
+                                    llm_metrics = {"error": str(e)}
+                                assessment_data["llm_metrics"] = llm_metrics
+
+                                # LLM self-evaluation metrics for all LLM-generated content
+                                llm_self_evaluation = None
+                                try:
+                                    llm_outputs = {}
+                                    # Aggregate LLM-generated outputs for this candidate/session
+                                    if 'brief' in locals() and brief:
+                                        llm_outputs['Quick Brief'] = brief
+                                    if 'questions' in locals() and questions:
+                                        llm_outputs['Q&A'] = '\n'.join([f"Q: {q}\nA: {a}" for q, a in questions if a is not None])
+                                    if 'coding_problems' in locals() and coding_problems:
+                                        llm_outputs['Coding'] = '\n'.join([f"{q}\n{a}" for q, a in coding_problems if a is not None])
+                                    # Add more LLM outputs as needed
+                                    if llm_outputs:
+                                        if 'prep_generator' not in locals():
+                                            prep_generator = InterviewerPrepGenerator()
+                                        llm_self_evaluation = prep_generator.judge_llm_self_evaluation(llm_outputs)
+                                except Exception as e:
+                                    llm_self_evaluation = {"error": str(e)}
+                                assessment_data["llm_self_evaluation"] = llm_self_evaluation
+
+                                # Save to S3
+                                success, message = save_feedback_to_s3(assessment_data)
+                                if success:
+                                    st.success("✅ " + message)
+                                    # The candidate's feedback status changed, so the cached pipeline result is stale
+                                    get_resume_pipeline_cache().invalidate(resume_hash)
+                                    # Also keep local copy in session state
+                                    if 'interview_assessments' not in st.session_state:
+                                        st.session_state.interview_assessments = []
+                                    st.session_state.interview_assessments.append(assessment_data)
+                                else:
+                                    st.error("❌ " + message)
+                            
+                                # Save to session state (since we're using in-memory storage)
                                 if 'interview_assessments' not in st.session_state:
                                     st.session_state.interview_assessments = []
-                                st.session_state.interview_assessments.append(assessment_data)
-                            else:
-                                st.error("❌ " + message)
                             
-                            # Save to session state (since we're using in-memory storage)
-                            if 'interview_assessments' not in st.session_state:
-                                st.session_state.interview_assessments = []
+                                st.session_state.interview_assessments.append(assessment_data)
                             
-                            st.session_state.interview_assessments.append(assessment_data)
+                                # Auto-update status based on decision
+                                status_mapping = {
+                                    "Strong Hire": "Offered",
+                                    "Hire": "L3 Cleared", 
+                                    "Maybe": "On Hold",
+                                    "No Hire": "Rejected",
+                                    "Strong No Hire": "Rejected"
+                                }
                             
-                            # Auto-update status based on decision
-                            status_mapping = {
-                                "Strong Hire": "Offered",
-                                "Hire": "L3 Cleared", 
-                                "Maybe": "On Hold",
-                                "No Hire": "Rejected",
-                                "Strong No Hire": "Rejected"
-                            }
+                                new_status = status_mapping.get(final_decision, "Ready for Evaluation")
+                                update_candidate_status(candidate_id, new_status, f"Assessment completed: {final_decision}")
                             
-                            new_status = status_mapping.get(final_decision, "Ready for Evaluation")
-                            update_candidate_status(candidate_id, new_status, f"Assessment completed: {final_decision}")
+                                st.success("📝 Interview assessment saved!")
+                                # st.balloons()
                             
-                            st.success("📝 Interview assessment saved!")
-                            # st.balloons()
+                                # Display summary
+                                avg_rating = (technical_rating + communication_rating + problem_solving + culture_fit + coding_rating) / 5
+                                st.markdown(f"""
+                                <div class="success-box">
+                                    <h4>📊 Assessment Summary</h4>
+                                    <p><strong>Overall Rating:</strong> {avg_rating:.1f}/10</p>
+                                    <p><strong>Recommendation:</strong> {final_decision}</p>
+                                    <p><strong>Status Updated:</strong> {new_status}</p>
+                                    <p><strong>Assessed on:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+                                </div>
+                                """, unsafe_allow_html=True)
                             
-                            # Display summary
-                            avg_rating = (technical_rating + communication_rating + problem_solving + culture_fit + coding_rating) / 5
-                            st.markdown(f"""
-                            <div class="success-box">
-                                <h4>📊 Assessment Summary</h4>
-                                <p><strong>Overall Rating:</strong> {avg_rating:.1f}/10</p>
-                                <p><strong>Recommendation:</strong> {final_decision}</p>
-                                <p><strong>Status Updated:</strong> {new_status}</p>
-                                <p><strong>Assessed on:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                        except Exception as e:
-                            st.error(f"Error saving assessment: {str(e)}")
+                            except Exception as e:
+                                st.error(f"Error saving assessment: {str(e)}")
 
-        else:
-            st.error(f"❌ {parsed_details.get('error', 'Unable to parse resume')}")
-            st.info("💡 Please ensure the resume is clear and contains readable text")
+            else:
+                st.error(f"❌ {parsed_details.get('error', 'Unable to parse resume')}")
+                st.info("💡 Please ensure the resume is clear and contains readable text")
 
-    else:
-        st.error("❌ Could not extract text from the resume")
+        else:
+            st.error("❌ Could not extract text from the resume")
 
-# Add a section to view saved assessments
-# Add a section to view saved assessments
-if 'interview_assessments' in st.session_state and st.session_state.interview_assessments:
-    with st.expander("📊 View Saved Assessments", expanded=False):
-        st.subheader("Previous Interview Assessments")
+    # Add a section to view saved assessments
+    # Add a section to view saved assessments
+    if 'interview_assessments' in st.session_state and st.session_state.interview_assessments:
+        with st.expander("📊 View Saved Assessments", expanded=False):
+            st.subheader("Previous Interview Assessments")
         
-        for i, assessment in enumerate(reversed(st.session_state.interview_assessments)):
-            with st.container():
-                col1, col2, col3 = st.columns([2, 1, 1])
+            for i, assessment in enumerate(reversed(st.session_state.interview_assessments)):
+                with st.container():
+                    col1, col2, col3 = st.columns([2, 1, 1])
                 
-                with col1:
-                    st.markdown(f"**{assessment['candidate_name']}**")
-                    st.markdown(f"*{assessment['timestamp']}*")
+                    with col1:
+                        st.markdown(f"**{assessment['candidate_name']}**")
+                        st.markdown(f"*{assessment['timestamp']}*")
                 
-                with col2:
-                    avg_rating = sum(assessment['ratings'].values()) / len(assessment['ratings'])
-                    st.metric("Overall Rating", f"{avg_rating:.1f}/10")
+                    with col2:
+                        avg_rating = sum(assessment['ratings'].values()) / len(assessment['ratings'])
+                        st.metric("Overall Rating", f"{avg_rating:.1f}/10")
                 
-                with col3:
-                    decision_color = {
-                        "Strong Hire": "🟢",
-                        "Hire": "🟢", 
-                        "Maybe": "🟡",
-                        "No Hire": "🔴",
-                        "Strong No Hire": "🔴"
-                    }
-                    st.markdown(f"{decision_color.get(assessment['decision'], '⚪')} {assessment['decision']}")
+                    with col3:
+                        decision_color = {
+                            "Strong Hire": "🟢",
+                            "Hire": "🟢", 
+                            "Maybe": "🟡",
+                            "No Hire": "🔴",
+                            "Strong No Hire": "🔴"
+                        }
+                        st.markdown(f"{decision_color.get(assessment['decision'], '⚪')} {assessment['decision']}")
                 
-                if st.button(f"View Details", key=f"view_{i}"):
-                    st.json(assessment)
-                # LLM Metrics Tab
-            with tabs[4]:  # 5th tab (0-indexed)
-                st.markdown("### 🔍 LLM Self-Evaluation Metrics")
-                st.markdown("*Automatically generated evaluation of the LLM's own responses for this candidate*")
+                    if st.button(f"View Details", key=f"view_{i}"):
+                        st.json(assessment)
+                    # LLM Metrics Tab
+                with tabs[4]:  # 5th tab (0-indexed)
+                    st.markdown("### 🔍 LLM Self-Evaluation Metrics")
+                    st.markdown("*Automatically generated evaluation of the LLM's own responses for this candidate*")
                     
-                if assessment.get("llm_self_evaluation"):
-                    llm_self_evaluation = assessment["llm_self_evaluation"]
-                    if isinstance(llm_self_evaluation, dict):
-                        # Display metrics in a grid
-                        cols = st.columns(4)
-                        for (metric, score), col in zip(llm_self_evaluation.items(), cols):
-                            with col:
-                                st.metric(
-                                    label=metric,
-                                    value=score,
-                                    help=f"LLM self-evaluation of {metric.lower()} (1-5 scale)"
-                                )
+                    if assessment.get("llm_self_evaluation"):
+                        llm_self_evaluation = assessment["llm_self_evaluation"]
+                        if isinstance(llm_self_evaluation, dict):
+                            # Display metrics in a grid
+                            cols = st.columns(4)
+                            for (metric, score), col in zip(llm_self_evaluation.items(), cols):
+                                with col:
+                                    st.metric(
+                                        label=metric,
+                                        value=score,
+                                        help=f"LLM self-evaluation of {metric.lower()} (1-5 scale)"
+                                    )
                             
-                            # Add a small visualization (only if plotly is available)
-                            # ... (commented plotly code)
+                                # Add a small visualization (only if plotly is available)
+                                # ... (commented plotly code)
                             
+                        else:
+                            st.warning("Could not parse LLM self-evaluation metrics.")
+                            st.json(llm_self_evaluation)
                     else:
-                        st.warning("Could not parse LLM self-evaluation metrics.")
-                        st.json(llm_self_evaluation)
-                else:
-                    st.info("No LLM self-evaluation metrics available for this assessment.")
+                        st.info("No LLM self-evaluation metrics available for this assessment.")
                         
-                # Add explanation about what these metrics mean
-                with st.expander("ℹ️ About these metrics"):
-                    st.markdown("""
-                    These metrics are generated by the LLM itself, evaluating the quality of its own responses:
+                    # Add explanation about what these metrics mean
+                    with st.expander("ℹ️ About these metrics"):
+                        st.markdown("""
+                        These metrics are generated by the LLM itself, evaluating the quality of its own responses:
                     
-                    - **Accuracy**: How factually correct and reliable the LLM's responses were
-                    - **Helpfulness**: How useful and actionable the information provided was
-                    - **Relevance**: How well the responses matched the candidate's background and role
-                    - **Clarity**: How clear and easy to understand the responses were
+                        - **Accuracy**: How factually correct and reliable the LLM's responses were
+                        - **Helpfulness**: How useful and actionable the information provided was
+                        - **Relevance**: How well the responses matched the candidate's background and role
+                        - **Clarity**: How clear and easy to understand the responses were
                     
-                    All scores are on a 1-5 scale, with 5 being the best possible score.
-                    """)
-                st.divider()
-
-
-# Simple footer
-st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: #666; padding: 1rem;'>
-    <p>🎯 Quick Interview Prep Tool | Get questions with answers + coding problems + status tracking</p>
-    <p><small>Supports both file upload and AWS S3 integration with Kanban-style interview pipeline</small></p>
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+                        All scores are on a 1-5 scale, with 5 being the best possible score.
+                        """)
+                    st.divider()
+
+
+    # Simple footer
+    st.markdown("---")
+    st.markdown("""
+    <div style='text-align: center; color: #666; padding: 1rem;'>
+        <p>🎯 Quick Interview Prep Tool | Get questions with answers + coding problems + status tracking</p>
+        <p><small>Supports both file upload and AWS S3 integration with Kanban-style interview pipeline</small></p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+if __name__ == "__main__":
+    main()
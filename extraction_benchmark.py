@@ -0,0 +1,146 @@
+"""Compare the installed PDF text extraction backends on a local corpus of resumes.
+
+Each backend runs in its own fresh process so peak memory is measured per engine.
+Reports pages/sec, peak RSS and Python heap, failures, and how much each backend's
+output length differs from the reference backend per resume. Use it to pick
+PDF_BACKEND for the app.
+
+Usage:
+    python extraction_benchmark.py --path ./resumes
+    python extraction_benchmark.py --path ./resumes --backends pypdf2,pypdfium2 --repeat 3 --json results.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import pdf_extraction
+
+
+def find_pdfs(path):
+    pdfs = []
+    for root, _, files in os.walk(path):
+        pdfs.extend(os.path.join(root, filename) for filename in files if filename.lower().endswith('.pdf'))
+    return sorted(pdfs)
+
+
+def run_backend(backend, paths, repeat):
+    """Process entry point: extract the corpus `repeat` times with one backend"""
+    baseline_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    pages = 0
+    seconds = 0.0
+    lengths = {}
+    errors = {}
+    for _ in range(repeat):
+        for path in paths:
+            with open(path, "rb") as f:
+                started = time.perf_counter()
+                try:
+                    extraction = pdf_extraction.extract_pdf_pages(f, backend=backend)
+                except Exception as e:
+                    errors[path] = str(e)
+                    continue
+                seconds += time.perf_counter() - started
+            pages += len(extraction["page_seconds"])  # skipped (image-only) pages were still read
+            lengths[path] = len(pdf_extraction.join_page_texts(extraction["pages"]) or "")
+    _, peak_heap = tracemalloc.get_traced_memory()
+    return {
+        "backend": backend,
+        "version": pdf_extraction.backend_version(backend),
+        "pages": pages,
+        "seconds": seconds,
+        "lengths": lengths,
+        "errors": errors,
+        # ru_maxrss is in KiB on Linux; native engines allocate outside tracemalloc's view
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "rss_growth_mb": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss_kb) / 1024, 1),
+        "peak_python_heap_mb": round(peak_heap / 1048576, 1)
+    }
+
+
+def compare_lengths(result, reference):
+    """How far a backend's output lengths are from the reference backend's, per resume"""
+    shared = [path for path in result["lengths"] if path in reference["lengths"]]
+    diffs = []
+    for path in shared:
+        ours, theirs = result["lengths"][path], reference["lengths"][path]
+        diffs.append((abs(ours - theirs) / max(theirs, 1), path, ours, theirs))
+    diffs.sort(reverse=True)
+    return {
+        "reference": reference["backend"],
+        "compared": len(shared),
+        "total_chars": sum(result["lengths"][path] for path in shared),
+        "reference_chars": sum(reference["lengths"][path] for path in shared),
+        "mean_abs_diff_pct": round(sum(diff for diff, *_ in diffs) / len(diffs) * 100, 1) if diffs else 0.0,
+        "over_10_pct": sum(1 for diff, *_ in diffs if diff > 0.10),
+        "empty": sum(1 for path in shared if result["lengths"][path] == 0),
+        "largest": [
+            {"file": os.path.basename(path), "chars": ours, "reference_chars": theirs}
+            for diff, path, ours, theirs in diffs[:5] if diff > 0
+        ]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the installed PDF extraction backends on local resumes")
+    parser.add_argument("--path", required=True, help="Directory of PDF resumes")
+    parser.add_argument("--backends", default=",".join(pdf_extraction.available_backends()), help="Comma-separated backends (default: all installed)")
+    parser.add_argument("--reference", default="pypdf2", help="Backend the output lengths are compared against")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per backend")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    missing = [backend for backend in backends + [args.reference] if backend not in pdf_extraction.available_backends()]
+    if missing:
+        parser.error(f"not installed: {', '.join(sorted(set(missing)))} (installed: {', '.join(pdf_extraction.available_backends())})")
+    if args.reference not in backends:
+        backends.append(args.reference)
+    paths = find_pdfs(args.path)
+    if not paths:
+        parser.error(f"no PDFs found under {args.path}")
+    print(f"Benchmarking {', '.join(backends)} on {len(paths)} PDFs x {args.repeat}")
+
+    results = {}
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results[backend] = pool.submit(run_backend, backend, paths, args.repeat).result()
+
+    summary = []
+    for backend in backends:
+        result = results[backend]
+        row = {
+            "backend": result["version"],
+            "pages": result["pages"],
+            "seconds": round(result["seconds"], 3),
+            "pages_per_sec": round(result["pages"] / result["seconds"], 1) if result["seconds"] else 0.0,
+            "peak_rss_mb": result["peak_rss_mb"],
+            "rss_growth_mb": result["rss_growth_mb"],
+            "peak_python_heap_mb": result["peak_python_heap_mb"],
+            "failed": len(result["errors"]),
+            "output_length": compare_lengths(result, results[args.reference])
+        }
+        summary.append(row)
+        print(
+            f"{row['backend']:<24} {row['pages_per_sec']:>9.1f} pages/s  peak RSS {row['peak_rss_mb']:>7.1f} MB "
+            f"(+{row['rss_growth_mb']:.1f})  {row['failed']} failed  "
+            f"length vs {args.reference}: {row['output_length']['mean_abs_diff_pct']}% mean diff, "
+            f"{row['output_length']['over_10_pct']} resumes >10%"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    print("\nBenchmark results:")
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
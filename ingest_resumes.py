@@ -0,0 +1,96 @@
+"""Stream resumes from S3 into candidate profiles.
+
+Syncs the S3_BUCKET_NAME bucket's resume catalog (a no-op while it is fresh)
+and pushes each PDF through download -> text extraction -> parsing ->
+save_candidate_profile, with its own workers per stage and small bounded
+queues in between. A slow stage (usually the LLM parse) backs up its queue and
+throttles the stages before it, so memory stays flat however many resumes the
+bucket holds.
+
+Per-stage throughput, queue occupancy and time spent blocked on the next stage
+are printed while it runs; the stage with a full input queue and busy workers
+is the bottleneck to give more workers.
+
+Usage:
+    python ingest_resumes.py --prefix resumes/
+    python ingest_resumes.py --limit 200 --parse-workers 4 --output candidates.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+
+import domain_qa
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream S3 resumes into candidate profiles")
+    parser.add_argument("--bucket", default=os.getenv('S3_BUCKET_NAME', 'resumefolderbucket'), help="S3 bucket (default: S3_BUCKET_NAME)")
+    parser.add_argument("--prefix", default="", help="Only ingest S3 keys under this prefix")
+    parser.add_argument("--limit", type=int, help="Stop after the first N resumes listed")
+    parser.add_argument("--download-workers", type=int, default=domain_qa.INGEST_DOWNLOAD_WORKERS, help="Concurrent S3 downloads")
+    parser.add_argument("--extract-workers", type=int, default=domain_qa.INGEST_EXTRACT_WORKERS, help="Resumes extracted at once")
+    parser.add_argument("--parse-workers", type=int, default=domain_qa.INGEST_PARSE_WORKERS, help="Resumes sent through the parser at once")
+    parser.add_argument("--queue-size", type=int, default=domain_qa.INGEST_QUEUE_SIZE, help="Resumes allowed to wait in front of each stage")
+    parser.add_argument("--output", default="candidates.jsonl", help="Write one JSON candidate record per line here")
+    parser.add_argument("--stats-interval", type=float, default=5.0, help="Seconds between progress reports (0 to disable)")
+    args = parser.parse_args(argv)
+
+    # S3 helpers read the bucket from the environment
+    os.environ['S3_BUCKET_NAME'] = args.bucket
+    source = domain_qa.iter_s3_resumes(args.bucket, args.prefix)
+    if args.limit:
+        source = itertools.islice(source, args.limit)
+    pipeline = domain_qa.build_ingestion_pipeline(
+        source,
+        download_workers=args.download_workers,
+        extract_workers=args.extract_workers,
+        parse_workers=args.parse_workers,
+        queue_size=args.queue_size
+    )
+
+    finished = threading.Event()
+
+    def monitor():
+        while not finished.wait(args.stats_interval):
+            stats = pipeline.stats()
+            print(f"\n[{stats['elapsed_seconds']}s]")
+            print(domain_qa.format_pipeline_stats(stats))
+
+    if args.stats_interval > 0:
+        threading.Thread(target=monitor, daemon=True).start()
+
+    usage_before = domain_qa.llm_usage.snapshot()
+    ingested = 0
+    try:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for record in pipeline.run():
+                ingested += 1
+                f.write(json.dumps(record, default=str) + "\n")
+                print(f"[{ingested}] #{record['candidate_id']} {record['candidate_name'] or '(no name)'} <- {record['key']} ({record['parse_mode']})")
+    finally:
+        finished.set()
+
+    stats = pipeline.stats()
+    usage_after = domain_qa.llm_usage.snapshot()
+    failed = sum(stage["failed"] for stage in stats["stages"])
+    summary = {
+        "ingested": ingested,
+        "failed": failed,
+        "resumes_per_min": round(ingested / stats["elapsed_seconds"] * 60, 2) if stats["elapsed_seconds"] else 0.0,
+        "pipeline": stats,
+        "llm_requests": usage_after["requests"] - usage_before["requests"],
+        "tokens": usage_after["total_tokens"] - usage_before["total_tokens"],
+        "s3": domain_qa.s3_call_stats.snapshot()
+    }
+    print("\nStage stats:")
+    print(domain_qa.format_pipeline_stats(stats))
+    print("\nIngestion summary:")
+    print(json.dumps(summary, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""Single-pass PDF text extraction with pluggable backends, spreading the pages of large documents over a process pool.
+
+Extraction reads pages front to back and can stop early once a page, character or
+token budget is used up; pages without any font resources (scans, photos) are
+skipped without running the text extractor.
+
+Backends: "pypdf2" (always available), "pypdfium2" and "pdfminer" (pdfminer.six) when
+installed. Kept out of domain_qa.py so pool workers can import it without the
+Streamlit app: functions defined in a script run by `streamlit run` can't be
+pickled to another process.
+"""
+import importlib.metadata
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyPDF2 import PdfReader
+
+try:
+    import pypdfium2
+except ImportError:  # optional: much faster native extraction
+    pypdfium2 = None
+
+try:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+except ImportError:  # optional: layout-aware extraction for multi-column resumes
+    PDFDocument = None
+
+
+def _may_contain_text(resources, get):
+    """False only for pages that can't draw text: no fonts, and no form XObjects that could carry their own"""
+    if not resources:
+        return False
+    if get(resources, "Font") is not None:
+        return True
+    xobjects = get(resources, "XObject") or {}
+    # PyPDF2 gives NameObject("/Image"), pdfminer PSLiteral("Image")
+    subtypes = (get(xobjects[name], "Subtype") for name in xobjects)
+    return any(str(getattr(subtype, "name", subtype)).lstrip("/") != "Image" for subtype in subtypes)
+
+
+class PyPDF2Document:
+    def __init__(self, source):
+        self.reader = PdfReader(source)
+        self.page_count = len(self.reader.pages)
+
+    def has_text(self, index):
+        def get(obj, key):
+            value = obj.get_object().get(f"/{key}")
+            return value.get_object() if value is not None else None
+        return _may_contain_text(get(self.reader.pages[index], "Resources"), get)
+
+    def page_text(self, index):
+        return self.reader.pages[index].extract_text()
+
+
+class PdfiumDocument:
+    def __init__(self, source):
+        self.pdf = pypdfium2.PdfDocument(_read_bytes(source))
+        self.page_count = len(self.pdf)
+
+    def has_text(self, index):
+        return True  # pdfium's text extraction of an image-only page is already nearly free
+
+    def page_text(self, index):
+        page = self.pdf[index]
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range().replace("\r\n", "\n")
+        finally:
+            textpage.close()
+            page.close()
+
+
+class PdfminerDocument:
+    def __init__(self, source):
+        self.resources = PDFResourceManager()
+        self.pages = list(PDFPage.create_pages(PDFDocument(PDFParser(io.BytesIO(_read_bytes(source))))))
+        self.page_count = len(self.pages)
+
+    def has_text(self, index):
+        return _may_contain_text(resolve1(self.pages[index].resources), lambda obj, key: resolve1(resolve1(obj).get(key)))
+
+    def page_text(self, index):
+        output = io.StringIO()
+        device = TextConverter(self.resources, output, laparams=LAParams())
+        try:
+            PDFPageInterpreter(self.resources, device).process_page(self.pages[index])
+        finally:
+            device.close()
+        return output.getvalue().rstrip("\x0c")
+
+
+# Preference order for PDF_BACKEND=auto: fastest first
+BACKENDS = {
+    "pypdfium2": (PdfiumDocument, "pypdfium2", pypdfium2 is not None),
+    "pypdf2": (PyPDF2Document, "PyPDF2", True),
+    "pdfminer": (PdfminerDocument, "pdfminer.six", PDFDocument is not None)
+}
+
+
+def available_backends():
+    return [name for name, (_, _, available) in BACKENDS.items() if available]
+
+
+def resolve_backend(name="auto"):
+    """Backend name to use for a PDF_BACKEND setting; unknown or missing backends fall back to auto"""
+    name = (name or "auto").lower()
+    if name != "auto" and name not in available_backends():
+        print(f"PDF backend '{name}' is not available (installed: {', '.join(available_backends())}); choosing automatically")
+        name = "auto"
+    return available_backends()[0] if name == "auto" else name
+
+
+def backend_version(name):
+    """Backend name plus the installed package version, for extraction cache keys"""
+    return f"{name} {importlib.metadata.version(BACKENDS[name][1])}"
+
+
+def open_document(source, backend="pypdf2"):
+    return BACKENDS[backend][0](source)
+
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    source.seek(0)
+    return source.read()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool(workers):
+    """Process pool shared by all extractions; workers are spawned so they never inherit app threads"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def discard_extraction_pool(pool):
+    """Drop a broken pool so the next extraction spawns a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ExtractionBudget:
+    """Character and token allowance for one document; a limit of None or 0 means unlimited"""
+
+    def __init__(self, max_chars=None, max_tokens=None, count_tokens=None):
+        self.max_chars = max_chars or None
+        self.max_tokens = max_tokens or None
+        self.count_tokens = count_tokens or (lambda text: len(text) // 4)
+        self.chars = 0
+        self.tokens = 0
+        self.stopped_by = None
+
+    def add(self, text):
+        """Count a page's text; True once the budget is used up"""
+        if text:
+            self.chars += len(text)
+            if self.max_tokens:
+                self.tokens += self.count_tokens(text)
+        if self.max_chars and self.chars >= self.max_chars:
+            self.stopped_by = "chars"
+        elif self.max_tokens and self.tokens >= self.max_tokens:
+            self.stopped_by = "tokens"
+        return self.stopped_by is not None
+
+
+def _extract_pages(document, start, stop, budget=None):
+    results = []
+    for index in range(start, stop):
+        started = time.perf_counter()
+        # None marks a page skipped for having no text layer
+        text = document.page_text(index) if document.has_text(index) else None
+        results.append((index, text, time.perf_counter() - started))
+        if budget is not None and budget.add(text):
+            break
+    return results
+
+
+def extract_page_range(pdf_bytes, start, stop, backend="pypdf2"):
+    """Pool entry point: (page index, text or None if skipped, seconds) for pages start..stop-1 of a PDF"""
+    return _extract_pages(open_document(io.BytesIO(pdf_bytes), backend), start, stop)
+
+
+def extract_pdf_pages(file, parallel_min_pages=None, workers=None, backend="pypdf2",
+                      max_pages=None, max_chars=None, max_tokens=None, count_tokens=None):
+    """Extract each page's text exactly once, front to back, stopping once a page/char/token budget is used up.
+
+    Documents with at least parallel_min_pages pages (within the page budget)
+    use the process pool; their char/token budget is applied to the results.
+    Returns {"pages", "page_numbers", "page_seconds", "skipped_pages",
+    "page_count", "truncated", "stopped_by", "seconds", "workers", "backend"};
+    raises on unreadable PDFs.
+    """
+    started = time.perf_counter()
+    document = open_document(file, backend)
+    page_count = document.page_count
+    budget = ExtractionBudget(max_chars, max_tokens, count_tokens)
+    stop = min(page_count, max_pages) if max_pages else page_count
+    workers = max(1, min(workers or os.cpu_count() or 1, stop))
+    if parallel_min_pages is None or stop < parallel_min_pages or workers == 1:
+        results = _extract_pages(document, 0, stop, budget)
+        workers = 1
+    else:
+        pdf_bytes = _read_bytes(file)
+        # Contiguous page ranges, one per worker, so each process parses the PDF once
+        bounds = [stop * i // workers for i in range(workers + 1)]
+        pool = get_extraction_pool(workers)
+        results = []
+        futures = []
+        try:
+            futures = [pool.submit(extract_page_range, pdf_bytes, start, end, backend) for start, end in zip(bounds, bounds[1:])]
+            for result in (result for future in futures for result in future.result()):
+                results.append(result)
+                if budget.add(result[1]):
+                    break
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM-killed on a hostile PDF); replace the pool and read this one here
+            print(f"PDF extraction pool broke ({e}); retrying this document on 1 worker")
+            discard_extraction_pool(pool)
+            budget = ExtractionBudget(max_chars, max_tokens, count_tokens)
+            results = _extract_pages(document, 0, stop, budget)
+            workers = 1
+        finally:
+            # Ranges past the budget that haven't started yet are never read
+            for future in futures:
+                future.cancel()
+
+    pages_read = len(results)
+    stopped_by = budget.stopped_by if pages_read < page_count else None
+    if stopped_by is None and pages_read < page_count:
+        stopped_by = "pages"
+    return {
+        "pages": [text for _, text, _ in results if text is not None],
+        "page_numbers": [index for index, text, _ in results if text is not None],
+        "page_seconds": [seconds for _, _, seconds in results],
+        "skipped_pages": [index for index, text, _ in results if text is None],
+        "page_count": page_count,
+        "truncated": pages_read < page_count,
+        "stopped_by": stopped_by,
+        "seconds": time.perf_counter() - started,
+        "workers": workers,
+        "backend": backend
+    }
+
+
+def join_page_texts(pages):
+    """The document text: non-empty pages joined by newlines, or None if there is none"""
+    text = "\n".join(page for page in pages if page)
+    return text.strip() if text else None
@@ -0,0 +1,298 @@
+"""Offline benchmark of the S3 storage paths against an in-process S3 emulator.
+
+Seeds a moto-backed S3 with synthetic PDF resumes and a feedback history of each
+requested size, then times the storage operations the app depends on:
+
+    list_resumes      list_s3_resumes (full re-list, and served from the catalog)
+    open_resume       open_resume_from_s3 (cold download, and disk-cache hit)
+    status_lookup     check_candidate_status_in_s3_csv (cold index, revalidated, in memory)
+    save_feedback     save_feedback_to_s3 with 1..N concurrent writers, per storage mode
+
+Every result reports p50/p95/p99 latency, throughput and the S3 requests and bytes
+sent/received per call. Saves also report lost rows: concurrent read-modify-write
+saves in "xlsx" mode overwrite each other, "append" saves must never lose one.
+Failed calls are counted as errors rather than aborting the run (moto itself can
+fail overlapping PUTs of the same key, which real S3 resolves as last writer wins).
+
+Usage:
+    python storage_benchmark.py
+    python storage_benchmark.py --rows 1000,100000,500000 --writers 1,4,16 --modes append
+    python storage_benchmark.py --json results.json
+
+Requires moto (pip install "moto[s3]"); no AWS account or network access is used.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+try:
+    from moto import mock_aws
+except ImportError:  # optional: only this benchmark needs it
+    mock_aws = None
+
+RESUME_BUCKET = "benchmark-resumes"
+FEEDBACK_BUCKET = "benchmark-feedback"
+
+
+def synthetic_resume_pdf(index, pages=2):
+    """A small text PDF that the extractor and local parser can read"""
+    page_texts = [
+        f"Candidate {index:06d}\nSenior Python Developer\nhttps://github.com/candidate{index}\n"
+        f"Skills: Python, AWS, Docker, Kubernetes, SQL\nExperience Jan 2018 - Dec 2023"
+    ] + [f"Project {index}-{page}\nBuilt data pipelines and REST APIs" for page in range(1, pages)]
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page, text in enumerate(page_texts):
+        page_id = 4 + 2 * page
+        kids.append(f"{page_id} 0 R")
+        lines = " ".join(f"({line}) Tj T*" for line in text.replace("(", "").replace(")", "").split("\n"))
+        stream = f"BT /F1 11 Tf 50 750 Td 14 TL {lines} ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode())
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+def synthetic_feedback_frame(domain_qa, rows, candidates):
+    """A feedback history of `rows` assessments spread over `candidates` candidates"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(rows)
+    candidate_ids = rng.integers(0, candidates, rows)
+    start = datetime(2024, 1, 1)
+    df = pd.DataFrame({
+        'candidate_id': [f"cand_{i:06d}" for i in candidate_ids],
+        'candidate_name': [f"Candidate {i:06d}" for i in candidate_ids],
+        'candidate_status': rng.choice(domain_qa.INTERVIEW_STATUSES, rows),
+        'timestamp': [(start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S") for i in range(rows)],
+        'strengths': "Solid fundamentals, clear communication",
+        'concerns': "Limited system design depth",
+        'coding_feedback': "Working solution, some edge cases missed",
+        'decision': rng.choice(list(domain_qa.DECISION_SCORES), rows),
+        'notes': ""
+    })
+    for column in domain_qa.FEEDBACK_RATING_COLUMNS:
+        df[column] = rng.integers(1, 6, rows)
+    return df[domain_qa.FEEDBACK_COLUMNS]
+
+
+def synthetic_assessment(writer, index):
+    return {
+        'candidate_id': f"bench_{writer}_{index}",
+        'candidate_name': f"Benchmark Writer{writer} Save{index}",
+        'candidate_status': "L1 Scheduled",
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'ratings': {'technical': 4, 'communication': 3, 'problem_solving': 4, 'culture_fit': 5, 'coding': 3},
+        'strengths': "Benchmark", 'concerns': "", 'coding_feedback': "", 'decision': "Hire", 'notes': ""
+    }
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(name, latencies, errors, elapsed, s3_before, s3_after, **extra):
+    """Latency percentiles plus S3 requests/bytes per call for one benchmarked operation"""
+    calls = len(latencies)
+    latencies = sorted(latencies)
+    requests = {
+        operation: stats["calls"] - s3_before.get(operation, {}).get("calls", 0)
+        for operation, stats in s3_after.items()
+        if stats["calls"] != s3_before.get(operation, {}).get("calls", 0)
+    }
+    sent = sum(stats["bytes_sent"] - s3_before.get(operation, {}).get("bytes_sent", 0) for operation, stats in s3_after.items())
+    received = sum(stats["bytes_received"] - s3_before.get(operation, {}).get("bytes_received", 0) for operation, stats in s3_after.items())
+    return {
+        "operation": name,
+        **extra,
+        "calls": calls,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "ops_per_sec": round(calls / elapsed, 1) if elapsed > 0 else 0.0,
+        "s3_requests_per_call": {operation: round(count / calls, 2) for operation, count in sorted(requests.items())},
+        "bytes_sent_per_call": round(sent / calls),
+        "bytes_received_per_call": round(received / calls)
+    }
+
+
+def measure(domain_qa, name, func, args_list, workers=1, **extra):
+    """Run func over args_list on `workers` threads and summarize the per-call latencies"""
+    def timed(args):
+        started = time.perf_counter()
+        try:
+            func(*args)
+            error = None
+        except Exception as e:
+            error = str(e)
+        return time.perf_counter() - started, error
+
+    s3_before = domain_qa.s3_call_stats.snapshot()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = list(executor.map(timed, args_list))
+    elapsed = time.perf_counter() - started
+    latencies = [seconds for seconds, _ in outcomes]
+    errors = [error for _, error in outcomes if error]
+    result = summarize(name, latencies, errors, elapsed, s3_before, domain_qa.s3_call_stats.snapshot(), **extra)
+    print(
+        f"{name:<28} {json.dumps(extra):<46} p50 {result['p50_ms']:>9.1f} ms  p95 {result['p95_ms']:>9.1f} ms  "
+        f"p99 {result['p99_ms']:>9.1f} ms  {result['bytes_sent_per_call']:>10} B out  {result['bytes_received_per_call']:>10} B in"
+        + (f"  {len(errors)} errors" if errors else "")
+    )
+    return result
+
+
+def benchmark_resumes(domain_qa, s3, resumes, pages, repeat):
+    """Seed synthetic resumes and time listing and downloads"""
+    s3.create_bucket(Bucket=RESUME_BUCKET)
+    keys = [f"resumes/candidate-{index:06d}.pdf" for index in range(resumes)]
+    pdf_bytes = [synthetic_resume_pdf(index, pages) for index in range(resumes)]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda item: s3.put_object(Bucket=RESUME_BUCKET, Key=item[0], Body=item[1]), zip(keys, pdf_bytes)))
+    os.environ['S3_BUCKET_NAME'] = RESUME_BUCKET
+    extra = {"resumes": resumes}
+
+    results = [
+        measure(domain_qa, "list_resumes (re-list)", lambda: domain_qa.list_s3_resumes(refresh=True), [()] * repeat, **extra),
+        measure(domain_qa, "list_resumes (catalog)", lambda: domain_qa.list_s3_resumes(), [()] * repeat, **extra)
+    ]
+    catalog = domain_qa.get_resume_catalog(RESUME_BUCKET)
+
+    def open_resume(key, etag):
+        domain_qa.open_resume_from_s3(key, etag).close()
+
+    results.append(measure(domain_qa, "open_resume (download)", open_resume, [(key, None) for key in keys], **extra))
+    results.append(measure(domain_qa, "open_resume (disk cache)", open_resume, [(key, catalog.get(key)['etag']) for key in keys], **extra))
+    return results
+
+
+def seed_feedback(domain_qa, s3, bucket_name, mode, rows, candidates):
+    """Create a feedback bucket holding `rows` assessments in the layout `mode` reads"""
+    import io
+
+    s3.create_bucket(Bucket=bucket_name)
+    if not rows:
+        return
+    df = synthetic_feedback_frame(domain_qa, rows, candidates)
+    buffer = io.BytesIO()
+    if mode == "xlsx":
+        df.to_excel(buffer, index=False, engine='openpyxl')
+        s3.put_object(Bucket=bucket_name, Key=domain_qa.FEEDBACK_XLSX_KEY, Body=buffer.getvalue())
+    else:
+        # What a compaction leaves behind; the status index sidecar is built on the first lookup
+        domain_qa.normalize_feedback_frame(df).to_parquet(buffer, index=False)
+        s3.put_object(Bucket=bucket_name, Key=domain_qa.FEEDBACK_SNAPSHOT_KEY, Body=buffer.getvalue())
+
+
+def benchmark_feedback(domain_qa, s3, mode, rows, writers_list, saves_per_writer, lookups, candidates):
+    """Time status lookups and concurrent feedback saves against a seeded feedback history"""
+    bucket_name = f"{FEEDBACK_BUCKET}-{mode}-{rows}"
+    print(f"Seeding {rows} feedback rows ({mode}) ...")
+    seed_feedback(domain_qa, s3, bucket_name, mode, rows, candidates)
+    os.environ['S3_BUCKET_FEEDBACK'] = bucket_name
+    domain_qa.FEEDBACK_STORAGE_MODE = mode
+    extra = {"mode": mode, "rows": rows}
+    names = [(f"Candidate {index % candidates:06d}",) for index in range(lookups)]
+
+    def lookup_with(index):
+        domain_qa.candidate_status_index = index
+        return domain_qa.check_candidate_status_in_s3_csv
+
+    results = [
+        measure(domain_qa, "status_lookup (cold index)", lambda name: lookup_with(domain_qa.CandidateStatusIndex(0))(name), names[:1], **extra),
+        measure(domain_qa, "status_lookup (revalidate)", lookup_with(domain_qa.CandidateStatusIndex(0)), names, **extra),
+        measure(domain_qa, "status_lookup (in memory)", lookup_with(domain_qa.CandidateStatusIndex(3600)), names, **extra)
+    ]
+
+    expected_rows = rows
+    for writers in writers_list:
+        def save(writer, index):
+            saved, message = domain_qa.save_feedback_to_s3(synthetic_assessment(writer, index))
+            if not saved:
+                raise RuntimeError(message)
+
+        saves = [(writer, index) for index in range(saves_per_writer) for writer in range(writers)]
+        result = measure(domain_qa, "save_feedback", save, saves, workers=writers, writers=writers, **extra)
+        expected_rows += len(saves)
+        result["lost_rows"] = expected_rows - len(domain_qa.load_feedback_dataframe())
+        # Carry on from what is actually stored so each writer count reports only its own losses
+        expected_rows -= result["lost_rows"]
+        print(f"{'':<28} lost rows: {result['lost_rows']} of {len(saves)} saves")
+        results.append(result)
+    return results
+
+
+def parse_int_list(value):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the S3 storage paths against an in-process S3 emulator")
+    parser.add_argument("--rows", type=parse_int_list, default=[1000, 10000], help="Comma-separated feedback history sizes (e.g. 1000,100000,500000)")
+    parser.add_argument("--modes", default="append,xlsx", help="Comma-separated feedback storage modes to benchmark")
+    parser.add_argument("--writers", type=parse_int_list, default=[1, 2, 4, 8], help="Comma-separated concurrent writer counts")
+    parser.add_argument("--saves-per-writer", type=int, default=5, help="Feedback saves made by each writer")
+    parser.add_argument("--candidates", type=int, default=2000, help="Distinct candidates in the synthetic feedback history")
+    parser.add_argument("--lookups", type=int, default=200, help="Status lookups per measurement")
+    parser.add_argument("--resumes", type=int, default=200, help="Synthetic resumes seeded into the resume bucket")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per synthetic resume")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetitions of each listing measurement")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if mock_aws is None:
+        parser.error('moto is not installed; run: pip install "moto[s3]"')
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    if any(mode not in ("append", "xlsx") for mode in modes):
+        parser.error("--modes accepts append and xlsx")
+
+    with tempfile.TemporaryDirectory() as cache_dir, mock_aws():
+        import domain_qa
+
+        # moto intercepts every S3 call whatever credentials .env provides; keep caches out of CACHE_DIR too
+        domain_qa.CACHE_DIR = cache_dir
+        domain_qa.resume_disk_cache = domain_qa.ResumeDiskCache(os.path.join(cache_dir, "resumes"), 1 << 40)
+        s3 = domain_qa.s3_client_pool
+
+        results = benchmark_resumes(domain_qa, s3, args.resumes, args.pages, args.repeat)
+        for mode in modes:
+            for rows in args.rows:
+                results.extend(benchmark_feedback(
+                    domain_qa, s3, mode, rows, args.writers, args.saves_per_writer, args.lookups, args.candidates
+                ))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    print("\nBenchmark results:")
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())